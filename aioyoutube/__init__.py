@@ -26,4 +26,20 @@ DEALINGS IN THE SOFTWARE.
 
 
 from .client import *
-from .http import *
\ No newline at end of file
+from .http import *
+from .loader import *
+from .quota import *
+from .cache import *
+from .retry import *
+from .pool import *
+from .upload import *
+from .keys import *
+from .views import *
+from .fields import *
+from .hooks import *
+from .sync import *
+from .runner import *
+from .comments import *
+from .auth import *
+from .transport import *
+from .export import *
\ No newline at end of file
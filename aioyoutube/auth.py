@@ -0,0 +1,192 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import asyncio
+import hashlib
+import time
+from typing import Optional, Tuple
+from aiohttp import ClientSession
+from .exceptions import TokenRefreshException
+from .decoder import decode
+
+
+TOKEN_URI = 'https://oauth2.googleapis.com/token'
+
+# tokens closer to expiry than this are refreshed before the request is sent,
+# tokens within the margin of YouTubeCredentials are refreshed in the background
+
+MIN_VALIDITY = 10
+
+
+class YouTubeCredentials:
+
+    """
+        OAuth2 access token provider for YouTubeAuthClient.
+
+        The access token is refreshed from the refresh token against token_uri,
+        which can point at a local stub in tests. Tokens are refreshed in the 
+        background once they are within margin seconds of expiry, and before 
+        the request when they are about to expire. Refreshes are single-flight: 
+        concurrent callers, ex. many requests answered with 401 at once, share
+        one refresh and then use its token. Subclass and override fetch_token 
+        and refreshable for other grants.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            token type(str): current OAuth2 access token
+            refresh_token type(str): OAuth2 refresh token
+            client_id type(str): OAuth2 client id
+            client_secret type(str): OAuth2 client secret
+            token_uri type(str): token endpoint refresh requests are posted to
+            expires_at type(float): unix time the access token expires at, if known
+            margin type(float): seconds before expiry a refresh is started
+            session type(aiohttp.ClientSession): optional session used for refresh requests
+            refreshes type(int): number of refreshes made
+            identity type(str): stable hash identifying the user of the credentials, ex. in cache keys
+    """
+
+    def __init__(
+        self, 
+        token: Optional[str] = None, 
+        refresh_token: Optional[str] = None, 
+        client_id: Optional[str] = None, 
+        client_secret: Optional[str] = None, 
+        token_uri: str = TOKEN_URI, 
+        expires_at: Optional[float] = None, 
+        margin: float = 300, 
+        session: Optional[ClientSession] = None
+    ) -> None:
+
+        self.token = token
+        self.refresh_token = refresh_token
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_uri = token_uri
+        self.expires_at = expires_at
+        self.margin = margin
+        self.refreshes = 0
+        self._session = session
+        self._own_session = session == None
+        self._refreshing = None
+
+    @property
+    def refreshable(self) -> bool:
+        return self.refresh_token != None
+
+    # the refresh token outlives the access tokens it is refreshed into
+
+    @property
+    def identity(self) -> str:
+        secret = self.refresh_token if self.refreshable else self.token
+        return hashlib.sha256((secret or '').encode('utf-8')).hexdigest()
+
+    @property
+    def expires_in(self) -> Optional[float]:
+        return None if self.expires_at == None else self.expires_at - time.time()
+
+    async def get_token(self) -> str:
+
+        if not self.refreshable:
+            return self.token
+
+        expires_in = self.expires_in
+        if self.token == None or (expires_in != None and expires_in < MIN_VALIDITY):
+            return await self.refresh()
+        if expires_in != None and expires_in < self.margin and self._refreshing == None:
+            self._start()
+        return self.token
+
+    # refreshes the token unless stale, the token a failed request was sent 
+    # with, has already been replaced. callers arriving during a refresh wait 
+    # for it instead of starting another one.
+
+    async def refresh(self, stale: Optional[str] = None) -> str:
+
+        if stale != None and stale != self.token:
+            return self.token
+        if self._refreshing == None:
+            self._start()
+        return await asyncio.shield(self._refreshing)
+
+    # failures of background refreshes are retrieved here and raised again by 
+    # the refresh made before the token expires
+
+    def _start(self) -> None:
+
+        self._refreshing = asyncio.ensure_future(self._refresh())
+        self._refreshing.add_done_callback(
+            lambda future: future.cancelled() or future.exception())
+
+    async def _refresh(self) -> str:
+
+        try:
+            token, expires_in = await self.fetch_token()
+            self.token = token
+            self.expires_at = None if expires_in == None else time.time() + expires_in
+            self.refreshes += 1
+            return token
+        finally:
+            self._refreshing = None
+
+    # returns a new access token and the seconds until it expires
+
+    async def fetch_token(self) -> Tuple[str, Optional[float]]:
+
+        if self._session == None or (self._own_session and self._session.closed):
+            self._session = ClientSession()
+
+        form = {'grant_type': 'refresh_token', 'refresh_token': self.refresh_token}
+        if self.client_id != None:
+            form['client_id'] = self.client_id
+        if self.client_secret != None:
+            form['client_secret'] = self.client_secret
+
+        async with self._session.post(self.token_uri, data=form) as response:
+            status, body = response.status, await response.read()
+
+        try:
+            data = decode(body)
+        except ValueError:
+            data = None
+        if status != 200 or not isinstance(data, dict) or 'access_token' not in data:
+            error = data.get('error_description', data.get('error')) \
+                if isinstance(data, dict) else None
+            raise TokenRefreshException(status, error or body.decode(errors='replace'))
+        return data['access_token'], data.get('expires_in')
+
+    # closes the session refresh requests are sent with once a running refresh 
+    # is done, since other clients sharing the credentials may be waiting for 
+    # it. a later refresh opens a new session.
+
+    async def close(self) -> None:
+
+        if self._refreshing != None:
+            await asyncio.wait([self._refreshing])
+        if self._own_session and self._session != None and not self._session.closed:
+            await self._session.close()
@@ -0,0 +1,270 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import collections
+import sqlite3
+import time
+from typing import Iterable, List, MutableMapping, Optional
+from urllib.parse import parse_qsl, urlencode
+from .parse import ROUTES
+
+
+# resources that almost never change and are kept by a YouTubeReferenceCache
+
+REFERENCE_RESOURCES = (
+    'videoCategory',
+    'i18nLanguage',
+    'i18nRegion',
+    'videoAbuseReportReason'
+)
+
+
+# normalizes an endpoint so equivalent requests share a cache key. the api key is
+# removed and the query parameters are sorted.
+# ex. videos?part=snippet&key=[KEY]&id=abc -> videos?id=abc&part=snippet
+
+def normalize_endpoint(endpoint: str) -> str:
+
+    path, _, query = endpoint.partition('?')
+    params = sorted((key, value) for key, value in parse_qsl(query, keep_blank_values=True) 
+        if key != 'key')
+    return path + '?' + urlencode(params, safe=',')
+
+
+# identifies a request by its normalized endpoint and authorization header, 
+# since authorized responses differ between users
+
+def request_key(endpoint: str, headers: Optional[MutableMapping] = None) -> str:
+
+    key = normalize_endpoint(endpoint)
+    if headers != None and 'Authorization' in headers:
+        key += '#' + headers['Authorization']
+    return key
+
+
+class CacheEntry:
+
+    """
+        Cached response stored by a YouTubeResponseCache.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            etag type(str): ETag header of the cached response
+            status type(int): http status code of the cached response
+            body type(bytes): raw body of the cached response
+            expires type(float): monotonic time, or unix time in a YouTubeReferenceCache, after which the entry is discarded
+    """
+
+    __slots__ = ('etag', 'status', 'body', 'expires')
+
+    def __init__(self, etag: str, status: int, body: bytes, expires: float) -> None:
+
+        self.etag = etag
+        self.status = status
+        self.body = body
+        self.expires = expires
+
+
+class YouTubeResponseCache:
+
+    """
+        ETag based response cache for conditional GET requests.
+
+        Pass an instance to YouTubeAPISession (or a client) with the cache keyword 
+        argument. Repeat GET requests send If-None-Match with the cached ETag and 
+        the cached body is served when the API answers 304 Not Modified. Entries 
+        are evicted least recently used first once max_size is reached and are 
+        discarded ttl seconds after they were stored.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            max_size type(int): maximum number of cached responses
+            ttl type(float): seconds a cached response is kept
+            hits type(int): lookups that found a cached response
+            misses type(int): lookups that found no cached response
+            not_modified type(int): 304 responses served from the cache
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600) -> None:
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._entries = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, endpoint: str, headers: Optional[MutableMapping] = None) -> str:
+        return request_key(endpoint, headers)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+
+        entry = self._entries.get(key)
+        if entry != None and entry.expires <= time.monotonic():
+            del self._entries[key]
+            entry = None
+
+        if entry == None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, etag: str, status: int, body: bytes) -> None:
+
+        self._entries[key] = CacheEntry(etag, status, body, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+
+class YouTubeReferenceCache:
+
+    """
+        Persistent cache of slow changing reference resources.
+
+        Pass an instance to YouTubeAPISession (or a client) with the 
+        reference_cache keyword argument. Successful GET responses of the 
+        cached resources are stored in a SQLite database keyed by the 
+        normalized endpoint, which includes hl and regionCode, and every 
+        unexpired entry is loaded into memory when the cache is created. 
+        Lookups are served from memory without a request or quota units.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            path type(str): path of the SQLite database, defaults to an in memory database
+            ttl type(float): seconds a cached response is kept
+            resources type(Iterable): resources cached, defaults to REFERENCE_RESOURCES
+            hits type(int): lookups that found a cached response
+            misses type(int): lookups that found no cached response
+    """
+
+    def __init__(
+        self, 
+        path: str = ':memory:', 
+        ttl: float = 30 * 86400, 
+        resources: Iterable[str] = REFERENCE_RESOURCES
+    ) -> None:
+
+        self.path = path
+        self.ttl = ttl
+        self.resources = tuple(resources)
+        self.hits = 0
+        self.misses = 0
+        self._routes = {ROUTES[resource] for resource in self.resources}
+        self._entries = {}
+        self._connection = sqlite3.connect(path)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS reference_cache '
+            '(key TEXT PRIMARY KEY, etag TEXT, status INTEGER, body BLOB, expires REAL)')
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # reads every unexpired entry from the database into memory and 
+    # returns the number of entries loaded
+
+    def load(self) -> int:
+
+        now = time.time()
+        self._connection.execute('DELETE FROM reference_cache WHERE expires <= ?', (now,))
+        self._connection.commit()
+        self._entries = {key: CacheEntry(etag, status, body, expires) 
+            for key, etag, status, body, expires in self._connection.execute(
+                'SELECT key, etag, status, body, expires FROM reference_cache')}
+        return len(self._entries)
+
+    # returns the cache key of an endpoint or None when its resource is not cached
+
+    def key(self, endpoint: str) -> Optional[str]:
+
+        if endpoint.partition('?')[0] not in self._routes:
+            return None
+        return normalize_endpoint(endpoint)
+
+    def keys(self, resource: Optional[str] = None) -> List[str]:
+
+        if resource == None:
+            return list(self._entries)
+        route = ROUTES[resource] + '?'
+        return [key for key in self._entries if key.startswith(route)]
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+
+        entry = self._entries.get(key)
+        if entry != None and entry.expires <= time.time():
+            self.invalidate(key=key)
+            entry = None
+
+        if entry == None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, etag: Optional[str], status: int, body: bytes) -> None:
+
+        entry = CacheEntry(etag, status, body, time.time() + self.ttl)
+        self._entries[key] = entry
+        self._connection.execute('INSERT OR REPLACE INTO reference_cache VALUES (?, ?, ?, ?, ?)', 
+            (key, etag, status, body, entry.expires))
+        self._connection.commit()
+
+    # removes one entry, every entry of a resource or, without arguments, 
+    # every entry and returns the number of entries removed
+
+    def invalidate(self, resource: Optional[str] = None, key: Optional[str] = None) -> int:
+
+        keys = [key] if key != None else self.keys(resource)
+        for key in keys:
+            self._entries.pop(key, None)
+        self._connection.executemany('DELETE FROM reference_cache WHERE key = ?', 
+            [(key,) for key in keys])
+        self._connection.commit()
+        return len(keys)
+
+    def close(self) -> None:
+        self._connection.close()
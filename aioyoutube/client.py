@@ -25,11 +25,18 @@ DEALINGS IN THE SOFTWARE.
 """
 
 
-import aiohttp, json, ast
+import asyncio, collections, os
+import aiohttp, json
+from urllib.parse import parse_qsl
 from aiohttp import ClientSession
-from typing import Optional, MutableMapping
+from typing import Any, AsyncIterator, Iterable, List, Optional, MutableMapping, Tuple, Union
 from .http import YouTubeAPISession, YouTubeAPIResponse
 from .parse import build_endpoint
+from .quota import ENDPOINT_RESOURCES
+from .fields import field_mask
+from .auth import YouTubeCredentials
+from .keys import YouTubeKeyPool
+from .upload import CHUNK_SIZE, Media, Progress, ResumableUpload
 from .valid import RATINGS
 from .exceptions import (
     is_http_exception, 
@@ -51,16 +58,18 @@ class YouTubeAPIClient:
             None
         
         Attribute(s):
-            key type(str): YouTube API key
+            key type(Union[str, YouTubeKeyPool]): YouTube API key or key pool
             http_exceptions type(bool): flag turning on or off http specific exceptions
             client_session type(aiohttp.ClientSession): async http session from aiohttp library
+            kwargs type(MutableMapping): keyword arguments passed to YouTubeAPISession on connect
     """
 
     def __init__(
         self, 
         key: str,
         client_session: aiohttp.ClientSession = None, 
-        http_exceptions: bool = False
+        http_exceptions: bool = False,
+        **kwargs
     ) -> None:
 
         if key == None:
@@ -69,27 +78,41 @@ class YouTubeAPIClient:
         self._key = key
         self._csession = client_session
         self._exceptions = http_exceptions
+        self._session_kwargs = kwargs
 
     @classmethod
     def from_connect(
         cls, 
         key: str, 
         http_exceptions: bool = False, 
-        client_session: aiohttp.ClientSession = None
+        client_session: aiohttp.ClientSession = None,
+        **kwargs
     ) -> classmethod:
 
-        class_ = cls(key, client_session, http_exceptions)
+        class_ = cls(key, client_session, http_exceptions, **kwargs)
         class_.connect(session=class_._csession)
         return class_
 
     @property
-    def key(self) -> str:
+    def key(self) -> Union[str, YouTubeKeyPool]:
         return self._key
 
     @key.setter
-    def key(self, value: str) -> None:
+    def key(self, value: Union[str, YouTubeKeyPool]) -> None:
         self._key = value
 
+    # session of a connected client, exposing its cache, wire and pool statistics
+
+    @property
+    def youtube_session(self) -> YouTubeAPISession:
+        return self._youtube_session
+
+    # endpoints are built without a key when a key pool chooses it per request
+
+    @property
+    def _endpoint_key(self) -> Optional[str]:
+        return None if isinstance(self._key, YouTubeKeyPool) else self._key
+
     async def __aenter__(self):
         self.connect(session=self._csession)
         return self
@@ -98,11 +121,219 @@ class YouTubeAPIClient:
         await self.close()
 
     def connect(self, session: aiohttp.ClientSession = None) -> None:
-        self._youtube_session = YouTubeAPISession(session=session)
+        kwargs = dict(self._session_kwargs)
+        if isinstance(self._key, YouTubeKeyPool):
+            kwargs['key_pool'] = self._key
+        self._youtube_session = YouTubeAPISession(session=session, **kwargs)
 
     async def close(self) -> None:
         await self._youtube_session.close()
 
+    # builds the response of a request result, passing on the request event so 
+    # decoding is reported to the hooks
+
+    def _response(self, result: Tuple[int, bytes, MutableMapping]) -> YouTubeAPIResponse:
+        return YouTubeAPIResponse(result[0], None, result[2], raw=result[1], 
+            event=getattr(result, 'event', None))
+
+    # requests every response stored in the reference cache again, or those of 
+    # one resource, and returns the number of responses refreshed
+
+    async def refresh_references(self, resource: Optional[str] = None) -> int:
+
+        cache = self._youtube_session.reference_cache
+        if cache == None:
+            return 0
+
+        keys = cache.keys(resource)
+        for key in keys:
+            path, _, query = key.partition('?')
+            kwargs = dict(parse_qsl(query, keep_blank_values=True))
+            part = kwargs.pop('part', '')
+            cache.invalidate(key=key)
+            result = await self.list_(ENDPOINT_RESOURCES[path], 
+                part.split(',') if part else [], **kwargs)
+            await is_http_exception(result.status, result.data)
+        return len(keys)
+
+    # runs many requests with at most concurrency of them in flight and yields 
+    # (index, result) pairs in completion order, or in input order with ordered. 
+    # each spec is a mapping of keyword arguments for list_ or for the client 
+    # coroutine named by its optional "method" key. specs are consumed lazily and
+    # a new request only starts once a result has been taken, so a slow consumer
+    # holds back the requests instead of buffering results. with return_exceptions
+    # a failed request yields its exception instead of stopping the iteration.
+    # ex. {'resource': 'search', 'part': ['snippet'], 'q': 'surfing'}
+    # ex. {'method': 'getRating', 'resource': 'video', 'id': '...'}
+
+    async def map_(
+        self, 
+        specs: Iterable[MutableMapping], 
+        concurrency: int = 10, 
+        ordered: bool = False, 
+        return_exceptions: bool = False
+    ) -> AsyncIterator[Tuple[int, Any]]:
+
+        if concurrency < 1:
+            raise ValueError('Concurrency must be at least 1')
+
+        specs = enumerate(specs)
+        tasks = collections.OrderedDict()
+
+        async def run(spec: MutableMapping) -> Any:
+
+            spec = dict(spec)
+            method = getattr(self, spec.pop('method', 'list_'))
+            return await method(**spec)
+
+        def start_next() -> None:
+
+            for index, spec in specs:
+                tasks[asyncio.ensure_future(run(spec))] = index
+                return
+
+        try:
+            for _ in range(concurrency):
+                start_next()
+
+            while len(tasks) > 0:
+
+                if ordered:
+                    task = next(iter(tasks))
+                    await asyncio.wait([task])
+                    done = [task]
+                else:
+                    done, _ = await asyncio.wait(tasks, 
+                        return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    index = tasks.pop(task)
+                    start_next()
+                    
+                    if task.exception() == None:
+                        yield index, task.result()
+                    elif return_exceptions:
+                        yield index, task.exception()
+                    else:
+                        raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # runs many requests with at most concurrency of them in flight and returns
+    # their results in input order. see map_ for the format of specs.
+
+    async def gather(
+        self, 
+        specs: Iterable[MutableMapping], 
+        concurrency: int = 10, 
+        return_exceptions: bool = False
+    ) -> List[Any]:
+
+        return [result async for _, result in self.map_(specs, 
+            concurrency=concurrency, ordered=True, return_exceptions=return_exceptions)]
+
+    # requests only the given dotted item fields of a resource. the smallest part 
+    # list and a matching fields partial response mask are generated from the
+    # paths. ex. select('video', ['snippet.title', 'statistics.viewCount'], id=...)
+
+    async def select(
+        self, 
+        resource: str, 
+        paths: list, 
+        **kwargs
+    ) -> YouTubeAPIResponse:
+
+        mask = field_mask(resource, paths)
+        return await self.list_(resource, mask.part, fields=mask.fields, **kwargs)
+
+    # yields the items of a list_ request across all pages by following nextPageToken.
+    # up to prefetch pages are requested ahead of the caller while it consumes the
+    # current page. a prefetch of 0 requests each page only after the previous one
+    # has been consumed. iteration stops early once max_items items are yielded.
+    # error responses are always raised as HTTPException since there is no
+    # response object to hand back to the caller.
+
+    async def paginate(
+        self, 
+        resource: str, 
+        part: list, 
+        max_items: Optional[int] = None, 
+        prefetch: int = 1, 
+        **kwargs
+    ) -> AsyncIterator[MutableMapping]:
+
+        if max_items != None and max_items <= 0:
+            return
+
+        async def fetch_page(page_token: Optional[str]) -> YouTubeAPIResponse:
+
+            if page_token != None:
+                kwargs['pageToken'] = page_token
+            result = await self.list_(resource, part, **kwargs)
+            await is_http_exception(result.status, result.data)
+            return result
+
+        # every page holds a slot from being requested until the caller moves on 
+        # to the next one, so prefetch pages beyond the current one are requested
+
+        async def fetch_pages(queue: asyncio.Queue, slots: asyncio.Semaphore) -> None:
+
+            page_token = kwargs.pop('pageToken', None)
+            try:
+                while True:
+                    await slots.acquire()
+                    result = await fetch_page(page_token)
+                    await queue.put(result)
+                    page_token = result.data.get('nextPageToken')
+                    if page_token == None:
+                        break
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(None)
+
+        if prefetch > 0:
+            queue = asyncio.Queue()
+            slots = asyncio.Semaphore(prefetch + 1)
+            task = asyncio.ensure_future(fetch_pages(queue, slots))
+            started = False
+
+            async def next_page() -> Optional[YouTubeAPIResponse]:
+                nonlocal started
+                if started:
+                    slots.release()
+                started = True
+                return await queue.get()
+        else:
+            task = None
+            page_token = kwargs.pop('pageToken', None)
+
+            async def next_page() -> Optional[YouTubeAPIResponse]:
+                nonlocal page_token
+                if page_token == '':
+                    return None
+                result = await fetch_page(page_token)
+                page_token = result.data.get('nextPageToken', '')
+                return result
+
+        count = 0
+        try:
+            while True:
+                result = await next_page()
+                if result == None:
+                    return
+                if isinstance(result, Exception):
+                    raise result
+                for item in result.data.get('items', []):
+                    yield item
+                    count += 1
+                    if max_items != None and count >= max_items:
+                        return
+        finally:
+            if task != None:
+                task.cancel()
+
 
 class YouTubeClient(YouTubeAPIClient):
     
@@ -116,23 +347,35 @@ class YouTubeClient(YouTubeAPIClient):
             YouTubeAPIClient
         
         Attribute(s):
-            key type(str): YouTube API key 
+            key type(Union[str, YouTubeKeyPool]): YouTube API key or key pool 
             http_exceptions type(bool): flag turning on or off http specific exceptions
             client_session type(aiohttp.ClientSession): async http session from aiohttp library
+            kwargs type(MutableMapping): keyword arguments passed to YouTubeAPISession on connect
     """
 
     def __init__(
         self, 
         key: str, 
         client_session: aiohttp.ClientSession = None, 
-        http_exceptions: bool = False
+        http_exceptions: bool = False,
+        **kwargs
     ) -> None:
-        super().__init__(key, client_session, http_exceptions)
+        super().__init__(key, client_session, http_exceptions, **kwargs)
 
     async def search(self, search: str, **kwargs) -> YouTubeAPIResponse:
         return await self.list_(resource='search', part=['snippet'], 
             q=search, **kwargs)        
 
+    def paginate_search(
+        self, 
+        search: str, 
+        max_items: Optional[int] = None, 
+        prefetch: int = 1, 
+        **kwargs
+    ) -> AsyncIterator[MutableMapping]:
+        return self.paginate(resource='search', part=['snippet'], 
+            max_items=max_items, prefetch=prefetch, q=search, **kwargs)
+
     async def list_(
         self, 
         resource: str, 
@@ -140,15 +383,14 @@ class YouTubeClient(YouTubeAPIClient):
         **kwargs
     ) -> YouTubeAPIResponse:
 
-        endpoint = build_endpoint(resource=resource, key=self._key, 
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, 
             part=part, **kwargs)
         result = await self._youtube_session.request(method='GET', endpoint=endpoint)
 
-        data = ast.literal_eval(result[1].decode('UTF8'))
         if self._exceptions == True: 
-            await is_http_exception(result[0], data)
+            await is_http_exception(result[0], result[1])
 
-        return YouTubeAPIResponse(result[0], data, result[2])
+        return self._response(result)
 
 
 class YouTubeAuthClient(YouTubeAPIClient):
@@ -163,46 +405,72 @@ class YouTubeAuthClient(YouTubeAPIClient):
             YouTubeAPIClient
         
         Attribute(s):
-            key type(str): YouTube API key
-            token type(str): OAuth2 Access token
+            key type(Union[str, YouTubeKeyPool]): YouTube API key or key pool
+            token type(Union[str, YouTubeCredentials]): OAuth2 Access token or credentials refreshing it
             http_exceptions type(bool): flag turning on or off http specific exceptions
             client_session type(aiohttp.ClientSession): async http session from aiohttp library
+            kwargs type(MutableMapping): keyword arguments passed to YouTubeAPISession on connect
     """
 
     def __init__(
         self, 
         key: str, 
-        token: str,
+        token: Union[str, YouTubeCredentials],
         client_session: aiohttp.ClientSession = None,  
-        http_exceptions: bool = False
+        http_exceptions: bool = False,
+        **kwargs
     ) -> None:
 
         if token == None:
             raise OAuthTokenNoneException
         
         self._token = token
-        super().__init__(key, client_session, http_exceptions)
+        if isinstance(token, YouTubeCredentials):
+            kwargs['credentials'] = token
+        super().__init__(key, client_session, http_exceptions, **kwargs)
     
     @classmethod
     def from_token_connect(
         cls, 
         key: str, 
-        token: str, 
+        token: Union[str, YouTubeCredentials], 
         client_session: aiohttp.ClientSession = None,
-        http_exceptions: bool = False
+        http_exceptions: bool = False,
+        **kwargs
     ) -> classmethod:
 
-        class_ = cls(key, token, client_session, http_exceptions)
+        class_ = cls(key, token, client_session, http_exceptions, **kwargs)
         class_.connect(session=class_._csession)
         return class_
 
     @property
     def token(self) -> str:
+        if isinstance(self._token, YouTubeCredentials):
+            return self._token.token
         return self._token
 
     @token.setter
     def token(self, value: str) -> None:
-        self._token = value
+        if isinstance(self._token, YouTubeCredentials):
+            self._token.token = value
+        else:
+            self._token = value
+
+    @property
+    def credentials(self) -> Optional[YouTubeCredentials]:
+        return self._token if isinstance(self._token, YouTubeCredentials) else None
+
+    async def close(self) -> None:
+
+        await super().close()
+        if self.credentials != None:
+            await self.credentials.close()
+
+    # with credentials the session replaces the token with a fresh one when sending
+
+    def _auth_headers(self, **headers) -> MutableMapping:
+        headers['Authorization'] = 'Bearer {}'.format(self.token)
+        return headers
 
     async def list_(
         self, 
@@ -211,19 +479,18 @@ class YouTubeAuthClient(YouTubeAPIClient):
         **kwargs
     ) -> YouTubeAPIResponse:
 
-        endpoint = build_endpoint(resource=resource, key=self._key, 
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, 
             part=part, **kwargs)
         
         result = await self._youtube_session.request(
             method='GET', 
             endpoint=endpoint,
-            headers={'Authorization': 'Bearer {}'.format(self._token)}
+            headers=self._auth_headers()
         )
 
-        data = ast.literal_eval(result[1].decode('UTF8'))
         if self._exceptions == True: 
-            await is_http_exception(result[0], data)
-        return YouTubeAPIResponse(result[0], data, result[2])
+            await is_http_exception(result[0], result[1])
+        return self._response(result)
 
     # optional append argument appends string to end of endpoint to allow non-standard resource endpoints
     # ex. channelBanners/insert is used instead of channelBanners when using insert function with channelBanners resource
@@ -237,22 +504,25 @@ class YouTubeAuthClient(YouTubeAPIClient):
         **kwargs
     ) -> YouTubeAPIResponse:
         
-        endpoint = build_endpoint(resource=resource, key=self._key, 
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, 
             part=part, append=append, **kwargs)
         
+        if media != None and not isinstance(media, (bytes, bytearray)):
+            return await self.upload(resource, data, media, part=part, 
+                append=append, **kwargs)
+
         if media == None:
             
             result = await self._youtube_session.request(
                 method='POST',
                 endpoint=endpoint,
-                headers={'Authorization': 'Bearer {}'.format(self._token)},
+                headers=self._auth_headers(),
                 body=json.dumps(data)
             )
 
-            data = ast.literal_eval(result[1].decode('UTF8'))
             if self._exceptions == True: 
-                await is_http_exception(result[0], data)
-            return YouTubeAPIResponse(result[0], data, result[2])
+                await is_http_exception(result[0], result[1])
+            return self._response(result)
         else:
             with aiohttp.MultipartWriter('form-data') as mpw:
                 mpw.append_json(data)
@@ -262,15 +532,50 @@ class YouTubeAuthClient(YouTubeAPIClient):
                     method='POST',
                     endpoint=endpoint,
                     upload=True,
-                    headers={'Authorization': 'Bearer {}'.format(self._token)},
+                    headers=self._auth_headers(),
                     body=mpw
                 )
 
-                # TODO: look at why this is not decoding. will be commented out for now
-                #data = ast.literal_eval(result[1].decode('UTF8'))
                 if self._exceptions == True: 
                     await is_http_exception(result[0], result[1])
-                return YouTubeAPIResponse(result[0], result[1], result[2])
+                return self._response(result)
+
+    # uploads media with the resumable upload protocol. media can be bytes, a file 
+    # path, a binary file object or an async iterator of bytes and is sent in 
+    # chunks of chunk_size bytes so memory use does not grow with the media size.
+    # progress is called with the bytes sent and the total size after each chunk.
+
+    async def upload(
+        self, 
+        resource: str, 
+        data: dict, 
+        media: Media, 
+        part: Optional[list] = [], 
+        append: Optional[str] = None, 
+        chunk_size: int = CHUNK_SIZE, 
+        content_type: str = 'application/octet-stream', 
+        progress: Optional[Progress] = None, 
+        **kwargs
+    ) -> YouTubeAPIResponse:
+
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, 
+            part=part, append=append, uploadType='resumable', **kwargs)
+
+        upload = ResumableUpload(
+            session=self._youtube_session, 
+            endpoint=endpoint, 
+            data=data, 
+            media=media, 
+            headers=self._auth_headers(), 
+            chunk_size=chunk_size, 
+            content_type=content_type, 
+            progress=progress
+        )
+        result = await upload.run()
+
+        if self._exceptions == True: 
+            await is_http_exception(result[0], result[1])
+        return self._response(result)
 
     async def update(
         self, 
@@ -280,19 +585,18 @@ class YouTubeAuthClient(YouTubeAPIClient):
         **kwargs
     ) -> YouTubeAPIResponse:
         
-        endpoint = build_endpoint(resource=resource, key=self._key, part=part, **kwargs)
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, part=part, **kwargs)
         
         result = await self._youtube_session.request(
             method='PUT', 
             endpoint=endpoint, 
             body=json.dumps(data), 
-            headers={'Authorization': ' Bearer {}'.format(self._token)}
+            headers=self._auth_headers()
         )
 
-        data = ast.literal_eval(result[1].decode('UTF8'))
         if self._exceptions == True: 
-            await is_http_exception(result[0], data)
-        return YouTubeAPIResponse(result[0], data, result[2])
+            await is_http_exception(result[0], result[1])
+        return self._response(result)
 
     async def rate(
         self, 
@@ -304,13 +608,12 @@ class YouTubeAuthClient(YouTubeAPIClient):
         if rating not in RATINGS:
             raise RatingInvalidException
         
-        endpoint = build_endpoint(resource=resource, key=self._key, append='rate', rating=rating, **kwargs)
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, append='rate', rating=rating, **kwargs)
         
         result = await self._youtube_session.request(
             method='POST', 
             endpoint=endpoint, 
-            headers={'Authorization': 'Bearer {}'.format(self._token), 
-                'Accept': 'application/json'}
+            headers=self._auth_headers(Accept='application/json')
         )
  
         if self._exceptions == True: 
@@ -319,18 +622,17 @@ class YouTubeAuthClient(YouTubeAPIClient):
  
     async def getRating(self, resource: str, **kwargs) -> YouTubeAPIResponse:
         
-        endpoint = build_endpoint(resource=resource, key=self._key, append='getRating', **kwargs)
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, append='getRating', **kwargs)
 
         result = await self._youtube_session.request(
             method='GET',
             endpoint=endpoint,
-            headers={'Authorization': 'Bearer {}'.format(self._token)}
+            headers=self._auth_headers()
         )
         
-        data = ast.literal_eval(result[1].decode('UTF8'))
         if self._exceptions == True: 
-            await is_http_exception(result[0], data)
-        return YouTubeAPIResponse(result[0], data, result[2])
+            await is_http_exception(result[0], result[1])
+        return self._response(result)
         
     async def reportAbuse(
         self, 
@@ -339,13 +641,13 @@ class YouTubeAuthClient(YouTubeAPIClient):
         **kwargs
     ) -> YouTubeAPIResponse:
         
-        endpoint = build_endpoint(resource=resource, key=self._key, append='reportAbuse' **kwargs)
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, append='reportAbuse' **kwargs)
 
         result = await self._youtube_session.request(
             method='POST',
             endpoint=endpoint,
             body=json.dumps(data),
-            headers={'Authorization': 'Bearer {}'.format(self._token)},
+            headers=self._auth_headers(),
         )
         
         if self._exceptions == True: 
@@ -354,12 +656,12 @@ class YouTubeAuthClient(YouTubeAPIClient):
 
     async def delete(self, resource: str, **kwargs) -> YouTubeAPIResponse:
 
-        endpoint = build_endpoint(resource=resource, key=self._key, **kwargs)
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, **kwargs)
 
         result = await self._youtube_session.request(
             method='DELETE',
             endpoint=endpoint,
-            headers={'Authorization': 'Bearer {}'.format(self._token)}
+            headers=self._auth_headers()
         )
 
         if self._exceptions == True: 
@@ -373,31 +675,29 @@ class YouTubeAuthClient(YouTubeAPIClient):
         **kwargs
     ) -> YouTubeAPIResponse:
 
-        endpoint = build_endpoint(resource=resource, key=self._key, append='set', **kwargs)
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, append='set', **kwargs)
 
         result = await self._youtube_session.request(
             method='POST',
             endpoint=endpoint,
             upload=True,
-            headers={'Authorization': 'Bearer {}'.format(self._token),
-                'Content-Type': 'application/octet-stream'},
+            headers=self._auth_headers(**{'Content-Type': 'application/octet-stream'}),
             body=data
         )
 
-        data = ast.literal_eval(result[1].decode('UTF8'))
         if self._exceptions == True: 
-            await is_http_exception(result[0], data)
-        return YouTubeAPIResponse(result[0], data, result[2])
+            await is_http_exception(result[0], result[1])
+        return self._response(result)
 
     async def unset(self, resource: str, **kwargs) -> YouTubeAPIResponse:
 
-        endpoint = build_endpoint(resource=resource, key=self._key, append='unset', **kwargs)
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, append='unset', **kwargs)
 
         result = await self._youtube_session.request(
             method='POST',
             endpoint=endpoint,
             upload=True,
-            headers={'Authorization': 'Bearer {}'.format(self._token)}
+            headers=self._auth_headers()
         )
 
         if self._exceptions == True: 
@@ -413,26 +713,103 @@ class YouTubeAuthClient(YouTubeAPIClient):
         **kwargs
     ) -> YouTubeAPIResponse:
 
-        endpoint = build_endpoint(resource=resource, key=self._key, append=append, **kwargs)
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, append=append, **kwargs)
 
         result = await self._youtube_session.request(
             method='GET',
             endpoint=endpoint,
-            headers={'Authorization': 'Bearer {}'.format(self._token)}
+            headers=self._auth_headers()
         )
 
         if self._exceptions == True: 
             await is_http_exception(result[0], result[1])
         return YouTubeAPIResponse(result[0], result[1], result[2])
 
+    # streams the body of a download in chunks instead of reading it into memory.
+    # a positive offset requests the body from that byte on with a Range header.
+    # error responses are always raised as HTTPException.
+
+    async def download_stream(
+        self, 
+        resource: str, 
+        append: Optional[str] = None, 
+        chunk_size: int = 65536, 
+        offset: int = 0, 
+        **kwargs
+    ) -> AsyncIterator[bytes]:
+
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, append=append, **kwargs)
+
+        # ranges of a gzip encoded body count compressed bytes, which neither 
+        # match the file offset nor can be decompressed from the middle
+
+        headers = self._auth_headers()
+        if offset > 0:
+            headers['Range'] = 'bytes={}-'.format(offset)
+            headers['Accept-Encoding'] = 'identity'
+
+        async with self._youtube_session.stream(
+            method='GET', 
+            endpoint=endpoint, 
+            headers=headers
+        ) as stream:
+            
+            if stream.status < 200 or stream.status >= 300:
+                await is_http_exception(stream.status, await stream.read())
+
+            # servers that ignore the Range header send the whole body
+            skip = offset if offset > 0 and stream.status != 206 else 0
+            async for chunk in stream.iter_chunks(chunk_size):
+                if skip > 0:
+                    chunk, skip = chunk[skip:], max(0, skip - len(chunk))
+                if len(chunk) > 0:
+                    yield chunk
+
+    # writes a download to a file path, a binary file object or a sink callable 
+    # and returns the number of bytes written. with resume a partially downloaded
+    # file path continues from its current size.
+
+    async def download_to(
+        self, 
+        resource: str, 
+        file: Union[str, os.PathLike, Any], 
+        append: Optional[str] = None, 
+        chunk_size: int = 65536, 
+        resume: bool = False, 
+        **kwargs
+    ) -> int:
+
+        offset = 0
+        close = False
+        if isinstance(file, (str, os.PathLike)):
+            if resume and os.path.exists(file):
+                offset = os.path.getsize(file)
+            file = open(file, 'ab' if offset > 0 else 'wb')
+            close = True
+
+        write = file.write if hasattr(file, 'write') else file
+        written = 0
+        try:
+            async for chunk in self.download_stream(resource, append=append, 
+                chunk_size=chunk_size, offset=offset, **kwargs):
+                
+                result = write(chunk)
+                if asyncio.iscoroutine(result):
+                    await result
+                written += len(chunk)
+        finally:
+            if close:
+                file.close()
+        return written
+
     async def markAsSpam(self, resource: str, **kwargs) -> YouTubeAPIResponse:
 
-        endpoint = build_endpoint(resource=resource, key=self._key, append='markAsSpam' **kwargs)
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, append='markAsSpam' **kwargs)
 
         result = await self._youtube_session.request(
             method='POST',
             endpoint=endpoint,
-            headers={'Authorization': 'Bearer {}'.format(self._token)}
+            headers=self._auth_headers()
         )
 
         if self._exceptions == True: 
@@ -445,12 +822,12 @@ class YouTubeAuthClient(YouTubeAPIClient):
         **kwargs
     ) -> YouTubeAPIResponse:
 
-        endpoint = build_endpoint(resource=resource, key=self._key, append='setModerationStatus' **kwargs)
+        endpoint = build_endpoint(resource=resource, key=self._endpoint_key, append='setModerationStatus' **kwargs)
 
         result = await self._youtube_session.request(
             method='POST',
             endpoint=endpoint,
-            headers={'Authorization': 'Bearer {}'.format(self._token)}
+            headers=self._auth_headers()
         )
 
         if self._exceptions == True: 
@@ -471,10 +848,11 @@ class YouTubeHybridClient(YouTubeAuthClient, YouTubeClient):
             YouTubeClient
         
         Attribute(s):
-            key type(str): YouTube API key 
+            key type(Union[str, YouTubeKeyPool]): YouTube API key or key pool 
             token type(str): Access token
             http_exceptions type(bool): flag turning on or off http specific exceptions
             client_session type(aiohttp.ClientSession): async http session from aiohttp library
+            kwargs type(MutableMapping): keyword arguments passed to YouTubeAPISession on connect
     """
 
     def __init__(
@@ -482,9 +860,10 @@ class YouTubeHybridClient(YouTubeAuthClient, YouTubeClient):
         key: str, 
         token: str,
         client_session: aiohttp.ClientSession = None,
-        http_exceptions: bool = False
+        http_exceptions: bool = False,
+        **kwargs
     ) -> None:
-        super().__init__(key, token, client_session, http_exceptions)
+        super().__init__(key, token, client_session, http_exceptions, **kwargs)
 
     async def list_(
         self, 
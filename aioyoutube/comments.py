@@ -0,0 +1,165 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, MutableMapping, Optional
+
+
+class YouTubeCommentCrawler:
+
+    """
+        Streams every comment of a video or channel with replies expanded.
+
+        Comment thread pages are fetched ahead while reply pages are fetched 
+        for threads with more replies than commentThreads returns inline, 
+        with at most concurrency reply fetches in flight. Each thread is 
+        yielded without its inline replies, followed by its replies as 
+        comment resources as they arrive, so replies of a thread may come 
+        after later threads. Items pass through a bounded buffer, so a slow 
+        consumer holds back the requests instead of buffering comments.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            client type(YouTubeAPIClient): connected client whose paginate coroutine is used
+            concurrency type(int): reply fetches in flight
+            buffer type(int): items fetched ahead of the consumer
+            part type(list): parts requested for comment threads
+            reply_part type(list): parts requested for replies
+            threads type(int): number of threads yielded by the last crawl
+            replies type(int): number of replies yielded by the last crawl
+    """
+
+    def __init__(
+        self, 
+        client, 
+        concurrency: int = 5, 
+        buffer: int = 100, 
+        part: list = ['snippet', 'replies'], 
+        reply_part: list = ['snippet']
+    ) -> None:
+
+        self.client = client
+        self.concurrency = concurrency
+        self.buffer = buffer
+        self.part = part
+        self.reply_part = reply_part
+        self.threads = 0
+        self.replies = 0
+
+    # keyword arguments are passed to commentThreads.list, 
+    # ex. allThreadsRelatedToChannelId='...', order='relevance', searchTerms='...'
+
+    async def crawl(
+        self, 
+        video_id: Optional[str] = None, 
+        text_format: str = 'plainText', 
+        **kwargs
+    ) -> AsyncIterator[MutableMapping]:
+
+        if video_id != None:
+            kwargs['videoId'] = video_id
+        kwargs.setdefault('maxResults', 100)
+        kwargs['textFormat'] = text_format
+
+        queue = asyncio.Queue(maxsize=self.buffer)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        self.threads = 0
+        self.replies = 0
+
+        async def fetch_replies(parent_id: str) -> None:
+            try:
+                async for reply in self.client.paginate('comment', self.reply_part, 
+                    parentId=parent_id, maxResults=100, textFormat=text_format):
+                    await queue.put(reply)
+            except Exception as e:
+                await queue.put(e)
+            finally:
+                semaphore.release()
+
+        async def fetch_threads() -> None:
+            try:
+                async for thread in self.client.paginate('commentThread', self.part, 
+                    **kwargs):
+                    replies = thread.pop('replies', {}).get('comments', [])
+                    await queue.put(thread)
+                    total = thread.get('snippet', {}).get('totalReplyCount', 0)
+                    if total > len(replies):
+                        await semaphore.acquire()
+                        task = asyncio.ensure_future(fetch_replies(thread['id']))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    else:
+                        for reply in replies:
+                            await queue.put(reply)
+                if len(tasks) > 0:
+                    await asyncio.wait(list(tasks))
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(None)
+
+        producer = asyncio.ensure_future(fetch_threads())
+        try:
+            while True:
+                item = await queue.get()
+                if item == None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                if item.get('kind') == 'youtube#commentThread':
+                    self.threads += 1
+                else:
+                    self.replies += 1
+                yield item
+        finally:
+            for task in [producer, *tasks]:
+                task.cancel()
+
+    # writes every crawled item as one JSON line to a path or text file object
+    # and returns the number of lines written
+
+    async def write_ndjson(
+        self, 
+        file: Any, 
+        video_id: Optional[str] = None, 
+        **kwargs
+    ) -> int:
+
+        if isinstance(file, str):
+            with open(file, 'w', encoding='utf-8') as f:
+                return await self.write_ndjson(f, video_id, **kwargs)
+
+        count = 0
+        async for item in self.crawl(video_id, **kwargs):
+            file.write(json.dumps(item, ensure_ascii=False))
+            file.write('\n')
+            count += 1
+        return count
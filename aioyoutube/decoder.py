@@ -0,0 +1,98 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import json
+from typing import Any, Callable, Optional, Union
+
+
+# optional json backends are tried in order of speed and the first one that
+# can be imported becomes the default decoder. stdlib json is always available.
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+def _ujson_loads(data: Union[bytes, str]) -> Any:
+    if type(data) == bytes:
+        data = data.decode('UTF8')
+    return ujson.loads(data)
+
+
+DECODERS = {'json': _json_loads}
+
+if ujson != None:
+    DECODERS['ujson'] = _ujson_loads
+
+if orjson != None:
+    DECODERS['orjson'] = orjson.loads
+
+
+_decoder_name = 'orjson' if orjson != None else 'ujson' if ujson != None else 'json'
+_decoder = DECODERS[_decoder_name]
+
+
+def get_decoders() -> list:
+    return list(DECODERS)
+
+def get_decoder() -> str:
+    return _decoder_name
+
+
+# replaces the backend used by decode. a custom callable taking bytes can be 
+# registered under a new name with the optional loads argument.
+
+def set_decoder(name: str, loads: Optional[Callable[[bytes], Any]] = None) -> None:
+
+    global _decoder, _decoder_name
+
+    if loads != None:
+        DECODERS[name] = loads
+    elif name not in DECODERS:
+        raise ValueError('Decoder must be one of: {}'.format(get_decoders()))
+
+    _decoder = DECODERS[name]
+    _decoder_name = name
+
+
+# decodes the raw bytes returned by YouTubeAPISession.request into python objects.
+# an empty body (ex. 204 No Content) decodes to None.
+
+def decode(data: Optional[Union[bytes, str]]) -> Any:
+
+    if not data:
+        return None
+    return _decoder(data)
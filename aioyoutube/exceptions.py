@@ -25,10 +25,9 @@ DEALINGS IN THE SOFTWARE.
 """
 
 
-import ast
 from typing import Union, MutableMapping
-from .http import YouTubeAPIResponse
-from .valid import get_youtube_resources, get_ratings
+from .decoder import decode
+from .valid import get_youtube_resources, get_ratings, get_resource_parts
 
 
 async def is_http_exception(
@@ -39,8 +38,7 @@ async def is_http_exception(
     if status < 200 or status >= 300:
         data_ = data
         if type(data_) == bytes:
-            data_= ast.literal_eval(data_.decode('UTF8'))
-            print(data_)
+            data_ = decode(data_)
         raise HTTPException(status, data_)
     else:
         return
@@ -131,6 +129,128 @@ class RatingInvalidException(YouTubeAPIException):
         super().__init__(self.message)
 
 
+class FieldInvalidException(YouTubeAPIException):
+
+    """
+        Invalid field path exception.
+
+        This exception occurs when a field path given for a field mask does 
+        not start with a part of the resource or is malformed.
+
+        Parent(s):
+            YouTubeAPIException
+
+        Attribute(s):
+            resource type(str): YouTube resource the field was given for
+            path type(str): invalid dotted field path
+    """
+
+    def __init__(self, resource: str, path: str) -> None:
+
+        self.resource = resource
+        self.path = path
+        self.message = 'Field "{}" of {} must start with one of: {}'.format(
+            path, resource, sorted(get_resource_parts(resource) + ['etag', 'kind']))
+        super().__init__(self.message)
+
+
+class QuotaExceededException(YouTubeAPIException):
+
+    """
+        Quota exceeded exception.
+
+        This exception occurs when a QuotaScheduler cannot grant the quota 
+        units of a request, either because the request costs more than the 
+        scheduler can ever hold or because waiting for the units would exceed 
+        the maximum wait of the scheduler.
+
+        Parent(s):
+            YouTubeAPIException
+
+        Attribute(s):
+            units type(int): quota units requested
+            available type(float): quota units available when the request was made
+    """
+
+    def __init__(self, units: int, available: float) -> None:
+
+        self.units = units
+        self.available = available
+        self.message = 'Request needs {} quota units but only {} are available'.format(
+            units, int(available))
+        super().__init__(self.message)
+
+
+class KeyPoolExhaustedException(YouTubeAPIException):
+
+    """
+        Key pool exhausted exception.
+
+        This exception occurs when every key of a YouTubeKeyPool has been taken
+        out of rotation after quotaExceeded or invalid key responses.
+
+        Parent(s):
+            YouTubeAPIException
+
+        Attribute(s):
+            keys type(int): number of keys in the pool
+    """
+
+    def __init__(self, keys: int) -> None:
+
+        self.keys = keys
+        self.message = 'All {} keys of the key pool are out of rotation'.format(keys)
+        super().__init__(self.message)
+
+
+class CrawlWorkerException(YouTubeAPIException):
+
+    """
+        Crawl worker exception.
+
+        This exception occurs when a worker process of a YouTubeCrawlRunner
+        exits before it has finished its share of the tasks.
+
+        Parent(s):
+            YouTubeAPIException
+
+        Attribute(s):
+            worker type(int): number of the worker process
+            exitcode type(int): exit code of the worker process
+    """
+
+    def __init__(self, worker: int, exitcode: int) -> None:
+
+        self.worker = worker
+        self.exitcode = exitcode
+        self.message = 'Crawl worker {} exited with code {}'.format(worker, exitcode)
+        super().__init__(self.message)
+
+
+class TokenRefreshException(YouTubeAPIException):
+
+    """
+        Token refresh exception.
+
+        This exception occurs when YouTubeCredentials cannot get a new access 
+        token from the token endpoint.
+
+        Parent(s):
+            YouTubeAPIException
+
+        Attribute(s):
+            status type(int): http status code returned by the token endpoint
+            error type(str): error returned by the token endpoint
+    """
+
+    def __init__(self, status: int, error: str) -> None:
+
+        self.status = status
+        self.error = error
+        self.message = 'Token refresh failed with status {}: {}'.format(status, error)
+        super().__init__(self.message)
+
+
 class NoneValueException(Exception):
 
     """
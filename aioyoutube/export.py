@@ -0,0 +1,341 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import array
+import math
+import re
+from typing import Any, AsyncIterable, Iterable, Iterator, List, MutableMapping, Optional, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+# column kinds and the default columns of videos.list exports. numeric values 
+# are sent as strings by the api and durations in ISO 8601, ex. PT4M13S
+
+KINDS = ('str', 'int', 'float', 'bool', 'duration')
+
+VIDEO_COLUMNS = {
+    'id': ('id', 'str'),
+    'title': ('snippet.title', 'str'),
+    'channel_id': ('snippet.channelId', 'str'),
+    'published_at': ('snippet.publishedAt', 'str'),
+    'duration': ('contentDetails.duration', 'duration'),
+    'definition': ('contentDetails.definition', 'str'),
+    'view_count': ('statistics.viewCount', 'int'),
+    'like_count': ('statistics.likeCount', 'int'),
+    'comment_count': ('statistics.commentCount', 'int')
+}
+
+# every part of a duration is optional, so any string made of the P prefix and 
+# valid parts matches and anything else, ex. 'bogus', does not
+
+_DURATION = re.compile(r'P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?')
+_DURATION_UNITS = (604800, 86400, 3600, 60, 1)
+
+_BOOLEANS = {'true': True, 'false': False}
+
+_EMPTY = {}
+
+
+# parses ISO 8601 durations to seconds, with missing for values that are None 
+# or not durations.
+# durations repeat a lot across videos, so parsed values are kept in cache.
+
+def parse_durations(
+    values: List[Optional[str]], 
+    missing: Optional[int] = -1, 
+    cache: Optional[MutableMapping] = None
+) -> List[Optional[int]]:
+
+    cache = {} if cache == None else cache
+    result = []
+    for value in values:
+        seconds = cache.get(value)
+        if seconds == None:
+            match = _DURATION.fullmatch(value) if isinstance(value, str) else None
+            if match == None:
+                seconds = missing
+            else:
+                seconds = sum(int(group) * unit for group, unit in 
+                    zip(match.groups(), _DURATION_UNITS) if group)
+                cache[value] = seconds
+        result.append(seconds)
+    return result
+
+
+# parses booleans and the 'true' and 'false' strings the api sends for some 
+# fields, ex. contentDetails.caption, with missing for anything else
+
+def parse_booleans(
+    values: List[Any], 
+    missing: Optional[int] = -1
+) -> List[Any]:
+
+    result = []
+    for value in values:
+        if isinstance(value, bool):
+            result.append(value)
+        elif isinstance(value, str) and value.lower() in _BOOLEANS:
+            result.append(_BOOLEANS[value.lower()])
+        else:
+            result.append(missing)
+    return result
+
+
+# returns a function reading a dotted path from an item, None when it is missing
+
+def _getter(keys: Tuple[str, ...]) -> Any:
+
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda item: item.get(key)
+    if len(keys) == 2:
+        first, second = keys
+        return lambda item: (item.get(first) or _EMPTY).get(second)
+
+    def get(item: MutableMapping) -> Any:
+        for key in keys:
+            item = item.get(key) if isinstance(item, dict) else None
+        return item
+    return get
+
+
+def _resolve_backend(backend: str) -> str:
+
+    if backend == 'auto':
+        return 'arrow' if pyarrow != None else 'numpy' if numpy != None else 'python'
+    if backend == 'arrow' and pyarrow == None:
+        raise ImportError('the arrow backend requires pyarrow, pip install aioyoutube.py[export]')
+    if backend == 'numpy' and numpy == None:
+        raise ImportError('the numpy backend requires numpy, pip install aioyoutube.py[export]')
+    if backend not in ('arrow', 'numpy', 'python'):
+        raise ValueError('unknown backend {}'.format(backend))
+    return backend
+
+
+class YouTubeColumnarExporter:
+
+    """
+        Exports selected item fields of list responses into columnar buffers.
+
+        Items are added from responses, item iterables or async iterators such 
+        as paginate. Values are gathered per column for chunk_size rows and 
+        then converted in bulk: numeric strings with one mapped parse or cast, 
+        durations once per distinct value, into Arrow arrays when pyarrow is 
+        installed, NumPy arrays when numpy is, or array.array otherwise. Only the current chunk
+        is held as Python objects. With a parquet path every full chunk is 
+        written to the file as a row group and dropped from memory.
+
+        Booleans are read from JSON booleans and the strings 'true' and 'false'. 
+        Missing numeric values and missing or invalid durations and booleans 
+        are null in Arrow, and -1 (int, duration, bool) or nan (float) in the 
+        other backends, which store bool columns as int8 so -1 stays distinct.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            columns type(MutableMapping): (dotted item path, kind) pairs by column name, defaults to VIDEO_COLUMNS
+            chunk_size type(int): rows converted at a time
+            backend type(str): one of auto, arrow, numpy or python
+            parquet type(str): optional path of a Parquet file chunks are written to, requires pyarrow
+            rows type(int): number of rows added
+    """
+
+    def __init__(
+        self, 
+        columns: Optional[MutableMapping] = None, 
+        chunk_size: int = 8192, 
+        backend: str = 'auto', 
+        parquet: Optional[str] = None
+    ) -> None:
+
+        self.columns = dict(columns or VIDEO_COLUMNS)
+        for name, (path, kind) in self.columns.items():
+            if kind not in KINDS:
+                raise ValueError('unknown kind {} of column {}'.format(kind, name))
+        self.chunk_size = chunk_size
+        self.backend = _resolve_backend('arrow' if parquet != None else backend)
+        self.parquet = parquet
+        self.rows = 0
+        self._getters = [_getter(tuple(path.split('.'))) for path, _ in self.columns.values()]
+        self._durations = {}
+        self._size = 0
+        self._reset()
+        self._chunks = []
+        self._writer = None
+
+    # takes a YouTubeAPIResponse, a decoded response body or an iterable of items
+
+    def add(self, items: Any) -> None:
+
+        if hasattr(items, 'data'):
+            items = items.data
+        if isinstance(items, dict):
+            items = items.get('items', [])
+
+        for item in items:
+            for get, append in self._extract:
+                append(get(item))
+            self.rows += 1
+            self._size += 1
+            if self._size >= self.chunk_size:
+                self.flush()
+
+    def _reset(self) -> None:
+
+        self._pending = [[] for _ in self.columns]
+        self._extract = [(get, values.append) 
+            for get, values in zip(self._getters, self._pending)]
+        self._size = 0
+
+    # takes an async iterator of items, ex. paginate, or of responses
+
+    async def consume(self, source: AsyncIterable) -> int:
+
+        rows = self.rows
+        async for value in source:
+            if hasattr(value, 'data') or 'items' in value:
+                self.add(value)
+            else:
+                self.add((value,))
+        return self.rows - rows
+
+    # converts the pending rows into a chunk of columns
+
+    def flush(self) -> None:
+
+        if self._size == 0:
+            return
+        chunk = {name: self._convert(values, kind) for (name, (_, kind)), values 
+            in zip(self.columns.items(), self._pending)}
+        self._reset()
+        if len(self._durations) > 65536:
+            self._durations.clear()
+
+        if self.parquet != None:
+            batch = pyarrow.RecordBatch.from_arrays(list(chunk.values()), list(chunk))
+            if self._writer == None:
+                self._writer = pyarrow.parquet.ParquetWriter(self.parquet, batch.schema)
+            self._writer.write_table(pyarrow.Table.from_batches([batch]))
+        else:
+            self._chunks.append(chunk)
+
+    def _convert(self, values: list, kind: str) -> Any:
+
+        if self.backend == 'arrow':
+            if kind == 'duration':
+                return pyarrow.array(parse_durations(values, None, self._durations), 
+                    pyarrow.int64())
+            if kind in ('int', 'float'):
+                return pyarrow.array(values, pyarrow.string()).cast(
+                    pyarrow.int64() if kind == 'int' else pyarrow.float64())
+            if kind == 'bool':
+                return pyarrow.array(parse_booleans(values, None), pyarrow.bool_())
+            return pyarrow.array(values, pyarrow.string())
+
+        if self.backend == 'numpy':
+            if kind == 'duration':
+                return numpy.array(parse_durations(values, -1, self._durations), numpy.int64)
+            if kind in ('int', 'float'):
+                return numpy.fromiter(self._numbers(values, kind), 
+                    numpy.int64 if kind == 'int' else numpy.float64, len(values))
+            if kind == 'bool':
+                return numpy.array(parse_booleans(values), numpy.int8)
+            return numpy.array(values, object)
+
+        if kind == 'duration':
+            return array.array('q', parse_durations(values, -1, self._durations))
+        if kind in ('int', 'float'):
+            return array.array('q' if kind == 'int' else 'd', self._numbers(values, kind))
+        if kind == 'bool':
+            return array.array('b', parse_booleans(values))
+        return values
+
+    # parses numeric strings with int or float mapped over the whole chunk, 
+    # which only falls back to checking every value when some are missing
+
+    def _numbers(self, values: list, kind: str) -> Iterable:
+
+        parse = int if kind == 'int' else float
+        if None not in values:
+            return map(parse, values)
+        missing = -1 if kind == 'int' else math.nan
+        return (missing if value == None else parse(value) for value in values)
+
+    # yields the converted chunks as mappings of column name to column
+
+    def iter_chunks(self) -> Iterator[MutableMapping]:
+        self.flush()
+        return iter(self._chunks)
+
+    # returns every column joined into one NumPy array
+
+    def to_numpy(self) -> MutableMapping:
+
+        if numpy == None:
+            raise ImportError('to_numpy requires numpy, pip install aioyoutube.py[export]')
+        chunks = list(self.iter_chunks())
+        return {name: numpy.concatenate([numpy.asarray(chunk[name]) for chunk in chunks]) 
+            if chunks else numpy.array([]) for name in self.columns}
+
+    # returns every column joined into one Python list
+
+    def to_lists(self) -> MutableMapping:
+
+        chunks = list(self.iter_chunks())
+        return {name: [value for chunk in chunks for value in 
+            (chunk[name].to_pylist() if hasattr(chunk[name], 'to_pylist') else chunk[name])] 
+            for name in self.columns}
+
+    def to_arrow(self) -> Any:
+
+        if self.backend != 'arrow':
+            raise ImportError('to_arrow requires the arrow backend and pyarrow')
+        batches = [pyarrow.RecordBatch.from_arrays(list(chunk.values()), list(chunk)) 
+            for chunk in self.iter_chunks()]
+        if len(batches) == 0:
+            return pyarrow.table({name: [] for name in self.columns})
+        return pyarrow.Table.from_batches(batches)
+
+    # writes the pending rows and closes the Parquet file
+
+    def close(self) -> None:
+
+        self.flush()
+        if self._writer != None:
+            self._writer.close()
+            self._writer = None
@@ -0,0 +1,132 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import functools
+from typing import Iterable, MutableMapping, Tuple
+from .valid import RESOURCE_PARTS, ITEM_FIELDS
+from .exceptions import FieldInvalidException, ResourceInvalidException
+
+
+class FieldMask:
+
+    """
+        Smallest part list and partial response mask for a set of item fields.
+
+        Created by field_mask from dotted attribute paths of a resource item.
+        ex. field_mask('video', ['snippet.title', 'statistics.viewCount']) gives
+        part ['snippet', 'statistics'] and 
+        fields 'items(snippet(title),statistics(viewCount)),nextPageToken'
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            resource type(str): YouTube resource the mask was built for
+            paths type(tuple): sorted dotted attribute paths of an item
+            part type(list): parts to request
+            fields type(str): value for the fields query parameter
+    """
+
+    __slots__ = ('resource', 'paths', 'part', 'fields')
+
+    def __init__(self, resource: str, paths: Tuple[str], part: list, fields: str) -> None:
+
+        self.resource = resource
+        self.paths = paths
+        self.part = part
+        self.fields = fields
+
+    def __repr__(self) -> str:
+        return '<FieldMask part={!r} fields={!r}>'.format(','.join(self.part), self.fields)
+
+
+# renders a tree of field names into partial response syntax
+# ex. {'snippet': {'title': {}}, 'id': {}} -> 'id,snippet(title)'
+
+def _render(tree: MutableMapping) -> str:
+
+    fields = []
+    for name in sorted(tree):
+        if len(tree[name]) > 0:
+            fields.append('{}({})'.format(name, _render(tree[name])))
+        else:
+            fields.append(name)
+    return ','.join(fields)
+
+
+@functools.lru_cache(maxsize=256)
+def _field_mask(resource: str, paths: Tuple[str], extra: Tuple[str]) -> FieldMask:
+
+    if resource not in RESOURCE_PARTS:
+        raise ResourceInvalidException
+
+    parts = RESOURCE_PARTS[resource]
+    tree, part = {}, set()
+
+    for path in paths:
+        names = path.split('.')
+        if '' in names:
+            raise FieldInvalidException(resource, path)
+        if names[0] in parts:
+            part.add(names[0])
+        elif names[0] not in ITEM_FIELDS:
+            raise FieldInvalidException(resource, path)
+
+        node = tree
+        for name in names:
+            # a shorter path already selects the whole subtree
+            if node.get(name) == {} and name != names[-1]:
+                break
+            node = node.setdefault(name, {})
+        else:
+            node.clear()
+
+    # at least one part is always required by the api
+    if len(part) == 0:
+        part.add('id' if 'id' in parts else sorted(parts)[0])
+
+    fields = 'items({})'.format(_render(tree))
+    if len(extra) > 0:
+        fields += ',' + ','.join(extra)
+
+    return FieldMask(resource, paths, sorted(part), fields)
+
+
+# returns the field mask for the dotted attribute paths of a resource item.
+# masks are cached per resource and set of paths. extra top level fields of 
+# the response are added to the mask, nextPageToken by default so that 
+# pagination keeps working.
+
+def field_mask(
+    resource: str, 
+    paths: Iterable[str], 
+    extra: Iterable[str] = ('nextPageToken',)
+) -> FieldMask:
+    
+    if 'youtube#' in resource:
+        resource = resource.split('#')[1]
+    return _field_mask(resource, tuple(sorted(set(paths))), tuple(extra))
@@ -0,0 +1,329 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import asyncio
+import bisect
+import logging
+import time
+from typing import Any, Callable, MutableMapping, Optional
+from .cache import normalize_endpoint
+from .quota import parse_endpoint
+
+
+EVENTS = ('before_send', 'first_byte', 'body_read', 'decode_done', 'error')
+
+
+class RequestEvent:
+
+    """
+        Instrumentation event of a request made by a YouTubeAPISession.
+
+        The same event object is passed to every hook of one request attempt and
+        is filled in as the attempt progresses.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            name type(str): name of the event, one of EVENTS
+            method type(str): http method
+            endpoint type(str): normalized endpoint without the api key
+            resource type(str): YouTube resource of the endpoint
+            api_method type(str): api method of the endpoint (ex. list, insert, rate)
+            status type(int): http status code, None before the first byte
+            bytes type(int): decompressed body bytes, None before the body is read
+            wire_bytes type(int): body bytes received on the wire
+            retries type(int): retries made before this attempt
+            units type(int): estimated quota units of the request
+            error type(BaseException): exception of a failed attempt
+            start type(float): time.perf_counter() when the attempt was sent
+            timings type(MutableMapping): seconds from start to each event
+    """
+
+    __slots__ = (
+        'name', 'method', 'endpoint', 'resource', 'api_method', 'status', 'bytes', 
+        'wire_bytes', 'retries', 'units', 'error', 'start', 'timings', '_hooks'
+    )
+
+    def __init__(
+        self, 
+        hooks: 'YouTubeHooks', 
+        method: str, 
+        endpoint: str, 
+        retries: int, 
+        units: int
+    ) -> None:
+
+        self._hooks = hooks
+        self.name = None
+        self.method = method
+        self.endpoint = normalize_endpoint(endpoint)
+        self.resource, self.api_method = parse_endpoint(method, endpoint)
+        self.status = None
+        self.bytes = None
+        self.wire_bytes = None
+        self.retries = retries
+        self.units = units
+        self.error = None
+        self.start = time.perf_counter()
+        self.timings = {}
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def emit(self, name: str) -> None:
+        self._hooks.emit(name, self)
+
+    def to_dict(self) -> MutableMapping:
+        return {name: getattr(self, name) for name in self.__slots__ if name != '_hooks'}
+
+
+class YouTubeHooks:
+
+    """
+        Registry of instrumentation hooks for a YouTubeAPISession.
+
+        Pass an instance to YouTubeAPISession (or a client) with the hooks keyword
+        argument. Callbacks registered with on receive the RequestEvent of one 
+        event name, callbacks registered with add receive every event. Callbacks 
+        may be coroutine functions, in which case they are scheduled as tasks. 
+        Sessions without hooks skip all instrumentation.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            callbacks type(MutableMapping): callbacks by event name
+    """
+
+    def __init__(self) -> None:
+        self.callbacks = {name: [] for name in EVENTS}
+
+    def on(self, name: str, callback: Callable[[RequestEvent], Any]) -> None:
+
+        if name not in self.callbacks:
+            raise ValueError('Event must be one of: {}'.format(list(EVENTS)))
+        self.callbacks[name].append(callback)
+
+    def add(self, callback: Callable[[RequestEvent], Any]) -> None:
+        for name in EVENTS:
+            self.callbacks[name].append(callback)
+
+    def remove(self, callback: Callable[[RequestEvent], Any]) -> None:
+        for callbacks in self.callbacks.values():
+            while callback in callbacks:
+                callbacks.remove(callback)
+
+    def create(self, method: str, endpoint: str, retries: int, units: int) -> RequestEvent:
+        return RequestEvent(self, method, endpoint, retries, units)
+
+    def emit(self, name: str, event: RequestEvent) -> None:
+
+        event.name = name
+        event.timings[name] = time.perf_counter() - event.start
+        for callback in self.callbacks[name]:
+            result = callback(event)
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+
+
+class LoggingHook:
+
+    """
+        Hook writing every request event to a logger.
+
+        ex. hooks.add(LoggingHook())
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            logger type(logging.Logger): logger written to, defaults to the aioyoutube logger
+            level type(int): level of regular events, errors are logged as warnings
+    """
+
+    def __init__(
+        self, 
+        logger: Optional[logging.Logger] = None, 
+        level: int = logging.DEBUG
+    ) -> None:
+
+        self.logger = logger or logging.getLogger('aioyoutube')
+        self.level = level
+
+    def __call__(self, event: RequestEvent) -> None:
+
+        level = logging.WARNING if event.name == 'error' else self.level
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(level, '%s %s %s status=%s bytes=%s retries=%s units=%s '
+            'elapsed=%.4f error=%r', event.name, event.method, event.endpoint, 
+            event.status, event.bytes, event.retries, event.units, 
+            event.timings[event.name], event.error)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MetricsExporter:
+
+    """
+        Hook aggregating request events into metrics.
+
+        Counts requests, errors, bytes, retries and quota units and records
+        request latency (until the body is read) and decode time histograms, 
+        labelled by resource, api method and status. render returns the metrics 
+        in the Prometheus text exposition format, which the OpenTelemetry 
+        collector can also scrape.
+
+        ex. exporter = MetricsExporter(); hooks.add(exporter); print(exporter.render())
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            prefix type(str): prefix of every metric name
+            buckets type(tuple): upper bounds in seconds of the histogram buckets
+    """
+
+    def __init__(
+        self, 
+        prefix: str = 'aioyoutube', 
+        buckets: tuple = LATENCY_BUCKETS
+    ) -> None:
+
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self._counters = {}
+        self._histograms = {}
+
+    def _count(self, name: str, labels: tuple, value: float = 1) -> None:
+        key = (name, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def _observe(self, name: str, labels: tuple, value: float) -> None:
+
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram == None:
+            histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        histogram[0][bisect.bisect_left(self.buckets, value)] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+    def __call__(self, event: RequestEvent) -> None:
+
+        labels = (('resource', event.resource or ''), ('method', event.api_method))
+        if event.name == 'body_read':
+            labels += (('status', str(event.status)),)
+            self._count('requests_total', labels)
+            self._count('response_bytes_total', labels, event.bytes or 0)
+            self._count('wire_bytes_total', labels, event.wire_bytes or 0)
+            self._count('quota_units_total', labels, event.units or 0)
+            if event.retries > 0:
+                self._count('retried_requests_total', labels)
+            self._observe('request_duration_seconds', labels, event.timings['body_read'])
+        elif event.name == 'decode_done':
+            self._observe('decode_duration_seconds', labels, 
+                event.timings['decode_done'] - event.timings.get('body_read', 0))
+        elif event.name == 'error':
+            error = type(event.error).__name__ if event.error != None else str(event.status)
+            self._count('errors_total', labels + (('error', error),))
+
+    def _name(self, name: str) -> str:
+        return '{}_{}'.format(self.prefix, name)
+
+    @staticmethod
+    def _labels(labels: tuple) -> str:
+        return ','.join('{}="{}"'.format(name, value.replace('"', '\\"')) 
+            for name, value in labels)
+
+    def render(self) -> str:
+
+        lines = []
+        for name in sorted(set(key[0] for key in self._counters)):
+            lines.append('# TYPE {} counter'.format(self._name(name)))
+            for (name_, labels), value in sorted(self._counters.items()):
+                if name_ == name:
+                    lines.append('{}{{{}}} {}'.format(self._name(name), 
+                        self._labels(labels), value))
+
+        for name in sorted(set(key[0] for key in self._histograms)):
+            lines.append('# TYPE {} histogram'.format(self._name(name)))
+            for (name_, labels), (counts, sum_, count) in sorted(self._histograms.items()):
+                if name_ != name:
+                    continue
+                cumulative = 0
+                for bound, bucket in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += bucket
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append('{}_bucket{{{},le="{}"}} {}'.format(self._name(name), 
+                        self._labels(labels), le, cumulative))
+                lines.append('{}_sum{{{}}} {}'.format(self._name(name), self._labels(labels), sum_))
+                lines.append('{}_count{{{}}} {}'.format(self._name(name), self._labels(labels), count))
+
+        return '\n'.join(lines) + '\n'
+
+
+class OpenTelemetryHook:
+
+    """
+        Hook recording request events with an OpenTelemetry meter.
+
+        Works with any meter of the opentelemetry-api package, which is not a 
+        dependency of this library. 
+        ex. hooks.add(OpenTelemetryHook(metrics.get_meter('aioyoutube')))
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            meter type(opentelemetry.metrics.Meter): meter the instruments are created with
+    """
+
+    def __init__(self, meter: Any) -> None:
+
+        self.meter = meter
+        self._requests = meter.create_counter('aioyoutube.requests')
+        self._errors = meter.create_counter('aioyoutube.errors')
+        self._units = meter.create_counter('aioyoutube.quota_units')
+        self._bytes = meter.create_counter('aioyoutube.response_bytes', unit='By')
+        self._duration = meter.create_histogram('aioyoutube.request_duration', unit='s')
+
+    def __call__(self, event: RequestEvent) -> None:
+
+        attributes = {'resource': event.resource or '', 'method': event.api_method}
+        if event.name == 'body_read':
+            attributes['status'] = event.status
+            attributes['retries'] = event.retries
+            self._requests.add(1, attributes)
+            self._units.add(event.units or 0, attributes)
+            self._bytes.add(event.bytes or 0, attributes)
+            self._duration.record(event.timings['body_read'], attributes)
+        elif event.name == 'error':
+            self._errors.add(1, attributes)
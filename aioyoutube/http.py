@@ -26,14 +26,124 @@ DEALINGS IN THE SOFTWARE.
 
 
 import asyncio
+import contextlib
 import aiohttp
-from typing import Any, Optional, MutableMapping, Tuple, Union
+from typing import Any, AsyncIterator, Iterator, Optional, MutableMapping, Tuple, Union
 from aiohttp import ClientSession
+from multidict import CIMultiDict, CIMultiDictProxy
+from .cache import request_key
+from .decoder import decode
+from .pool import get_pool
+from .transport import AiohttpTransport, MemoryContent
+from .quota import estimate_cost
+from .views import ResourceView, iter_views
 
 
 BASE_URL = 'https://www.googleapis.com/youtube/v3/'
 UPLOAD_URL = 'https://www.googleapis.com/upload/youtube/v3/'
 
+# google only reliably compresses responses for clients that accept gzip and 
+# send a user agent containing "(gzip)"
+
+COMPRESSION_HEADERS = {
+    'Accept-Encoding': 'gzip', 
+    'User-Agent': 'aioyoutube.py (gzip)'
+}
+IDENTITY_HEADERS = {'Accept-Encoding': 'identity'}
+
+
+# the user agent of a ClientSession that sets one is kept with "(gzip)" 
+# appended instead of being replaced
+
+def compression_headers(session: Optional[ClientSession] = None) -> MutableMapping:
+
+    agent = None if session == None else session.headers.get('User-Agent')
+    if agent == None:
+        return COMPRESSION_HEADERS
+    if '(gzip)' not in agent:
+        agent += ' (gzip)'
+    return dict(COMPRESSION_HEADERS, **{'User-Agent': agent})
+
+
+class WireStats:
+
+    """
+        Wire size accounting of a YouTubeAPISession.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            requests type(int): number of responses counted
+            compressed_bytes type(int): body bytes received on the wire
+            decompressed_bytes type(int): body bytes after decompression
+            last type(Tuple[int, int]): compressed and decompressed bytes of the last response
+    """
+
+    __slots__ = ('requests', 'compressed_bytes', 'decompressed_bytes', 'last')
+
+    def __init__(self) -> None:
+
+        self.requests = 0
+        self.compressed_bytes = 0
+        self.decompressed_bytes = 0
+        self.last = (0, 0)
+
+    @property
+    def ratio(self) -> float:
+        if self.decompressed_bytes == 0:
+            return 1.0
+        return self.compressed_bytes / self.decompressed_bytes
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.decompressed_bytes - self.compressed_bytes
+
+    def record(self, compressed: int, decompressed: int) -> None:
+
+        self.requests += 1
+        self.compressed_bytes += compressed
+        self.decompressed_bytes += decompressed
+        self.last = (compressed, decompressed)
+
+    def to_dict(self) -> MutableMapping:
+        return {
+            'requests': self.requests, 
+            'compressed_bytes': self.compressed_bytes, 
+            'decompressed_bytes': self.decompressed_bytes, 
+            'ratio': self.ratio
+        }
+
+
+class RequestResult(tuple):
+
+    """
+        Status, body and headers of a request carrying its instrumentation event.
+
+        Returned instead of a plain tuple by sessions with hooks, so the event 
+        reaches the YouTubeAPIResponse built from the result even when the 
+        request ran in another task, ex. one shared by deduplicated requests.
+
+        Parent(s):
+            tuple
+
+        Attribute(s):
+            event type(RequestEvent): event of the last attempt of the request
+    """
+
+    def __new__(
+        cls, 
+        status: int, 
+        data: bytes, 
+        headers: MutableMapping, 
+        event = None
+    ) -> 'RequestResult':
+
+        result = super().__new__(cls, (status, data, headers))
+        result.event = event
+        return result
+
+
 class YouTubeAPISession:
 
     """
@@ -47,10 +157,131 @@ class YouTubeAPISession:
 
         Attribute(s):
             session type(aiohttp.ClientSession): async http session from aiohttp library
+            scheduler type(QuotaScheduler): optional scheduler acquiring quota units before each request
+            cache type(YouTubeResponseCache): optional ETag cache used for conditional GET requests
+            reference_cache type(YouTubeReferenceCache): optional persistent cache serving reference resources without requests
+            retry type(RetryPolicy): optional policy retrying transient failures
+            pool type(Union[str, YouTubeConnectionPool]): optional shared connection pool or its name
+            key_pool type(YouTubeKeyPool): optional key pool choosing the api key of each request
+            compress type(bool): flag turning on or off gzip compressed responses
+            wire type(WireStats): compressed and decompressed bytes received
+            hooks type(YouTubeHooks): optional instrumentation hooks called for every request
+            transport type(YouTubeTransport): optional transport sending the requests, defaults to an AiohttpTransport of the session
+            credentials type(YouTubeCredentials): optional provider of the OAuth2 token sent with every request
+            dedup type(bool): flag turning on or off sharing one response between identical concurrent GET requests
+            dedup_hits type(int): GET requests answered with the response of an identical request in flight
+            base_url type(str): url endpoints are appended to, ex. for a local mock server
+            upload_url type(str): url upload endpoints are appended to
     """
 
-    def __init__(self, session: aiohttp.ClientSession = None, **kwargs) -> None:        
-        self._session = session or ClientSession(**kwargs)
+    def __init__(
+        self, 
+        session: aiohttp.ClientSession = None, 
+        scheduler = None, 
+        cache = None, 
+        retry = None, 
+        pool = None, 
+        key_pool = None, 
+        reference_cache = None, 
+        compress: bool = True, 
+        hooks = None, 
+        transport = None, 
+        credentials = None, 
+        dedup: bool = False, 
+        base_url: str = BASE_URL, 
+        upload_url: str = UPLOAD_URL, 
+        **kwargs
+    ) -> None:        
+
+        if type(pool) == str:
+            pool = get_pool(pool)
+
+        self._pool = pool if session == None and transport == None else None
+        if self._pool != None:
+            self._session = self._pool.acquire()
+        elif transport != None:
+            self._session = getattr(transport, 'session', None)
+        else:
+            self._session = session or ClientSession(**kwargs)
+        self._transport = transport or AiohttpTransport(self._session)
+        self._scheduler = scheduler
+        self._key_pool = key_pool
+        self._compress = compress
+        self._hooks = hooks
+        self._credentials = credentials
+        self._dedup = dedup
+        self._inflight = {}
+        self.dedup_hits = 0
+        self._base_url = base_url
+        self._upload_url = upload_url
+        self._wire = WireStats()
+        self._default_headers = compression_headers(self._session) if compress else IDENTITY_HEADERS
+        self._cache = cache
+        self._reference_cache = reference_cache
+        self._retry = retry
+
+    @property
+    def scheduler(self):
+        return self._scheduler
+
+    @property
+    def credentials(self):
+        return self._credentials
+
+    @property
+    def dedup(self) -> bool:
+        return self._dedup
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @property
+    def reference_cache(self):
+        return self._reference_cache
+
+    @property
+    def retry(self):
+        return self._retry
+
+    @property
+    def pool(self):
+        return self._pool
+
+    @property
+    def key_pool(self):
+        return self._key_pool
+
+    @property
+    def compress(self) -> bool:
+        return self._compress
+
+    @property
+    def wire(self) -> WireStats:
+        return self._wire
+
+    @property
+    def hooks(self):
+        return self._hooks
+
+    @property
+    def transport(self):
+        return self._transport
+
+    def _merge_headers(self, headers: Optional[MutableMapping]) -> MutableMapping:
+
+        if not headers:
+            return self._default_headers
+        return dict(self._default_headers, **headers)
+
+    # adds the key chosen by the key pool to a url built without a key
+
+    def _choose_key(self, method: str, endpoint: str, url: str, units: Optional[int]) -> Tuple[str, str]:
+
+        if units == None:
+            units = estimate_cost(method, endpoint)
+        key = self._key_pool.choose(units)
+        return key, '{}{}key={}'.format(url, '&' if '?' in url else '?', key)
 
     async def __aenter__(self):
         return self
@@ -61,9 +292,9 @@ class YouTubeAPISession:
     async def _determine_url(self, upload: bool) -> str:
 
         if upload:
-            return UPLOAD_URL
+            return self._upload_url
         else:
-            return BASE_URL
+            return self._base_url
 
     async def request(
         self, 
@@ -73,20 +304,344 @@ class YouTubeAPISession:
         headers: Optional[MutableMapping] = None,
         body: Optional[Union[MutableMapping, bytes]] = None,
     ) -> Tuple[int, bytes, MutableMapping]:
+
+        if not self._dedup or method.upper() != 'GET':
+            return await self._request(method, endpoint, upload, headers, body)
+
+        # identical GET requests in flight share one request made by a task of 
+        # its own, so a cancelled caller does not cancel it for the others
+
+        key = request_key(endpoint, self._key_headers(headers))
+        task = self._inflight.get(key)
+        if task != None:
+            self.dedup_hits += 1
+        else:
+            task = asyncio.ensure_future(
+                self._request(method, endpoint, upload, headers, body))
+            self._inflight[key] = task
+            task.add_done_callback(lambda task: self._request_done(key, task))
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: str, task: asyncio.Future) -> None:
+
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _request(
+        self, 
+        method: str, 
+        endpoint: str,
+        upload: bool = False, 
+        headers: Optional[MutableMapping] = None,
+        body: Optional[Union[MutableMapping, bytes]] = None,
+    ) -> Tuple[int, bytes, MutableMapping]:
         
         url = await self._determine_url(upload) + endpoint
 
-        async with self._session.request(
-            method, url, headers=headers, data=body) as response:
-                return response.status, await response.read(), response.headers
+        # reference resources are answered from memory once they have been stored
+
+        reference_key = None
+        if self._reference_cache != None and method.upper() == 'GET':
+            reference_key = self._reference_cache.key(endpoint)
+            if reference_key != None:
+                entry = self._reference_cache.get(reference_key)
+                if entry != None:
+                    return entry.status, entry.body, CIMultiDictProxy(
+                        CIMultiDict({'ETag': entry.etag or '', 'X-Cache': 'HIT'}))
+
+        # repeat GET requests are made conditional on the ETag of the cached response
+        # and the cached body is served when the api answers 304 Not Modified
+
+        cache_key, entry = None, None
+        if self._cache != None and method.upper() == 'GET':
+            cache_key = self._cache.key(endpoint, self._key_headers(headers))
+            entry = self._cache.get(cache_key)
+            if entry != None:
+                headers = dict(headers or {}, **{'If-None-Match': entry.etag})
+
+        result = await self._retry_send(method, endpoint, url, headers, body)
+        status, data, headers_ = result
+
+        if cache_key != None:
+            if status == 304 and entry != None:
+                self._cache.not_modified += 1
+                return RequestResult(entry.status, entry.body, headers_, 
+                    getattr(result, 'event', None))
+            elif status >= 200 and status < 300 and 'ETag' in headers_:
+                self._cache.set(cache_key, headers_['ETag'], status, data)
+
+        if reference_key != None and status == 200:
+            self._reference_cache.set(reference_key, headers_.get('ETag'), status, data)
+
+        return result
+
+    # sends a request, retrying transient failures when a retry policy is set.
+    # quota units are acquired again for every attempt since retries are billed.
+
+    async def _retry_send(
+        self, 
+        method: str, 
+        endpoint: str, 
+        url: str, 
+        headers: Optional[MutableMapping], 
+        body: Optional[Union[MutableMapping, bytes]]
+    ) -> Tuple[int, bytes, MutableMapping]:
+
+        attempt, waited = 0, 0.0
+        if self._retry != None:
+            self._retry.deposit()
+        while True:
+
+            units = None
+            if self._scheduler != None:
+                units = self._scheduler.cost(method, endpoint)
+                await self._scheduler.acquire(units)
+
+            key, url_ = None, url
+            if self._key_pool != None:
+                key, url_ = self._choose_key(method, endpoint, url, units)
+
+            event = None
+            if self._hooks != None:
+                event = self._hooks.create(method, endpoint, attempt, 
+                    estimate_cost(method, endpoint) if units == None else units)
+                event.emit('before_send')
+
+            if self._retry == None and key == None and event == None:
+                return await self._send(method, url_, headers, body)
+
+            try:
+                result = await self._send(method, url_, headers, body, event)
+            except Exception as e:
+                if event != None:
+                    event.error = e
+                    event.emit('error')
+                if self._retry == None or not isinstance(e, self._retry.exceptions) \
+                    or not self._retry.can_retry(method):
+                    raise
+                delay = self._retry.delay(attempt, waited)
+                if delay == None:
+                    raise
+            else:
+                if event != None and result[0] >= 400:
+                    event.emit('error')
+                # a key taken out of rotation is retried right away with another key
+                if key != None and self._key_pool.report(key, result[0], result[1]):
+                    continue
+                if self._retry == None or not self._retry.can_retry(method, result[0]) \
+                    or not self._retry.is_retryable(result[0], result[1]):
+                    return result
+                delay = self._retry.delay(attempt, waited, result[2])
+                if delay == None:
+                    return result
+
+            await asyncio.sleep(delay)
+            self._retry.retries += 1
+            attempt += 1
+            waited += delay
+
+    # sends a request to an absolute url, ex. the session url of a resumable 
+    # upload, with the credentials, hooks and headers of the session. quota, 
+    # api keys, retries and caches are left to the caller.
+
+    async def send(
+        self, 
+        method: str, 
+        url: str, 
+        headers: Optional[MutableMapping] = None, 
+        body: Optional[Union[MutableMapping, bytes]] = None
+    ) -> Tuple[int, bytes, MutableMapping]:
+
+        event = None
+        if self._hooks != None:
+            event = self._hooks.create(method, url, 0, 0)
+            event.emit('before_send')
+
+        try:
+            result = await self._send(method, url, headers, body, event)
+        except Exception as e:
+            if event != None:
+                event.error = e
+                event.emit('error')
+            raise
+        if event != None and result[0] >= 400:
+            event.emit('error')
+        return result
+
+    # with credentials the current token is sent and a 401 response is sent 
+    # again once with the token of a refresh shared by all failed requests
+
+    async def _send(
+        self, 
+        method: str, 
+        url: str, 
+        headers: Optional[MutableMapping], 
+        body: Optional[Union[MutableMapping, bytes]],
+        event = None
+    ) -> Tuple[int, bytes, MutableMapping]:
+
+        if not self._authorized(headers):
+            return await self._send_once(method, url, headers, body, event)
+
+        token = await self._credentials.get_token()
+        result = await self._send_once(method, url, 
+            self._authorize(headers, token), body, event)
+        if result[0] == 401 and self._credentials.refreshable:
+            token = await self._credentials.refresh(token)
+            result = await self._send_once(method, url, 
+                self._authorize(headers, token), body, event)
+        return result
+
+    # authorized requests are identified by their credentials instead of the 
+    # access token, which changes with every refresh
+
+    def _key_headers(self, headers: Optional[MutableMapping]) -> Optional[MutableMapping]:
+
+        if not self._authorized(headers):
+            return headers
+        return {'Authorization': self._credentials.identity}
+
+    # only requests whose headers ask for authorization are sent with a token, 
+    # so requests of a hybrid client without auth stay unauthorized
+
+    def _authorized(self, headers: Optional[MutableMapping]) -> bool:
+        return self._credentials != None and headers != None and 'Authorization' in headers
+
+    def _authorize(self, headers: Optional[MutableMapping], token: str) -> MutableMapping:
+        return dict(headers or {}, Authorization='Bearer {}'.format(token))
+
+    async def _send_once(
+        self, 
+        method: str, 
+        url: str, 
+        headers: Optional[MutableMapping], 
+        body: Optional[Union[MutableMapping, bytes]],
+        event = None
+    ) -> Tuple[int, bytes, MutableMapping]:
+
+        status, data, headers_, compressed = await self._transport.send(
+            method, url, self._merge_headers(headers), body, event)
+
+        self._wire.record(compressed, len(data))
+        if event != None:
+            event.bytes = len(data)
+            event.wire_bytes = compressed
+            event.emit('body_read')
+            return RequestResult(status, data, headers_, event)
+        return status, data, headers_
+
+    # sends a request without reading the body. the body is read in chunks from the
+    # yielded YouTubeAPIStream so large responses never have to fit in memory.
+    # ex. async with session.stream('GET', endpoint) as stream: ...
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self, 
+        method: str, 
+        endpoint: str, 
+        upload: bool = False, 
+        headers: Optional[MutableMapping] = None, 
+        body: Optional[Union[MutableMapping, bytes]] = None
+    ) -> AsyncIterator['YouTubeAPIStream']:
+
+        base = await self._determine_url(upload) + endpoint
+
+        # error bodies are read to report the outcome to the key pool, and a key 
+        # taken out of rotation is tried again right away with another key
+
+        while True:
+
+            units = None
+            if self._scheduler != None:
+                units = self._scheduler.cost(method, endpoint)
+                await self._scheduler.acquire(units)
+
+            key, url = None, base
+            if self._key_pool != None:
+                key, url = self._choose_key(method, endpoint, base, units)
+
+            token = None
+            if self._authorized(headers):
+                token = await self._credentials.get_token()
+                headers = self._authorize(headers, token)
+
+            async with self._transport.stream(
+                method, url, self._merge_headers(headers), body) as (status, headers_, content):
+                    if key != None and status >= 400:
+                        data = await content.read()
+                        if self._key_pool.report(key, status, data):
+                            continue
+                        content = MemoryContent(data)
+                    if status != 401 or token == None or not self._credentials.refreshable:
+                        yield YouTubeAPIStream(status, headers_, content)
+                        return
+            break
+
+        token = await self._credentials.refresh(token)
+        async with self._transport.stream(method, url, 
+            self._merge_headers(self._authorize(headers, token)), 
+            body) as (status, headers_, content):
+                if key != None and status >= 400:
+                    data = await content.read()
+                    self._key_pool.report(key, status, data)
+                    content = MemoryContent(data)
+                yield YouTubeAPIStream(status, headers_, content)
 
     async def close(self) -> bool:
         
-        if not self._session.closed:
-            await self._session.close()
+        # sessions borrowed from a shared pool are only closed by the last user
+        if self._pool != None:
+            pool, self._pool = self._pool, None
+            await pool.release()
             return True
-        else:
-            return False
+
+        return await self._transport.close()
+
+class YouTubeAPIStream:
+
+    """
+        Streamed http response from the YouTube Data API.
+
+        Returned by YouTubeAPISession.stream. The body is not read up front and
+        is consumed in chunks, with at most one chunk buffered at a time.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            status type(int): http response status code for http request
+            headers type(MutableMapping): headers returned from http request
+            content type(aiohttp.StreamReader): body of the response, read with iter_chunked and read
+    """
+
+    def __init__(
+        self, 
+        status: int, 
+        headers: MutableMapping, 
+        content: aiohttp.StreamReader
+    ) -> None:
+
+        self._status = status
+        self._headers = headers
+        self._content = content
+
+    @property
+    def status(self) -> int:
+        return self._status
+
+    @property
+    def headers(self) -> MutableMapping:
+        return self._headers
+
+    async def iter_chunks(self, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        async for chunk in self._content.iter_chunked(chunk_size):
+            yield chunk
+
+    async def read(self) -> bytes:
+        return await self._content.read()
+
 
 class YouTubeAPIResponse:
 
@@ -96,6 +651,11 @@ class YouTubeAPIResponse:
         All client coroutines will return this object that encapsulates
         the HTTP status code, returned data, and headers.
 
+        The raw body is only decoded the first time data or json is accessed 
+        and the result is kept, so responses of which only the status or a 
+        header is read never pay for decoding. Responses use __slots__ to keep 
+        large numbers of them cheap to hold.
+
         Parent(s):
             None
 
@@ -103,27 +663,61 @@ class YouTubeAPIResponse:
             status type(int): http response status code for http request
             data type(Union[MutableMapping, bytes]): data returned from http request
             headers type(MutableMapping): headers returned from http request
+            raw type(bytes): undecoded body, decoded into data on first access
+            event type(RequestEvent): optional event of the request, emitting decode_done once the body is decoded
     """
 
+    __slots__ = ('_status', '_data', '_headers', '_raw', '_event')
+
     def __init__(
         self, 
         status: int, 
         data: Union[MutableMapping, bytes], 
-        headers: MutableMapping
+        headers: MutableMapping,
+        raw: Optional[bytes] = None, 
+        event = None
     ) -> None:
         
         self._status = status
         self._data = data
         self._headers = headers
+        self._raw = raw
+        self._event = event
     
     @property
     def data(self) -> Union[MutableMapping, bytes]:
+
+        if self._raw != None:
+            self._data = decode(self._raw)
+            self._raw = None
+            # responses sharing the event of a deduplicated request report it once
+            if self._event != None and 'decode_done' not in self._event.timings:
+                self._event.emit('decode_done')
+            self._event = None
         return self._data
 
+    @property
+    def json(self) -> Union[MutableMapping, bytes]:
+        return self.data
+
+    @property
+    def raw(self) -> Optional[bytes]:
+        return self._raw
+
     @property
     def status(self) -> int:
         return self._status
     
     @property
     def headers(self) -> MutableMapping:
-        return self._headers
\ No newline at end of file
+        return self._headers
+
+    # iterates the items of a list response as typed views (ex. VideoView)
+
+    @property
+    def items(self) -> Iterator[ResourceView]:
+
+        data = self.data
+        if not isinstance(data, MutableMapping):
+            return iter_views([])
+        return iter_views(data.get('items', []))
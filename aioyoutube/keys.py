@@ -0,0 +1,201 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import itertools
+import random
+import time
+from typing import Iterable, MutableMapping, Optional, Union
+from .exceptions import KeyPoolExhaustedException
+from .retry import error_reasons
+
+
+STRATEGIES = frozenset({'round_robin', 'least_used', 'weighted'})
+
+# error reasons that take a key out of rotation
+
+SUSPEND_REASONS = frozenset({'quotaExceeded', 'dailyLimitExceeded'})
+INVALID_REASONS = frozenset({'keyInvalid', 'keyExpired', 'accessNotConfigured'})
+
+
+class KeyStats:
+
+    """
+        Usage statistics of a key in a YouTubeKeyPool.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            key type(str): YouTube API key
+            daily_units type(int): estimated quota units granted to the key per day
+            used type(int): estimated quota units used
+            requests type(int): requests made with the key
+            errors type(int): error responses received for the key
+            suspended_until type(float): time.time() until which the key is out of rotation
+    """
+
+    __slots__ = ('key', 'daily_units', 'used', 'requests', 'errors', 'suspended_until')
+
+    def __init__(self, key: str, daily_units: int) -> None:
+
+        self.key = key
+        self.daily_units = daily_units
+        self.used = 0
+        self.requests = 0
+        self.errors = 0
+        self.suspended_until = 0.0
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.daily_units - self.used)
+
+    @property
+    def suspended(self) -> bool:
+        return self.suspended_until > time.time()
+
+    def to_dict(self) -> MutableMapping:
+        return {name: getattr(self, name) for name in self.__slots__ + ('remaining', 'suspended')}
+
+
+class YouTubeKeyPool:
+
+    """
+        Pool of YouTube API keys that can stand in for a single key.
+
+        Pass an instance as the key of a client. A key is chosen for every request
+        by the pool strategy: round_robin cycles through the keys, least_used picks
+        the key with the fewest estimated units used and weighted picks a key at
+        random weighted by its estimated remaining units. Keys that receive a 
+        quotaExceeded response are taken out of rotation for cooldown seconds and 
+        invalid keys for invalid_cooldown seconds.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            keys type(Iterable[str]): YouTube API keys
+            strategy type(str): one of round_robin, least_used or weighted
+            daily_units type(Union[int, MutableMapping]): daily quota units per key or a mapping of key to units
+            cooldown type(float): seconds a key with exceeded quota is out of rotation
+            invalid_cooldown type(float): seconds an invalid key is out of rotation
+    """
+
+    def __init__(
+        self, 
+        keys: Iterable[str], 
+        strategy: str = 'round_robin', 
+        daily_units: Union[int, MutableMapping] = 10000, 
+        cooldown: float = 3600, 
+        invalid_cooldown: float = 86400
+    ) -> None:
+
+        if strategy not in STRATEGIES:
+            raise ValueError('Strategy must be one of: {}'.format(list(STRATEGIES)))
+
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self.invalid_cooldown = invalid_cooldown
+        self._keys = {}
+        for key in keys:
+            units = daily_units.get(key, 10000) if isinstance(daily_units, MutableMapping) \
+                else daily_units
+            self._keys[key] = KeyStats(key, units)
+
+        if len(self._keys) == 0:
+            raise ValueError('Key pool requires at least one key')
+        self._cycle = itertools.cycle(list(self._keys))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def keys(self) -> list:
+        return list(self._keys)
+
+    def available(self) -> list:
+        return [stats for stats in self._keys.values() if not stats.suspended]
+
+    # chooses the key for a request costing units and records the usage
+
+    def choose(self, units: int = 1) -> str:
+
+        available = self.available()
+        if len(available) == 0:
+            raise KeyPoolExhaustedException(len(self._keys))
+
+        if self.strategy == 'round_robin':
+            stats = None
+            while stats == None or stats.suspended:
+                stats = self._keys[next(self._cycle)]
+        elif self.strategy == 'least_used':
+            stats = min(available, key=lambda stats: stats.used)
+        else:
+            weights = [stats.remaining for stats in available]
+            if sum(weights) == 0:
+                weights = None
+            stats = random.choices(available, weights=weights)[0]
+
+        stats.used += units
+        stats.requests += 1
+        return stats.key
+
+    def suspend(self, key: str, seconds: Optional[float] = None) -> None:
+        self._keys[key].suspended_until = time.time() + (
+            self.cooldown if seconds == None else seconds)
+
+    def resume(self, key: str) -> None:
+        self._keys[key].suspended_until = 0.0
+
+    # resets usage estimates. call this when the daily quota resets.
+
+    def reset(self) -> None:
+        for stats in self._keys.values():
+            stats.used = 0
+            stats.suspended_until = 0.0
+
+    # records the response of a request made with key. returns True when the key
+    # was taken out of rotation and another key is available to retry with.
+
+    def report(self, key: str, status: int, data: Optional[bytes] = None) -> bool:
+
+        if status < 400:
+            return False
+
+        stats = self._keys[key]
+        stats.errors += 1
+        reasons = error_reasons(data)
+
+        if any(reason in SUSPEND_REASONS for reason in reasons):
+            self.suspend(key, self.cooldown)
+        elif any(reason in INVALID_REASONS for reason in reasons):
+            self.suspend(key, self.invalid_cooldown)
+        else:
+            return False
+        return len(self.available()) > 0
+
+    def stats(self) -> MutableMapping:
+        return {key: stats.to_dict() for key, stats in self._keys.items()}
@@ -0,0 +1,137 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import asyncio
+from typing import Iterable, List, MutableMapping, Optional
+from .exceptions import is_http_exception
+
+
+class YouTubeBatchLoader:
+
+    """
+        Coalesces single id lookups into batched list requests.
+
+        Calls to load made within a short window are gathered and sent as one
+        list request with comma separated ids, up to max_batch ids per request
+        (the YouTube Data API accepts at most 50). Each caller receives the item
+        with its id or None when the API did not return it.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            client type(YouTubeAPIClient): connected client whose list_ coroutine is used
+            resource type(str): YouTube resource to look up (ex. video, channel, playlist)
+            part type(list): parts requested for every batch
+            window type(float): seconds to wait for more ids before sending a batch
+            max_batch type(int): number of queued ids that sends a batch immediately
+            requests type(int): number of batched requests sent
+            loads type(int): number of ids requested through load
+    """
+
+    def __init__(
+        self, 
+        client, 
+        resource: str, 
+        part: list, 
+        window: float = 0.005, 
+        max_batch: int = 50, 
+        **kwargs
+    ) -> None:
+
+        self._client = client
+        self._resource = resource
+        self._part = part
+        self._window = window
+        self._max_batch = max_batch
+        self._kwargs = kwargs
+        self._pending = {}
+        self._handle = None
+        self._tasks = set()
+        self.requests = 0
+        self.loads = 0
+
+    async def load(self, id: str) -> Optional[MutableMapping]:
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.setdefault(id, []).append(future)
+        self.loads += 1
+
+        if len(self._pending) >= self._max_batch:
+            self._dispatch()
+        elif self._handle == None:
+            self._handle = loop.call_later(self._window, self._dispatch)
+
+        return await future
+
+    async def load_many(self, ids: Iterable[str]) -> List[Optional[MutableMapping]]:
+        return await asyncio.gather(*[self.load(id) for id in ids])
+
+    # sends all queued ids without waiting for the window to pass
+
+    async def flush(self) -> None:
+
+        self._dispatch()
+        if len(self._tasks) > 0:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+
+        if self._handle != None:
+            self._handle.cancel()
+            self._handle = None
+
+        while len(self._pending) > 0:
+            ids = list(self._pending)[:self._max_batch]
+            batch = {id: self._pending.pop(id) for id in ids}
+            task = asyncio.ensure_future(self._fetch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch: MutableMapping) -> None:
+
+        self.requests += 1
+        try:
+            result = await self._client.list_(self._resource, self._part, 
+                id=','.join(batch), **self._kwargs)
+            await is_http_exception(result.status, result.data)
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        items = {}
+        for item in result.data.get('items', []):
+            items[item['id']] = item
+
+        for id, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(items.get(id))
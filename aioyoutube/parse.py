@@ -25,56 +25,113 @@ DEALINGS IN THE SOFTWARE.
 """
 
 
-from typing import Optional
+import re
+from typing import Any, Optional
+from urllib.parse import quote
 from .valid import YOUTUBE_RESOURCES
 from .exceptions import ResourceInvalidException
 
 
-# takes youtube resource and returns the equivalent url resource
-
-def parse_resource(resource: str) -> str:    
+# converts a youtube resource to its url resource.
+# "search" resource is a special case that doesn't convert to plural
+# ex. video -> videos but search -> search
 
-    resource_ = resource
-    if 'youtube#' in resource:
-        resource_ = resource.split('#')[1]
-    
-    if resource_ not in YOUTUBE_RESOURCES:
-        raise ResourceInvalidException
-        
-    # "search" resource is a special case that doesn't convert to plural
-    # ex. video -> videos but search -> search
+def _route(resource: str) -> str:
 
-    if resource_ == 'search': 
+    if resource == 'search': 
         return 'search'
     elif resource[-1] == 'y': 
-        return resource_[0:-1] + 'ies'
+        return resource[0:-1] + 'ies'
     else: 
-        return resource_ + 's'
+        return resource + 's'
+
+
+# url paths of the valid resources, built once and including the "youtube#" kind
+# form of each resource. the path is the same for every method of a resource, 
+# so there is one entry per resource. ex. ROUTES['youtube#video'] == 'videos'
+
+ROUTES = {resource: _route(resource) for resource in YOUTUBE_RESOURCES}
+ROUTES.update({'youtube#' + resource: route for resource, route in list(ROUTES.items())})
+
+
+# takes youtube resource and returns the equivalent url resource
+
+def parse_resource(resource: str) -> str:    
+
+    try:
+        return ROUTES[resource]
+    except KeyError:
+        raise ResourceInvalidException from None
+
+
+# values made only of these characters are sent as is, skipping quote
 
+_UNRESERVED = re.compile(r'[A-Za-z0-9_.~,()-]*')
 
-# generates a youtube api url from a youtube resource, other required parameters, and key word arguments
+
+# encodes a query parameter value. lists are comma separated and booleans are
+# lowercase as the api expects. commas and parentheses of field masks are left
+# unescaped for readability.
+
+def encode_value(value: Any) -> str:
+
+    type_ = type(value)
+    if type_ == str:
+        if _UNRESERVED.fullmatch(value):
+            return value
+        return quote(value, safe=',()')
+    elif type_ == int:
+        return str(value)
+    elif type_ == bool:
+        return 'true' if value else 'false'
+    elif type_ in (list, tuple, set, frozenset):
+        return encode_value(','.join(str(value_) for value_ in value))
+    return encode_value(str(value))
+
+
+# part lists are usually one of a handful of constant lists so their encoding is cached
+
+_parts = {}
+
+def _encode_part(part: list) -> str:
+
+    key = tuple(part)
+    encoded = _parts.get(key)
+    if encoded == None:
+        if len(_parts) >= 1024:
+            _parts.clear()
+        encoded = _parts[key] = encode_value(key)
+    return encoded
+
+
+# generates a youtube api endpoint from a youtube resource, other required parameters, 
+# and key word arguments. the endpoint is a string with an encoded query, which 
+# aiohttp parses into a yarl.URL when the request is sent.
 
 def build_endpoint(
     resource: str, 
-    key: str, 
+    key: Optional[str], 
     part: Optional[list] = [], 
     append: Optional[str] = None, 
     **kwargs
 ) -> str:
     
-    resource = parse_resource(resource=resource)    
-    if append != None: resource += '/' + append
-
-    endpoint = '{}?'.format(resource)
+    endpoint = parse_resource(resource)
+    if append != None: 
+        endpoint += '/' + encode_value(append)
 
+    params = []
     if len(part) > 0:
-        part = ','.join(part)
-        endpoint += 'part=' + part
+        params.append('part=' + _encode_part(part))
 
     for key_, value in kwargs.items():
-        endpoint += '&{}={}'.format(key_, str(value))
-    
+        params.append(key_ + '=' + encode_value(value))
+
     # example of a generated endpoint:
     # ex. videos?part=snippet&id=dQw4w9WgXcQ&maxResults=50&key=[YOUR_API_KEY]
+    # the key is left out when it is None and added per request by a key pool
+
+    if key != None:
+        params.append('key=' + encode_value(key))
 
-    return endpoint + '&key=' + key
\ No newline at end of file
+    return endpoint + '?' + '&'.join(params)
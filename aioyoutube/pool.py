@@ -0,0 +1,181 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import asyncio
+import aiohttp
+from typing import MutableMapping, Optional
+from aiohttp import ClientSession, TCPConnector, TraceConfig
+
+
+WARMUP_URL = 'https://www.googleapis.com/'
+
+
+class YouTubeConnectionPool:
+
+    """
+        Shared, reference counted connection pool for YouTubeAPISession objects.
+
+        Sessions created with the same pool share one aiohttp.ClientSession and
+        therefore one set of keep-alive connections and TLS sessions. The 
+        underlying session is created on first acquire and closed when the last
+        session using it is closed. The pool stays registered with its settings
+        and opens a new session on the next acquire. Pools are usually obtained by name through
+        get_pool or by passing pool='name' to a client.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            name type(str): name the pool is registered under
+            limit type(int): total number of simultaneous connections, 0 for no limit
+            limit_per_host type(int): simultaneous connections per host, 0 for no limit
+            keepalive_timeout type(float): seconds idle connections are kept alive
+            ttl_dns_cache type(int): seconds resolved hosts are cached
+            kwargs type(MutableMapping): keyword arguments passed to aiohttp.ClientSession
+            refcount type(int): number of sessions currently using the pool
+            handshakes type(int): number of new connections opened by the pool
+            reused type(int): number of requests sent on a reused connection
+    """
+
+    def __init__(
+        self, 
+        name: str = 'default', 
+        limit: int = 100, 
+        limit_per_host: int = 0, 
+        keepalive_timeout: float = 15.0, 
+        ttl_dns_cache: int = 10, 
+        **kwargs
+    ) -> None:
+
+        self.name = name
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.kwargs = kwargs
+        self.refcount = 0
+        self.handshakes = 0
+        self.reused = 0
+        self._session = None
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        return self._session
+
+    def _create_session(self) -> aiohttp.ClientSession:
+
+        async def on_connection_create_end(session, context, params) -> None:
+            self.handshakes += 1
+
+        async def on_connection_reuseconn(session, context, params) -> None:
+            self.reused += 1
+
+        trace_config = TraceConfig()
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+
+        connector = TCPConnector(
+            limit=self.limit, 
+            limit_per_host=self.limit_per_host, 
+            keepalive_timeout=self.keepalive_timeout, 
+            ttl_dns_cache=self.ttl_dns_cache
+        )
+
+        kwargs = dict(self.kwargs)
+        kwargs['trace_configs'] = kwargs.get('trace_configs', []) + [trace_config]
+        return ClientSession(connector=connector, **kwargs)
+
+    def acquire(self) -> aiohttp.ClientSession:
+
+        if self._session == None or self._session.closed:
+            self._session = self._create_session()
+        self.refcount += 1
+        return self._session
+
+    # returns True when the last reference was released and the session closed
+
+    async def release(self) -> bool:
+
+        self.refcount = max(0, self.refcount - 1)
+        if self.refcount == 0 and self._session != None:
+            await self._session.close()
+            self._session = None
+            return True
+        return False
+
+    # opens connections ahead of the first api requests so they do not pay for 
+    # the tcp and tls handshakes. the pool must have been acquired first.
+
+    async def warmup(self, connections: int = 1, url: str = WARMUP_URL) -> int:
+
+        if self._session == None:
+            raise RuntimeError('Pool "{}" must be acquired before warming up'.format(self.name))
+
+        async def connect() -> None:
+            async with self._session.head(url) as response:
+                await response.read()
+
+        results = await asyncio.gather(*[connect() for _ in range(connections)], 
+            return_exceptions=True)
+        return sum(1 for result in results if not isinstance(result, Exception))
+
+    def stats(self) -> MutableMapping:
+
+        in_use, idle = 0, 0
+        if self._session != None and not self._session.closed:
+            connector = self._session.connector
+            in_use = len(getattr(connector, '_acquired', ()))
+            idle = sum(len(conns) for conns in getattr(connector, '_conns', {}).values())
+
+        return {
+            'name': self.name,
+            'refcount': self.refcount,
+            'in_use': in_use,
+            'idle': idle,
+            'handshakes': self.handshakes,
+            'reused': self.reused,
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host
+        }
+
+
+# process wide registry of pools by name
+
+_POOLS = {}
+
+
+# returns the pool registered under name, creating it with the given settings
+# if it does not exist yet. settings are ignored for an existing pool.
+
+def get_pool(name: str = 'default', **kwargs) -> YouTubeConnectionPool:
+
+    if name not in _POOLS:
+        _POOLS[name] = YouTubeConnectionPool(name=name, **kwargs)
+    return _POOLS[name]
+
+def get_pools() -> list:
+    return list(_POOLS.values())
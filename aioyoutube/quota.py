@@ -0,0 +1,330 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import asyncio
+import contextlib
+import contextvars
+import datetime
+import heapq
+import itertools
+import time
+from typing import Iterator, MutableMapping, Optional, Tuple
+from .valid import YOUTUBE_RESOURCES
+from .exceptions import QuotaExceededException
+from .parse import ROUTES
+
+
+# quota unit costs of each resource and method pair as documented by the YouTube
+# Data API. pairs that are not listed cost 1 unit for list and 50 units otherwise.
+
+QUOTA_COSTS = {
+    ('activity', 'list'): 1,
+    ('caption', 'list'): 50,
+    ('caption', 'insert'): 400,
+    ('caption', 'update'): 450,
+    ('caption', 'delete'): 50,
+    ('caption', 'download'): 200,
+    ('channelBanner', 'insert'): 50,
+    ('channel', 'list'): 1,
+    ('channel', 'update'): 50,
+    ('channelSection', 'list'): 1,
+    ('comment', 'list'): 1,
+    ('commentThread', 'list'): 1,
+    ('i18nLanguage', 'list'): 1,
+    ('i18nRegion', 'list'): 1,
+    ('member', 'list'): 1,
+    ('membershipsLevel', 'list'): 1,
+    ('playlistItem', 'list'): 1,
+    ('playlist', 'list'): 1,
+    ('search', 'list'): 100,
+    ('subscription', 'list'): 1,
+    ('thumbnail', 'set'): 50,
+    ('videoAbuseReportReason', 'list'): 1,
+    ('videoCategory', 'list'): 1,
+    ('video', 'list'): 1,
+    ('video', 'insert'): 1600,
+    ('video', 'getRating'): 1,
+    ('watermark', 'set'): 50,
+    ('watermark', 'unset'): 50
+}
+
+# methods that are appended to the resource in an endpoint (ex. videos/rate)
+
+APPENDED_METHODS = frozenset({
+    'rate',
+    'getRating',
+    'reportAbuse',
+    'set',
+    'unset',
+    'markAsSpam',
+    'setModerationStatus',
+    'insert'
+})
+
+HTTP_METHODS = {
+    'GET': 'list',
+    'POST': 'insert',
+    'PUT': 'update',
+    'DELETE': 'delete'
+}
+
+
+# maps the url resource of an endpoint back to its youtube resource
+# ex. videoCategories -> videoCategory
+
+ENDPOINT_RESOURCES = {ROUTES[resource]: resource for resource in YOUTUBE_RESOURCES}
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_BACKGROUND = 2
+
+_priority = contextvars.ContextVar('priority', default=PRIORITY_DEFAULT)
+
+
+# sets the priority of every request made by the current task inside the block.
+# ex. with priority(PRIORITY_BACKGROUND): await client.list_(...)
+
+@contextlib.contextmanager
+def priority(level: int) -> Iterator[None]:
+
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+# splits an endpoint built by build_endpoint into its youtube resource and
+# api method. ex. ('POST', 'videos/rate?id=...') -> ('video', 'rate')
+
+def parse_endpoint(method: str, endpoint: str) -> Tuple[Optional[str], str]:
+
+    path = endpoint.split('?', 1)[0].split('/')
+    resource = ENDPOINT_RESOURCES.get(path[0])
+
+    if len(path) > 1 and path[1] in APPENDED_METHODS:
+        return resource, path[1]
+    elif len(path) > 1:
+        # captions/[id] is the only endpoint with a path parameter
+        return resource, 'download'
+    else:
+        return resource, HTTP_METHODS.get(method.upper(), 'list')
+
+
+# the daily quota resets at midnight Pacific Time, which is UTC-7 from 2am on 
+# the second Sunday of March to 2am on the first Sunday of November and UTC-8 
+# otherwise. the rules are applied directly so no time zone database is needed.
+
+def _pacific_offset(utc: datetime.datetime) -> datetime.timedelta:
+
+    def sunday(month: int, day: int) -> int:
+        return day + (6 - datetime.date(utc.year, month, day).weekday()) % 7
+
+    start = datetime.datetime(utc.year, 3, sunday(3, 8), 10)
+    end = datetime.datetime(utc.year, 11, sunday(11, 1), 9)
+    return datetime.timedelta(hours=-7 if start <= utc < end else -8)
+
+
+# returns the unix time of the next daily quota reset after now
+
+def next_quota_reset(now: Optional[float] = None) -> float:
+
+    now = time.time() if now == None else now
+    utc = datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=now)
+    local = utc + _pacific_offset(utc)
+    midnight = datetime.datetime(local.year, local.month, local.day) + datetime.timedelta(days=1)
+    reset = midnight - _pacific_offset(midnight - _pacific_offset(utc))
+    return (reset - datetime.datetime(1970, 1, 1)).total_seconds()
+
+
+def quota_cost(resource: str, method: str) -> int:
+    return QUOTA_COSTS.get((resource, method), 1 if method == 'list' else 50)
+
+def estimate_cost(method: str, endpoint: str) -> int:
+    return quota_cost(*parse_endpoint(method, endpoint))
+
+
+class QuotaScheduler:
+
+    """
+        Quota aware scheduler for requests made by a YouTubeAPISession.
+
+        Each request acquires its estimated quota cost from a bucket holding 
+        the daily unit budget, which is refilled to capacity when the quota 
+        of the api resets at midnight Pacific Time. An optional pace spreads 
+        the budget by also limiting the units spent per second, without adding
+        to it. Requests that cannot be paid for wait in priority order, so 
+        interactive requests are served before background crawls.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            daily_units type(int): quota units granted per day
+            capacity type(int): maximum units the bucket can hold, defaults to daily_units
+            max_wait type(float): seconds a request may wait before QuotaExceededException is raised
+            costs type(MutableMapping): overrides for QUOTA_COSTS keyed by (resource, method)
+            pace type(float): optional units spent per second at most, ex. daily_units / 86400
+            burst type(float): units the pace lets through at once, defaults to a minute of pace
+            spent type(int): units acquired so far
+            remaining type(float): units currently available
+            reset_at type(float): unix time of the next daily quota reset
+            waiting type(int): requests waiting for units
+    """
+
+    def __init__(
+        self, 
+        daily_units: int = 10000, 
+        capacity: Optional[int] = None, 
+        max_wait: Optional[float] = None, 
+        costs: Optional[MutableMapping] = None, 
+        pace: Optional[float] = None, 
+        burst: Optional[float] = None
+    ) -> None:
+
+        self.daily_units = daily_units
+        self.capacity = capacity or daily_units
+        self.max_wait = max_wait
+        self.costs = dict(QUOTA_COSTS, **(costs or {}))
+        self.pace = pace
+        self.burst = burst or (pace or 0) * 60
+        self.spent = 0
+        self.reset_at = next_quota_reset()
+        self._tokens = float(self.capacity)
+        self._paced = self.burst
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._counter = itertools.count()
+        self._handle = None
+
+    @property
+    def remaining(self) -> float:
+        self._refill()
+        return self._tokens
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter[3].done())
+
+    def cost(self, method: str, endpoint: str) -> int:
+
+        resource, method_ = parse_endpoint(method, endpoint)
+        return self.costs.get((resource, method_), 1 if method_ == 'list' else 50)
+
+    # refills the bucket to capacity, ex. when the quota was raised. the bucket
+    # is refilled on its own at every daily reset.
+
+    def reset(self) -> None:
+
+        self._tokens = float(self.capacity)
+        self.reset_at = next_quota_reset()
+        self._wake()
+
+    async def acquire(self, units: int, priority: Optional[int] = None) -> None:
+
+        if units <= 0:
+            return
+        if units > self.capacity:
+            raise QuotaExceededException(units, self.capacity)
+
+        priority = _priority.get() if priority == None else priority
+        self._refill()
+
+        if not self._ahead(priority) and self._delay(units) == 0:
+            self._take(units)
+            return
+
+        if self.max_wait != None:
+            queued = sum(waiter[2] for waiter in self._waiters 
+                if waiter[0] <= priority and not waiter[3].done())
+            if self._delay(queued + units) > self.max_wait:
+                raise QuotaExceededException(units, self._tokens)
+
+        future = asyncio.get_event_loop().create_future()
+        future.add_done_callback(lambda f: self._wake() if f.cancelled() else None)
+        heapq.heappush(self._waiters, (priority, next(self._counter), units, future))
+        self._wake()
+        await future
+
+    def _ahead(self, priority: int) -> bool:
+        return any(waiter[0] <= priority and not waiter[3].done() 
+            for waiter in self._waiters)
+
+    def _take(self, units: int) -> None:
+
+        self._tokens -= units
+        self._paced -= units
+        self.spent += units
+
+    # returns the seconds until units can be paid for, 0 when they can be now. 
+    # units beyond the daily budget wait for the reset, and the pace lets a 
+    # request through once burst or its units are available, going into debt.
+
+    def _delay(self, units: int) -> float:
+
+        delay = 0.0
+        if self._tokens < units:
+            delay = max(self.reset_at - time.time(), 0.001)
+        if self.pace != None:
+            needed = min(units, self.burst)
+            if self._paced < needed:
+                delay = max(delay, (needed - self._paced) / self.pace)
+        return delay
+
+    def _refill(self) -> None:
+
+        if time.time() >= self.reset_at:
+            self._tokens = float(self.capacity)
+            self.reset_at = next_quota_reset()
+        if self.pace != None:
+            now = time.monotonic()
+            self._paced = min(self.burst, self._paced + (now - self._updated) * self.pace)
+            self._updated = now
+
+    # hands units to waiters in priority order and schedules another wake up 
+    # for when the first waiter that could not be served can be paid for
+
+    def _wake(self) -> None:
+
+        if self._handle != None:
+            self._handle.cancel()
+            self._handle = None
+
+        self._refill()
+        while len(self._waiters) > 0:
+            priority, _, units, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+            elif self._delay(units) == 0:
+                heapq.heappop(self._waiters)
+                self._take(units)
+                future.set_result(None)
+            else:
+                delay = self._delay(units)
+                self._handle = asyncio.get_event_loop().call_later(delay, self._wake)
+                break
@@ -0,0 +1,227 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import List, MutableMapping, Optional
+import aiohttp
+from .decoder import decode
+
+
+# http statuses that are retried regardless of the error reason
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# methods that are safe to send again. POST creates a resource every time it is
+# applied, so a reset or 5xx after the api applied it would create a duplicate.
+# PUT updates carry the id of the resource they replace.
+
+RETRY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+# error reasons of the YouTube Data API that are transient and worth retrying
+
+RETRY_REASONS = frozenset({
+    'rateLimitExceeded',
+    'userRateLimitExceeded',
+    'backendError',
+    'internalError'
+})
+
+# error reasons that will not succeed on retry. quotaExceeded only resets
+# at midnight pacific time so retrying it only burns the retry budget.
+
+FATAL_REASONS = frozenset({
+    'quotaExceeded',
+    'dailyLimitExceeded',
+    'keyInvalid',
+    'keyExpired',
+    'accessNotConfigured',
+    'forbidden',
+    'insufficientPermissions'
+})
+
+
+# returns the reasons of the error.errors list of an error response body
+# ex. b'{"error": {"errors": [{"reason": "quotaExceeded"}]}}' -> ['quotaExceeded']
+
+def error_reasons(data: Optional[bytes]) -> List[str]:
+
+    try:
+        errors = decode(data)['error']['errors']
+        return [error['reason'] for error in errors if 'reason' in error]
+    except Exception:
+        return []
+
+
+# parses a Retry-After header given in seconds or as an http date
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+
+    if value == None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+
+    """
+        Retry policy for requests made by a YouTubeAPISession.
+
+        Failed requests are classified by status and by the reasons in the
+        error payload. Transient failures are retried after a capped exponential
+        backoff with full jitter, or after the Retry-After header when the api 
+        sends one. Fatal reasons such as quotaExceeded fail immediately. No 
+        retry is attempted once max_retries is reached or the next wait would 
+        exceed the budget in seconds of the request. Connection errors and 
+        5xx responses are only retried for idempotent methods unless methods 
+        says otherwise, since the api may have applied the request. Rejected
+        requests, ex. 429 or 403 rateLimitExceeded, are retried for any method.
+
+        Every request sent with the policy adds ratio retry tokens, up to 
+        burst, and every retry takes one. Once the tokens run out no request
+        is retried, so a burst of failures shared by all requests of the policy
+        adds at most about ratio times the load instead of max_retries times.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            max_retries type(int): maximum number of retries per request
+            base_delay type(float): backoff in seconds before the first retry
+            max_delay type(float): cap of the backoff in seconds
+            budget type(float): maximum total seconds spent waiting between retries of one request
+            methods type(frozenset): http methods retried after connection errors and 5xx responses, add POST to opt in
+            ratio type(float): retry tokens added by every request, None for no shared retry budget
+            burst type(float): maximum retry tokens, and the tokens the policy starts with
+            statuses type(frozenset): http statuses that are retried
+            reasons type(frozenset): error reasons that make a 403 retryable
+            fatal_reasons type(frozenset): error reasons that are never retried
+            exceptions type(tuple): connection exceptions that are retried
+            retries type(int): number of retries made with this policy
+            denied type(int): number of retries refused because the retry tokens ran out
+    """
+
+    def __init__(
+        self, 
+        max_retries: int = 5, 
+        base_delay: float = 0.5, 
+        max_delay: float = 32.0, 
+        budget: float = 60.0, 
+        statuses: frozenset = RETRY_STATUSES, 
+        reasons: frozenset = RETRY_REASONS, 
+        fatal_reasons: frozenset = FATAL_REASONS, 
+        exceptions: tuple = (aiohttp.ClientConnectionError, asyncio.TimeoutError), 
+        methods: frozenset = RETRY_METHODS, 
+        ratio: Optional[float] = 0.2, 
+        burst: float = 10.0
+    ) -> None:
+
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.statuses = statuses
+        self.reasons = reasons
+        self.fatal_reasons = fatal_reasons
+        self.exceptions = exceptions
+        self.methods = frozenset(method.upper() for method in methods)
+        self.ratio = ratio
+        self.burst = burst
+        self.retries = 0
+        self.denied = 0
+        self._tokens = burst
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    # requests answered below 500 were rejected without being applied, so they 
+    # can be sent again whatever their method
+
+    def can_retry(self, method: str, status: Optional[int] = None) -> bool:
+        return (status != None and status < 500) or method.upper() in self.methods
+
+    # called once for every request sent with the policy
+
+    def deposit(self) -> None:
+        if self.ratio != None:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def is_retryable(self, status: int, data: Optional[bytes]) -> bool:
+
+        if status < 400:
+            return False
+
+        reasons = error_reasons(data)
+        if any(reason in self.fatal_reasons for reason in reasons):
+            return False
+        elif any(reason in self.reasons for reason in reasons):
+            return True
+        else:
+            return status in self.statuses
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    # returns the seconds to wait before the next attempt or None if the request 
+    # should not be retried. attempt is the number of retries already made and 
+    # waited the seconds already spent waiting for this request.
+
+    def delay(
+        self, 
+        attempt: int, 
+        waited: float, 
+        headers: Optional[MutableMapping] = None
+    ) -> Optional[float]:
+
+        if attempt >= self.max_retries:
+            return None
+
+        delay = None
+        if headers != None:
+            delay = parse_retry_after(headers.get('Retry-After'))
+        if delay == None:
+            delay = self.backoff(attempt)
+
+        if waited + delay > self.budget:
+            return None
+
+        if self.ratio != None:
+            if self._tokens < 1:
+                self.denied += 1
+                return None
+            self._tokens -= 1
+        return delay
@@ -0,0 +1,382 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import asyncio
+import inspect
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from multiprocessing.context import BaseContext
+from typing import Any, AsyncIterator, Callable, Iterable, MutableMapping, Optional, Union
+from .client import YouTubeClient
+from .exceptions import CrawlWorkerException, QuotaExceededException
+from .quota import QUOTA_COSTS, QuotaScheduler, next_quota_reset
+
+
+class SharedQuotaScheduler(QuotaScheduler):
+
+    """
+        Quota scheduler shared by the worker processes of a YouTubeCrawlRunner.
+
+        The token bucket lives in shared memory guarded by a process lock, so 
+        every process draws from one daily unit budget, which is refilled when
+        the quota resets at midnight Pacific Time. An optional request
+        rate caps the requests per second of all processes together. Requests
+        that cannot be paid for poll the bucket, so priorities are not ordered
+        across processes. The shared memory is created in the multiprocessing
+        context given, or in the one of the YouTubeCrawlRunner the scheduler is
+        passed to, so it also works with the spawn and forkserver start methods.
+
+        Parent(s):
+            QuotaScheduler
+
+        Attribute(s):
+            daily_units type(int): quota units granted per day
+            capacity type(int): maximum units the bucket can hold, defaults to daily_units
+            max_wait type(float): seconds a request may wait before QuotaExceededException is raised
+            costs type(MutableMapping): overrides for QUOTA_COSTS keyed by (resource, method)
+            rate type(float): optional requests per second of all processes together
+            poll_interval type(float): longest sleep between two attempts of a waiting request
+            context type(Union[str, BaseContext]): optional multiprocessing context or start method
+            spent type(int): units acquired so far by all processes
+            remaining type(float): units currently available
+            reset_at type(float): unix time of the next daily quota reset
+            waiting type(int): requests of this process waiting for units
+    """
+
+    def __init__(
+        self, 
+        daily_units: int = 10000, 
+        capacity: Optional[int] = None, 
+        max_wait: Optional[float] = None, 
+        costs: Optional[MutableMapping] = None, 
+        rate: Optional[float] = None, 
+        poll_interval: float = 0.05, 
+        context: Optional[Union[str, BaseContext]] = None
+    ) -> None:
+
+        self.daily_units = daily_units
+        self.capacity = capacity or daily_units
+        self.max_wait = max_wait
+        self.costs = dict(QUOTA_COSTS, **(costs or {}))
+        self.rate = rate
+        self.poll_interval = poll_interval
+        self._waiting = 0
+        self._context = context
+        self._shared = None
+
+    # creates the shared memory in the context of the worker processes. a 
+    # scheduler already bound to another start method cannot be shared with them.
+
+    def bind(self, context: Optional[Union[str, BaseContext]] = None) -> None:
+
+        if not isinstance(context, BaseContext):
+            context = multiprocessing.get_context(context)
+
+        if self._shared != None:
+            if context.get_start_method() != self._context.get_start_method():
+                raise ValueError('scheduler is bound to the {} start method, not {}'.format(
+                    self._context.get_start_method(), context.get_start_method()))
+            return
+
+        self._context = context
+        # tokens, last refill, request tokens, spent units, next quota reset
+        self._shared = context.Array('d', [float(self.capacity), time.monotonic(), 
+            self.rate or 0.0, 0.0, next_quota_reset()])
+
+    @property
+    def _state(self) -> Any:
+        if self._shared == None:
+            self.bind(self._context)
+        return self._shared
+
+    @property
+    def spent(self) -> int:
+        return int(self._state[3])
+
+    @property
+    def remaining(self) -> float:
+        with self._state.get_lock():
+            self._refill()
+            return self._state[0]
+
+    @property
+    def reset_at(self) -> float:
+        return self._state[4]
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def reset(self) -> None:
+
+        with self._state.get_lock():
+            self._state[0] = float(self.capacity)
+            self._state[4] = next_quota_reset()
+
+    async def acquire(self, units: int, priority: Optional[int] = None) -> None:
+
+        if units > self.capacity:
+            raise QuotaExceededException(units, self.capacity)
+
+        deadline = None if self.max_wait == None else time.monotonic() + self.max_wait
+        self._waiting += 1
+        try:
+            while True:
+                delay = self._try_take(units)
+                if delay == 0:
+                    return
+                if deadline != None and time.monotonic() + delay > deadline:
+                    raise QuotaExceededException(units, self.remaining)
+                await asyncio.sleep(min(delay, self.poll_interval))
+        finally:
+            self._waiting -= 1
+
+    # takes the units and one request token and returns 0, or returns the 
+    # seconds until both can be paid for
+
+    def _try_take(self, units: int) -> float:
+
+        with self._state.get_lock():
+            self._refill()
+            tokens, request_tokens = self._state[0], self._state[2]
+            if tokens >= units and (self.rate == None or request_tokens >= 1):
+                self._state[0] = tokens - max(units, 0)
+                self._state[2] = request_tokens - 1
+                self._state[3] += max(units, 0)
+                return 0
+            reset_at = self._state[4]
+
+        delay = 0.0 if tokens >= units else max(0.0, reset_at - time.time())
+        if self.rate != None:
+            delay = max(delay, (1 - request_tokens) / self.rate)
+        return delay or self.poll_interval
+
+    # callers hold the lock of the shared state
+
+    def _refill(self) -> None:
+
+        if time.time() >= self._state[4]:
+            self._state[0] = float(self.capacity)
+            self._state[4] = next_quota_reset()
+        now = time.monotonic()
+        elapsed = now - self._state[1]
+        if self.rate != None:
+            self._state[2] = min(self.rate, self._state[2] + elapsed * self.rate)
+        self._state[1] = now
+
+
+class CrawlResult:
+
+    """
+        Result of one crawl task streamed back by a YouTubeCrawlRunner.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            index type(int): position of the task in the tasks given to run
+            task type(Any): the task
+            value type(Any): value returned or yielded by the worker coroutine
+            error type(str): type and message of the exception raised by the worker, if any
+            worker type(int): number of the worker process
+    """
+
+    __slots__ = ('index', 'task', 'value', 'error', 'worker')
+
+    def __init__(
+        self, 
+        index: int, 
+        task: Any, 
+        value: Any, 
+        error: Optional[str], 
+        worker: int
+    ) -> None:
+
+        self.index = index
+        self.task = task
+        self.value = value
+        self.error = error
+        self.worker = worker
+
+    def __repr__(self) -> str:
+        return '<CrawlResult {} {}>'.format(self.index, 
+            'error' if self.error != None else 'ok')
+
+
+# runs in every worker process. a feeder moves tasks from the process queue to
+# a local queue that concurrency consumers drain with a shared client.
+
+async def _crawl(worker, key, scheduler, concurrency, kwargs, tasks, results, number):
+
+    loop = asyncio.get_event_loop()
+    local = asyncio.Queue(maxsize=concurrency)
+
+    async def feed() -> None:
+        while True:
+            item = await loop.run_in_executor(None, tasks.get)
+            if item == None:
+                for _ in range(concurrency):
+                    await local.put(None)
+                return
+            await local.put(item)
+
+    async def consume(client) -> None:
+        while True:
+            item = await local.get()
+            if item == None:
+                return
+            index, task = item
+            try:
+                value = worker(client, task)
+                if inspect.isasyncgen(value):
+                    async for part in value:
+                        results.put((index, task, part, None, number))
+                else:
+                    results.put((index, task, await value, None, number))
+            except Exception as e:
+                results.put((index, task, None, 
+                    '{}: {}'.format(type(e).__name__, e), number))
+
+    async with YouTubeClient(key, scheduler=scheduler, **kwargs) as client:
+        await asyncio.gather(feed(), *[consume(client) for _ in range(concurrency)])
+    results.put(number)
+
+
+def _run_worker(*args) -> None:
+    asyncio.run(_crawl(*args))
+
+
+class YouTubeCrawlRunner:
+
+    """
+        Runs a crawl across worker processes, each with its own event loop and
+        YouTubeClient, and streams the results back to the parent process.
+
+        The worker is a coroutine function, or an async generator function, 
+        called with the client of the worker process and one task. Tasks are
+        pulled from a shared queue, so fast workers take more of them. Pass a
+        SharedQuotaScheduler to keep all processes within one quota and request
+        rate. Workers, tasks and results must be picklable, and the worker must 
+        be importable from a module when processes are spawned.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            worker type(Callable): coroutine or async generator function taking a client and a task
+            key type(str): api key, or a YouTubeKeyPool copied into every process
+            processes type(int): number of worker processes, defaults to the cpu count
+            concurrency type(int): tasks in flight per worker process
+            scheduler type(SharedQuotaScheduler): optional scheduler shared by all processes
+            start_method type(str): optional multiprocessing start method, ex. spawn
+            kwargs type(MutableMapping): keyword arguments passed to every YouTubeClient
+    """
+
+    def __init__(
+        self, 
+        worker: Callable, 
+        key: str, 
+        processes: Optional[int] = None, 
+        concurrency: int = 10, 
+        scheduler: Optional[SharedQuotaScheduler] = None, 
+        start_method: Optional[str] = None, 
+        **kwargs
+    ) -> None:
+
+        self.worker = worker
+        self.key = key
+        self.processes = processes or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.scheduler = scheduler
+        self.start_method = start_method
+        self.kwargs = kwargs
+
+    # yields a CrawlResult for every value returned or yielded by the worker in
+    # completion order. raises CrawlWorkerException when a worker process dies.
+
+    async def run(self, tasks: Iterable[Any]) -> AsyncIterator[CrawlResult]:
+
+        context = multiprocessing.get_context(self.start_method)
+        if self.scheduler != None:
+            self.scheduler.bind(context)
+        task_queue = context.Queue(maxsize=self.processes * self.concurrency * 2)
+        results = context.Queue()
+        stopped = threading.Event()
+        loop = asyncio.get_event_loop()
+
+        processes = [context.Process(target=_run_worker, daemon=True, args=(
+            self.worker, self.key, self.scheduler, self.concurrency, self.kwargs, 
+            task_queue, results, number)) for number in range(self.processes)]
+        for process in processes:
+            process.start()
+
+        def feed() -> None:
+            items = itertools.chain(enumerate(tasks), [None] * len(processes))
+            for item in items:
+                while not stopped.is_set():
+                    try:
+                        task_queue.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+
+        finished = set()
+        try:
+            while len(finished) < len(processes):
+                try:
+                    message = await loop.run_in_executor(None, results.get, True, 0.1)
+                except queue.Empty:
+                    for number, process in enumerate(processes):
+                        if number not in finished and not process.is_alive() \
+                            and results.empty():
+                            raise CrawlWorkerException(number, process.exitcode)
+                    continue
+                if isinstance(message, int):
+                    finished.add(message)
+                else:
+                    yield CrawlResult(*message)
+        finally:
+            stopped.set()
+            for process in processes:
+                if process.is_alive() and len(finished) < len(processes):
+                    process.terminate()
+            task_queue.cancel_join_thread()
+
+            # joining blocks, so it runs in the executor to keep the loop responsive
+            def join() -> None:
+                for process in processes:
+                    process.join()
+                feeder.join()
+
+            await loop.run_in_executor(None, join)
@@ -0,0 +1,336 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import json
+import os
+import sqlite3
+import tempfile
+from typing import AsyncIterator, MutableMapping, Optional
+from .exceptions import is_http_exception
+
+
+class SyncState:
+
+    """
+        Persisted state of one synchronized source.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            etag type(str): etag of the first page at the last sync
+            newest type(str): newest publishedAt seen, an ISO 8601 timestamp
+            items type(MutableMapping): etag of every seen item by item id
+    """
+
+    __slots__ = ('etag', 'newest', 'items')
+
+    def __init__(
+        self, 
+        etag: Optional[str] = None, 
+        newest: Optional[str] = None, 
+        items: Optional[MutableMapping] = None
+    ) -> None:
+
+        self.etag = etag
+        self.newest = newest
+        self.items = items or {}
+
+    def to_dict(self) -> MutableMapping:
+        return {'etag': self.etag, 'newest': self.newest, 'items': self.items}
+
+    @classmethod
+    def from_dict(cls, data: MutableMapping) -> 'SyncState':
+        return cls(data.get('etag'), data.get('newest'), data.get('items'))
+
+
+class SyncChange:
+
+    """
+        Change of a synchronized source emitted by YouTubeSync.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            kind type(str): one of added, changed or removed
+            id type(str): id of the item
+            item type(MutableMapping): item as returned by the api, None when removed
+    """
+
+    __slots__ = ('kind', 'id', 'item')
+
+    def __init__(self, kind: str, id: str, item: Optional[MutableMapping]) -> None:
+
+        self.kind = kind
+        self.id = id
+        self.item = item
+
+    def __repr__(self) -> str:
+        return '<SyncChange {} {}>'.format(self.kind, self.id)
+
+
+class SyncStore:
+
+    """
+        Base class of the stores persisting sync states by source name.
+
+        Subclasses implement load and save. This store keeps the states in 
+        memory only.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            None
+    """
+
+    def __init__(self) -> None:
+        self._states = {}
+
+    def load(self, source: str) -> Optional[SyncState]:
+        data = self._states.get(source)
+        return None if data == None else SyncState.from_dict(data)
+
+    def save(self, source: str, state: SyncState) -> None:
+        self._states[source] = state.to_dict()
+
+    def delete(self, source: str) -> None:
+        self._states.pop(source, None)
+
+    def close(self) -> None:
+        pass
+
+
+class FileSyncStore(SyncStore):
+
+    """
+        Sync store keeping every state in one JSON file.
+
+        The file is rewritten atomically on every save, which suits a moderate 
+        number of sources. Use SQLiteSyncStore for thousands of sources.
+
+        Parent(s):
+            SyncStore
+
+        Attribute(s):
+            path type(str): path of the JSON file
+    """
+
+    def __init__(self, path: str) -> None:
+
+        super().__init__()
+        self.path = path
+        if os.path.exists(path):
+            with open(path) as f:
+                self._states = json.load(f)
+
+    def _write(self) -> None:
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._states, f)
+        os.replace(temp, self.path)
+
+    def save(self, source: str, state: SyncState) -> None:
+        super().save(source, state)
+        self._write()
+
+    def delete(self, source: str) -> None:
+        super().delete(source)
+        self._write()
+
+
+class SQLiteSyncStore(SyncStore):
+
+    """
+        Sync store keeping states in a SQLite database, one row per source.
+
+        Parent(s):
+            SyncStore
+
+        Attribute(s):
+            path type(str): path of the database file
+    """
+
+    def __init__(self, path: str) -> None:
+
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS sync_state '
+            '(source TEXT PRIMARY KEY, state TEXT NOT NULL)')
+        self._connection.commit()
+
+    def load(self, source: str) -> Optional[SyncState]:
+
+        row = self._connection.execute(
+            'SELECT state FROM sync_state WHERE source = ?', (source,)).fetchone()
+        return None if row == None else SyncState.from_dict(json.loads(row[0]))
+
+    def save(self, source: str, state: SyncState) -> None:
+
+        self._connection.execute('INSERT OR REPLACE INTO sync_state VALUES (?, ?)', 
+            (source, json.dumps(state.to_dict())))
+        self._connection.commit()
+
+    def delete(self, source: str) -> None:
+
+        self._connection.execute('DELETE FROM sync_state WHERE source = ?', (source,))
+        self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class YouTubeSync:
+
+    """
+        Incremental synchronization of playlists and channel uploads.
+
+        Each sync compares the playlist with the state persisted in the store
+        and yields only added and changed items. Channel upload playlists list 
+        their items newest first, so when the etag of their first page is 
+        unchanged nothing is walked at all, and otherwise pagination stops at 
+        the first item that was already seen unchanged and is not newer than 
+        the newest item of the last sync. Other playlists list items by 
+        position, so every page is walked unless the playlist fits on one page 
+        with an unchanged etag, and removed items are reported. A full sync 
+        walks every page of any playlist and reports removed items. The state 
+        is saved once a sync completes.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            client type(YouTubeAPIClient): connected client whose list_ coroutine is used
+            store type(SyncStore): store persisting the state of every source
+            part type(list): parts requested for playlist items
+    """
+
+    def __init__(
+        self, 
+        client, 
+        store: Optional[SyncStore] = None, 
+        part: list = ['snippet', 'contentDetails']
+    ) -> None:
+
+        self.client = client
+        self.store = store or SyncStore()
+        self.part = part
+
+    # channel ids starting with UC have an uploads playlist starting with UU,
+    # other channels are looked up
+
+    async def uploads_playlist(self, channel_id: str) -> str:
+
+        if channel_id.startswith('UC'):
+            return 'UU' + channel_id[2:]
+
+        result = await self.client.list_('channel', ['contentDetails'], id=channel_id)
+        await is_http_exception(result.status, result.data)
+        return result.data['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+
+    async def sync_channel(
+        self, 
+        channel_id: str, 
+        full: bool = False
+    ) -> AsyncIterator[SyncChange]:
+
+        playlist_id = await self.uploads_playlist(channel_id)
+        async for change in self.sync_playlist(playlist_id, full=full, newest_first=True):
+            yield change
+
+    async def sync_playlist(
+        self, 
+        playlist_id: str, 
+        full: bool = False, 
+        newest_first: Optional[bool] = None
+    ) -> AsyncIterator[SyncChange]:
+
+        # only upload playlists, whose ids start with UU, are known to list 
+        # their newest items first
+        if newest_first == None:
+            newest_first = playlist_id.startswith('UU')
+        incremental = not full and newest_first
+
+        source = 'playlist:' + playlist_id
+        state = self.store.load(source)
+        first_sync = state == None
+        state = state or SyncState()
+
+        seen = set()
+        items = dict(state.items)
+        newest = state.newest
+        etag = None
+        page_token = None
+
+        while True:
+
+            kwargs = {'playlistId': playlist_id, 'maxResults': 50}
+            if page_token != None:
+                kwargs['pageToken'] = page_token
+            result = await self.client.list_('playlistItem', self.part, **kwargs)
+            await is_http_exception(result.status, result.data)
+            data = result.data
+
+            if etag == None:
+                etag = data.get('etag')
+                if not full and not first_sync and etag != None and etag == state.etag \
+                    and (newest_first or data.get('nextPageToken') == None):
+                        return
+
+            stop = False
+            for item in data.get('items', []):
+
+                id = item['id']
+                seen.add(id)
+                published = item.get('snippet', {}).get('publishedAt')
+                if published != None and (newest == None or published > newest):
+                    newest = published
+
+                if id not in state.items:
+                    yield SyncChange('added', id, item)
+                elif state.items[id] != item.get('etag'):
+                    yield SyncChange('changed', id, item)
+                elif incremental and state.newest != None and published != None \
+                    and published <= state.newest:
+                    stop = True
+                    break
+                items[id] = item.get('etag')
+
+            page_token = data.get('nextPageToken')
+            if stop or page_token == None:
+                break
+
+        if not incremental:
+            for id in list(items):
+                if id not in seen:
+                    del items[id]
+                    yield SyncChange('removed', id, None)
+
+        self.store.save(source, SyncState(etag, newest, items))
@@ -0,0 +1,635 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import abc
+import asyncio
+import collections.abc
+import contextlib
+import inspect
+import json
+import ssl
+import zlib
+import aiohttp
+from typing import Any, AsyncIterator, Callable, Iterator, MutableMapping, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.request import getproxies
+from aiohttp import ClientSession
+from multidict import CIMultiDict, CIMultiDictProxy
+from .retry import RETRY_METHODS
+
+
+# aiohttp 3.9+ can leave decompression to the caller per request, which is needed
+# to count the compressed size of responses without a Content-Length header
+
+_AUTO_DECOMPRESS = 'auto_decompress' in inspect.signature(ClientSession._request).parameters
+
+_EMPTY_HEADERS = CIMultiDictProxy(CIMultiDict())
+
+
+# decompresses a gzip or deflate encoded body
+
+def decompress(data: bytes, encoding: Optional[str]) -> bytes:
+
+    if encoding == 'gzip' and len(data) > 0:
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    elif encoding == 'deflate' and len(data) > 0:
+        return zlib.decompress(data)
+    return data
+
+
+class YouTubeTransport(abc.ABC):
+
+    """
+        Base class of the transports sending the requests of a YouTubeAPISession.
+
+        send returns the status, the decompressed body, the headers and the 
+        number of body bytes received on the wire. When an event is given, 
+        send sets its status and emits first_byte once the response headers 
+        have arrived. stream is an async context manager yielding the status, 
+        the headers and a content object with iter_chunked and read.
+
+        Parent(s):
+            abc.ABC
+
+        Attribute(s):
+            closed type(bool): flag telling if the transport was closed
+    """
+
+    @property
+    def closed(self) -> bool:
+        return False
+
+    @abc.abstractmethod
+    async def send(
+        self, 
+        method: str, 
+        url: str, 
+        headers: MutableMapping, 
+        body: Any, 
+        event = None
+    ) -> Tuple[int, bytes, MutableMapping, int]:
+        pass
+
+    @abc.abstractmethod
+    def stream(
+        self, 
+        method: str, 
+        url: str, 
+        headers: MutableMapping, 
+        body: Any
+    ) -> Any:
+        pass
+
+    async def close(self) -> bool:
+        return False
+
+
+class AiohttpTransport(YouTubeTransport):
+
+    """
+        Transport sending requests with an aiohttp ClientSession.
+
+        Parent(s):
+            YouTubeTransport
+
+        Attribute(s):
+            session type(aiohttp.ClientSession): session requests are sent with
+            kwargs type(MutableMapping): keyword arguments for the ClientSession created without a session
+    """
+
+    def __init__(self, session: Optional[ClientSession] = None, **kwargs) -> None:
+
+        self.session = session or ClientSession(**kwargs)
+        self._send_kwargs = {'auto_decompress': False} if _AUTO_DECOMPRESS else {}
+
+    @property
+    def closed(self) -> bool:
+        return self.session.closed
+
+    async def send(
+        self, 
+        method: str, 
+        url: str, 
+        headers: MutableMapping, 
+        body: Any, 
+        event = None
+    ) -> Tuple[int, bytes, MutableMapping, int]:
+
+        async with self.session.request(method, url, data=body, 
+            headers=headers, **self._send_kwargs) as response:
+                if event != None:
+                    event.status = response.status
+                    event.emit('first_byte')
+                status, data, headers_ = response.status, await response.read(), response.headers
+
+        # bodies are decompressed here when aiohttp was told not to so the size 
+        # on the wire can be counted. otherwise Content-Length is the best estimate.
+
+        compressed = len(data)
+        encoding = headers_.get('Content-Encoding', 'identity').lower()
+        if encoding in ('gzip', 'deflate') and len(data) > 0:
+            if self._send_kwargs:
+                data = decompress(data, encoding)
+            elif 'Content-Length' in headers_:
+                compressed = int(headers_['Content-Length'])
+        return status, data, headers_, compressed
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self, 
+        method: str, 
+        url: str, 
+        headers: MutableMapping, 
+        body: Any
+    ) -> AsyncIterator[Tuple[int, MutableMapping, aiohttp.StreamReader]]:
+
+        async with self.session.request(method, url, headers=headers, data=body) as response:
+            yield response.status, response.headers, response.content
+
+    async def close(self) -> bool:
+
+        if not self.session.closed:
+            await self.session.close()
+            return True
+        return False
+
+
+class RawHeaders(collections.abc.Mapping):
+
+    """
+        Response headers kept as the raw header block of a RawTransport response.
+
+        The block is only parsed into a case insensitive mapping when a header 
+        is first looked up, so responses whose headers are never read skip it.
+
+        Parent(s):
+            collections.abc.Mapping
+
+        Attribute(s):
+            raw type(bytes): header block of the response without the status line
+    """
+
+    __slots__ = ('raw', '_headers')
+
+    def __init__(self, raw: bytes) -> None:
+
+        self.raw = raw
+        self._headers = None
+
+    def _parse(self) -> CIMultiDict:
+
+        if self._headers == None:
+            headers = CIMultiDict()
+            for line in self.raw.decode('latin-1').split('\r\n'):
+                name, _, value = line.partition(':')
+                if name:
+                    headers.add(name.strip(), value.strip())
+            self._headers = headers
+        return self._headers
+
+    def __getitem__(self, name: str) -> str:
+        return self._parse()[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._parse()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._parse())
+
+    def __len__(self) -> int:
+        return len(self._parse())
+
+    def getall(self, name: str, *default) -> list:
+        return self._parse().getall(name, *default)
+
+    def __repr__(self) -> str:
+        return '<RawHeaders {} bytes>'.format(len(self.raw))
+
+
+# finds a header value in a lowercased header block starting with a newline
+
+def _field(block: bytes, name: bytes) -> Optional[bytes]:
+
+    start = block.find(b'\n' + name + b':')
+    if start < 0:
+        return None
+    start += len(name) + 2
+    end = block.find(b'\r', start)
+    return block[start:end if end >= 0 else len(block)].strip()
+
+
+class RawTransport(AiohttpTransport):
+
+    """
+        Transport writing HTTP/1.1 requests straight to pooled connections.
+
+        Requests with a bytes or str body (or none) are written as raw bytes 
+        and only the headers needed to frame and decode the body are looked 
+        at. The other headers are returned as RawHeaders, which are parsed 
+        only when read. The default headers of the session are sent and its 
+        cookies are not, and its total or read timeout bounds each request. 
+        Other bodies, ex. multipart uploads, and streams are sent with aiohttp, 
+        as are all requests when the session uses a proxy or an ssl setting 
+        other than a context or a verify flag, ex. a fingerprint.
+
+        Parent(s):
+            AiohttpTransport
+
+        Attribute(s):
+            session type(aiohttp.ClientSession): session used for other bodies and streams
+            max_idle type(int): idle connections kept open per host
+            ssl_context type(ssl.SSLContext): context of https connections, defaults to the ssl setting of the session connector
+            kwargs type(MutableMapping): keyword arguments for the ClientSession created without a session
+    """
+
+    def __init__(
+        self, 
+        session: Optional[ClientSession] = None, 
+        max_idle: int = 10, 
+        ssl_context: Optional[ssl.SSLContext] = None, 
+        **kwargs
+    ) -> None:
+
+        super().__init__(session, **kwargs)
+        self.max_idle = max_idle
+        self.ssl_context = ssl_context
+        self._idle = {}
+        self._fallback = None
+
+    # tells if the requests have to go through aiohttp to honour the proxy 
+    # or the ssl setting of the session, and picks the ssl context otherwise
+
+    def _uses_aiohttp(self) -> bool:
+
+        if self._fallback == None:
+            proxies = getproxies() if self.session.trust_env else {}
+            proxy = getattr(self.session, '_default_proxy', None) or \
+                proxies.get('https') or proxies.get('http')
+            setting = getattr(self.session.connector, '_ssl', True)
+            self._fallback = proxy != None
+            if self.ssl_context != None:
+                pass
+            elif isinstance(setting, ssl.SSLContext):
+                self.ssl_context = setting
+            elif setting == False:
+                self.ssl_context = ssl.create_default_context()
+                self.ssl_context.check_hostname = False
+                self.ssl_context.verify_mode = ssl.CERT_NONE
+            elif setting in (True, None):
+                self.ssl_context = ssl.create_default_context()
+            else:
+                self._fallback = True
+        return self._fallback
+
+    async def _connect(self, scheme: str, host: str, port: int) -> Tuple[Any, Any, bool]:
+
+        idle = self._idle.get((scheme, host, port))
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+
+        context = self.ssl_context if scheme == 'https' else None
+        timeout = self.session.timeout
+        limit = min((value for value in (timeout.connect, timeout.sock_connect) 
+            if value), default=None)
+        connect = asyncio.open_connection(host, port, ssl=context)
+        reader, writer = await (connect if limit == None else asyncio.wait_for(connect, limit))
+        return reader, writer, False
+
+    def _release(self, scheme: str, host: str, port: int, reader, writer) -> None:
+
+        idle = self._idle.setdefault((scheme, host, port), [])
+        if len(idle) < self.max_idle and not self.session.closed:
+            idle.append((reader, writer))
+        else:
+            writer.close()
+
+    async def send(
+        self, 
+        method: str, 
+        url: str, 
+        headers: MutableMapping, 
+        body: Any, 
+        event = None
+    ) -> Tuple[int, bytes, MutableMapping, int]:
+
+        if self._uses_aiohttp() or \
+            (body != None and not isinstance(body, (bytes, bytearray, str))):
+                return await super().send(method, url, headers, body, event)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        parts = urlsplit(url)
+        scheme, host = parts.scheme, parts.hostname
+        port = parts.port or (443 if scheme == 'https' else 80)
+        target = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+        host_header = parts.netloc.rpartition('@')[2]
+
+        if self.session.headers:
+            merged = CIMultiDict(self.session.headers)
+            merged.update(headers)
+            headers = merged
+
+        lines = ['{} {} HTTP/1.1'.format(method, target), 'Host: ' + host_header]
+        for name, value in headers.items():
+            lines.append('{}: {}'.format(name, value))
+        if body != None or method in ('POST', 'PUT', 'PATCH'):
+            lines.append('Content-Length: {}'.format(len(body or b'')))
+        request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b'')
+
+        # the total timeout of the session, or its read timeout without one, 
+        # bounds connecting, sending and reading the whole response
+
+        timeout = self.session.timeout
+        limit = timeout.total or timeout.sock_read
+        try:
+            if limit:
+                status, block, data, encoding = await asyncio.wait_for(
+                    self._exchange(method, scheme, host, port, request, event), limit)
+            else:
+                status, block, data, encoding = await self._exchange(
+                    method, scheme, host, port, request, event)
+        except asyncio.TimeoutError as e:
+            raise aiohttp.ServerTimeoutError('Timeout on request to {}'.format(url)) from e
+
+        compressed = len(data)
+        if encoding != None:
+            data = decompress(data, encoding.decode('latin-1'))
+        return status, data, RawHeaders(block), compressed
+
+    # writes a request and reads its response. a pooled connection closed by 
+    # the server is replaced by a new one once, but only for idempotent methods 
+    # since the server may have applied a request that was already written. 
+    # a header line longer than the reader limit is not retried.
+
+    async def _exchange(
+        self, 
+        method: str, 
+        scheme: str, 
+        host: str, 
+        port: int, 
+        request: bytes, 
+        event
+    ) -> Tuple[int, bytes, bytes, Optional[bytes]]:
+
+        while True:
+            reader, writer, reused = await self._connect(scheme, host, port)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, block, data, keep_alive, encoding = await self._read(
+                    reader, method, event)
+            except asyncio.LimitOverrunError as e:
+                writer.close()
+                raise aiohttp.ClientConnectionError(str(e)) from e
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                writer.close()
+                if reused and method.upper() in RETRY_METHODS:
+                    continue
+                raise aiohttp.ClientConnectionError(str(e)) from e
+            except BaseException:
+                writer.close()
+                raise
+            break
+
+        if keep_alive:
+            self._release(scheme, host, port, reader, writer)
+        else:
+            writer.close()
+        return status, block, data, encoding
+
+    # reads one response and returns its status, header block, body, whether 
+    # the connection can be reused and the content encoding of the body
+
+    async def _read(self, reader, method: str, event) -> Tuple[int, bytes, bytes, bool, Optional[bytes]]:
+
+        # interim responses, ex. 100 Continue, come before the final response
+
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            status_line, _, block = head[:-4].partition(b'\r\n')
+            version, status = status_line.split(b' ', 2)[:2]
+            status = int(status)
+            if not 100 <= status < 200 or status == 101:
+                break
+
+        if event != None:
+            event.status = status
+            event.emit('first_byte')
+
+        lower = b'\n' + block.lower()
+        keep_alive = version == b'HTTP/1.1' and _field(lower, b'connection') != b'close'
+
+        length = _field(lower, b'content-length')
+        if method == 'HEAD' or status in (204, 304) or status < 200:
+            data = b''
+        elif _field(lower, b'transfer-encoding') == b'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if size == 0:
+                    while await reader.readuntil(b'\r\n') != b'\r\n':
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            data = b''.join(chunks)
+        elif length != None:
+            data = await reader.readexactly(int(length))
+        else:
+            data = await reader.read()
+            keep_alive = False
+
+        return status, block, data, keep_alive, _field(lower, b'content-encoding')
+
+    async def close(self) -> bool:
+
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
+        return await super().close()
+
+
+class MemoryContent:
+
+    """
+        Body of a streamed MemoryTransport response.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            data type(bytes): body of the response
+    """
+
+    def __init__(self, data: bytes) -> None:
+
+        self.data = data
+        self._offset = 0
+
+    async def iter_chunked(self, size: int) -> AsyncIterator[bytes]:
+
+        while self._offset < len(self.data):
+            chunk = self.data[self._offset:self._offset + size]
+            self._offset += len(chunk)
+            yield chunk
+
+    async def read(self, size: int = -1) -> bytes:
+
+        end = len(self.data) if size < 0 else self._offset + size
+        chunk = self.data[self._offset:end]
+        self._offset += len(chunk)
+        return chunk
+
+
+class MemoryTransport(YouTubeTransport):
+
+    """
+        Transport answering requests from memory without a network.
+
+        Responses are registered with add for a method and a path, which 
+        matches request urls ending in the path, ex. 'videos' or 'youtube/v3/videos'.
+        A handler, a function or coroutine function taking the method, url, 
+        headers and body and returning a status, body and headers, answers 
+        the requests no route matches. Other requests are answered with 404.
+        Bodies can be bytes, str or JSON serializable objects.
+
+        Parent(s):
+            YouTubeTransport
+
+        Attribute(s):
+            handler type(Callable): optional handler answering requests without a route
+            requests type(int): number of requests answered
+    """
+
+    def __init__(self, handler: Optional[Callable] = None) -> None:
+
+        self.handler = handler
+        self.requests = 0
+        self._routes = {}
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def add(
+        self, 
+        method: str, 
+        path: str, 
+        body: Any = b'', 
+        status: int = 200, 
+        headers: Optional[MutableMapping] = None
+    ) -> None:
+
+        self._routes[(method.upper(), path.strip('/'))] = self._encode(status, body, headers)
+
+    # routes keep plain dicts of headers so the transport can be pickled
+
+    def _encode(
+        self, 
+        status: int, 
+        body: Any, 
+        headers: Optional[MutableMapping] = None
+    ) -> Tuple[int, bytes, Optional[dict]]:
+
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        elif not isinstance(body, (bytes, bytearray)):
+            body = json.dumps(body).encode('utf-8')
+        return status, bytes(body), dict(headers) if headers else None
+
+    def _response(
+        self, 
+        status: int, 
+        body: bytes, 
+        headers: Optional[dict]
+    ) -> Tuple[int, bytes, MutableMapping]:
+
+        headers = _EMPTY_HEADERS if not headers else CIMultiDictProxy(CIMultiDict(headers))
+        return status, body, headers
+
+    async def _respond(
+        self, 
+        method: str, 
+        url: str, 
+        headers: MutableMapping, 
+        body: Any
+    ) -> Tuple[int, bytes, MutableMapping]:
+
+        self.requests += 1
+        method = method.upper()
+        path = urlsplit(url).path.strip('/')
+        while True:
+            route = self._routes.get((method, path))
+            if route != None:
+                return self._response(*route)
+            if '/' not in path:
+                break
+            path = path.partition('/')[2]
+
+        if self.handler == None:
+            return self._response(*self._encode(404, {'error': {'code': 404, 'message': 'Not Found'}}))
+        result = self.handler(method, url, headers, body)
+        if inspect.isawaitable(result):
+            result = await result
+        return self._response(*self._encode(*result))
+
+    async def send(
+        self, 
+        method: str, 
+        url: str, 
+        headers: MutableMapping, 
+        body: Any, 
+        event = None
+    ) -> Tuple[int, bytes, MutableMapping, int]:
+
+        status, data, headers_ = await self._respond(method, url, headers, body)
+        if event != None:
+            event.status = status
+            event.emit('first_byte')
+        return status, data, headers_, len(data)
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self, 
+        method: str, 
+        url: str, 
+        headers: MutableMapping, 
+        body: Any
+    ) -> AsyncIterator[Tuple[int, MutableMapping, MemoryContent]]:
+
+        status, data, headers_ = await self._respond(method, url, headers, body)
+        yield status, headers_, MemoryContent(data)
+
+    async def close(self) -> bool:
+
+        closed, self._closed = self._closed, True
+        return not closed
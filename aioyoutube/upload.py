@@ -0,0 +1,312 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+import asyncio
+import json
+import os
+import random
+import aiohttp
+from typing import (
+    AsyncIterator, 
+    Awaitable, 
+    Callable, 
+    IO, 
+    MutableMapping, 
+    Optional, 
+    Tuple, 
+    Union
+)
+
+
+# chunk sizes of a resumable upload must be a multiple of 256 KiB except for the last chunk
+
+CHUNK_GRANULARITY = 256 * 1024
+CHUNK_SIZE = 32 * CHUNK_GRANULARITY
+
+Media = Union[bytes, str, os.PathLike, IO[bytes], AsyncIterator[bytes]]
+Progress = Callable[[int, Optional[int]], Optional[Awaitable[None]]]
+
+
+class MediaSource:
+
+    """
+        Reads chunks of media for a resumable upload.
+
+        Files, file paths and bytes are read at any offset. Async byte iterators 
+        cannot seek so the bytes of the chunk that has not been acknowledged by 
+        the server yet are kept in a buffer of at most one chunk plus one item 
+        of the iterator.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            media type(Media): bytes, file path, binary file object or async iterator of bytes
+            size type(int): total size in bytes, None when it is not known up front
+    """
+
+    def __init__(self, media: Media) -> None:
+
+        self._file = None
+        self._start = 0
+        self._close = False
+        self._iterator = None
+        self._buffer = bytearray()
+        self._buffer_offset = 0
+        self._exhausted = False
+        self.size = None
+
+        if isinstance(media, (bytes, bytearray, memoryview)):
+            self._bytes = memoryview(media)
+            self.size = len(media)
+        elif isinstance(media, (str, os.PathLike)):
+            self._file = open(media, 'rb')
+            self._close = True
+            self.size = os.fstat(self._file.fileno()).st_size
+        elif hasattr(media, 'read'):
+            self._file = media
+            start = media.tell()
+            self.size = media.seek(0, os.SEEK_END) - start
+            media.seek(start)
+            self._start = start
+        elif hasattr(media, '__aiter__'):
+            self._iterator = media.__aiter__()
+        else:
+            raise TypeError('Media must be bytes, a file path, a binary file object '
+                'or an async iterator of bytes')
+
+    def close(self) -> None:
+        if self._close:
+            self._file.close()
+
+    # returns up to size bytes starting at offset and whether they are the last bytes
+
+    async def read(self, offset: int, size: int) -> Tuple[bytes, bool]:
+
+        if self._iterator != None:
+            return await self._read_iterator(offset, size)
+        elif self._file != None:
+            loop = asyncio.get_event_loop()
+            chunk = await loop.run_in_executor(None, self._read_file, offset, size)
+        else:
+            chunk = bytes(self._bytes[offset:offset + size])
+
+        return chunk, offset + len(chunk) >= self.size
+
+    def _read_file(self, offset: int, size: int) -> bytes:
+
+        self._file.seek(self._start + offset)
+        return self._file.read(size)
+
+    async def _read_iterator(self, offset: int, size: int) -> Tuple[bytes, bool]:
+
+        # bytes before offset were acknowledged and are dropped from the buffer
+        del self._buffer[:offset - self._buffer_offset]
+        self._buffer_offset = offset
+
+        # one byte past the chunk is read ahead to know whether it is the last one
+        while len(self._buffer) <= size and not self._exhausted:
+            try:
+                self._buffer += await self._iterator.__anext__()
+            except StopAsyncIteration:
+                self._exhausted = True
+
+        final = self._exhausted and len(self._buffer) <= size
+        if final:
+            self.size = offset + len(self._buffer)
+        return bytes(self._buffer[:size]), final
+
+
+class ResumableUpload:
+
+    """
+        Resumable media upload to the YouTube Data API.
+
+        The upload session is started with a POST using uploadType=resumable and
+        the media is then sent in chunks to the session url returned by the api.
+        After a failed chunk the upload status is queried and the upload resumes 
+        from the offset reported by the server instead of starting over. Only one
+        chunk is held in memory at a time.
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            session type(YouTubeAPISession): session the upload is sent with
+            endpoint type(str): endpoint generated by build_endpoint, including uploadType=resumable
+            data type(MutableMapping): resource metadata sent when starting the upload
+            media type(Media): bytes, file path, binary file object or async iterator of bytes
+            headers type(MutableMapping): headers sent with every request (ex. Authorization)
+            chunk_size type(int): bytes sent per request, a multiple of 256 KiB
+            content_type type(str): mime type of the media
+            progress type(Callable): called with (bytes sent, total bytes) after each chunk
+            max_resumes type(int): number of times a failed chunk is resumed before giving up
+            url type(str): upload session url once the upload has started
+            offset type(int): bytes acknowledged by the server
+    """
+
+    def __init__(
+        self, 
+        session, 
+        endpoint: str, 
+        data: Optional[MutableMapping], 
+        media: Media, 
+        headers: Optional[MutableMapping] = None, 
+        chunk_size: int = CHUNK_SIZE, 
+        content_type: str = 'application/octet-stream', 
+        progress: Optional[Progress] = None, 
+        max_resumes: int = 10
+    ) -> None:
+
+        if chunk_size <= 0 or chunk_size % CHUNK_GRANULARITY != 0:
+            raise ValueError('Chunk size must be a positive multiple of {} bytes'.format(
+                CHUNK_GRANULARITY))
+
+        self.session = session
+        self.endpoint = endpoint
+        self.data = data
+        self.media = media
+        self.headers = dict(headers or {})
+        self.chunk_size = chunk_size
+        self.content_type = content_type
+        self.progress = progress
+        self.max_resumes = max_resumes
+        self.url = None
+        self.offset = 0
+
+    async def _report(self) -> None:
+
+        if self.progress != None:
+            result = self.progress(self.offset, self._source.size)
+            if asyncio.iscoroutine(result):
+                await result
+
+    # starts the upload session and returns the session url or the error response
+
+    async def start(self) -> Tuple[int, bytes, MutableMapping]:
+
+        headers = dict(self.headers)
+        headers['Content-Type'] = 'application/json; charset=UTF-8'
+        headers['X-Upload-Content-Type'] = self.content_type
+        if self._source.size != None:
+            headers['X-Upload-Content-Length'] = str(self._source.size)
+
+        result = await self.session.request(
+            method='POST', 
+            endpoint=self.endpoint, 
+            upload=True, 
+            headers=headers, 
+            body=json.dumps(self.data or {})
+        )
+
+        if result[0] >= 200 and result[0] < 300:
+            self.url = result[2].get('Location')
+        return result
+
+    # asks the server how many bytes it has received
+
+    async def _query(self) -> Tuple[int, bytes, MutableMapping]:
+
+        headers = dict(self.headers)
+        headers['Content-Range'] = 'bytes */{}'.format(
+            '*' if self._source.size == None else self._source.size)
+        return await self.session.send('PUT', self.url, headers, b'')
+
+    def _acknowledged(self, headers: MutableMapping) -> int:
+
+        # ex. Range: bytes=0-524287 means the first 524288 bytes were received
+        range_ = headers.get('Range')
+        if range_ == None:
+            return 0
+        return int(range_.rsplit('-', 1)[1]) + 1
+
+    async def _put_chunk(self) -> Tuple[int, bytes, MutableMapping]:
+
+        chunk, final = await self._source.read(self.offset, self.chunk_size)
+
+        headers = dict(self.headers)
+        headers['Content-Type'] = self.content_type
+        if len(chunk) == 0:
+            headers['Content-Range'] = 'bytes */{}'.format(self.offset)
+        else:
+            headers['Content-Range'] = 'bytes {}-{}/{}'.format(self.offset, 
+                self.offset + len(chunk) - 1, 
+                self.offset + len(chunk) if final else '*' if self._source.size == None 
+                else self._source.size)
+
+        return await self.session.send('PUT', self.url, headers, chunk)
+
+    async def run(self) -> Tuple[int, bytes, MutableMapping]:
+
+        self._source = MediaSource(self.media)
+        try:
+            if self.url == None:
+                result = await self.start()
+                if self.url == None:
+                    return result
+            else:
+                result = await self._query()
+                if result[0] == 308:
+                    self.offset = self._acknowledged(result[2])
+
+            resumes = 0
+            while True:
+                try:
+                    result = await self._put_chunk()
+                except (OSError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    result = e
+
+                if not isinstance(result, BaseException) and result[0] in (200, 201):
+                    self.offset = self._source.size or self.offset
+                    await self._report()
+                    return result
+                elif not isinstance(result, BaseException) and result[0] == 308:
+                    self.offset = self._acknowledged(result[2])
+                    await self._report()
+                    continue
+                elif not isinstance(result, BaseException) and result[0] < 500:
+                    return result
+
+                # server errors and dropped connections resume from the offset 
+                # the server reports after a jittered backoff
+                resumes += 1
+                if resumes > self.max_resumes:
+                    if isinstance(result, BaseException):
+                        raise result
+                    return result
+                await asyncio.sleep(random.uniform(0, min(32, 2 ** resumes)))
+
+                try:
+                    status = await self._query()
+                except (OSError, aiohttp.ClientError, asyncio.TimeoutError):
+                    continue
+                if status[0] in (200, 201):
+                    return status
+                elif status[0] == 308:
+                    self.offset = self._acknowledged(status[2])
+        finally:
+            self._source.close()
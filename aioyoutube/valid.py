@@ -56,8 +56,62 @@ YOUTUBE_RESOURCES = frozenset({
 })
 
 
+# parts that can be requested for each resource. fields of an item outside of
+# a part such as kind and etag are always returned.
+
+RESOURCE_PARTS = {
+    'activity': frozenset({'contentDetails', 'id', 'snippet'}),
+    'caption': frozenset({'id', 'snippet'}),
+    'channel': frozenset({
+        'auditDetails', 
+        'brandingSettings', 
+        'contentDetails', 
+        'contentOwnerDetails', 
+        'id', 
+        'localizations', 
+        'snippet', 
+        'statistics', 
+        'status', 
+        'topicDetails'
+    }),
+    'channelSection': frozenset({'contentDetails', 'id', 'snippet'}),
+    'comment': frozenset({'id', 'snippet'}),
+    'commentThread': frozenset({'id', 'replies', 'snippet'}),
+    'i18nLanguage': frozenset({'id', 'snippet'}),
+    'i18nRegion': frozenset({'id', 'snippet'}),
+    'member': frozenset({'snippet'}),
+    'membershipsLevel': frozenset({'id', 'snippet'}),
+    'playlist': frozenset({'contentDetails', 'id', 'localizations', 'player', 'snippet', 'status'}),
+    'playlistItem': frozenset({'contentDetails', 'id', 'snippet', 'status'}),
+    'search': frozenset({'id', 'snippet'}),
+    'subscription': frozenset({'contentDetails', 'id', 'snippet', 'subscriberSnippet'}),
+    'video': frozenset({
+        'contentDetails', 
+        'fileDetails', 
+        'id', 
+        'liveStreamingDetails', 
+        'localizations', 
+        'player', 
+        'processingDetails', 
+        'recordingDetails', 
+        'snippet', 
+        'statistics', 
+        'status', 
+        'suggestions', 
+        'topicDetails'
+    }),
+    'videoAbuseReportReason': frozenset({'id', 'snippet'}),
+    'videoCategory': frozenset({'id', 'snippet'})
+}
+
+ITEM_FIELDS = frozenset({'kind', 'etag'})
+
+
 def get_youtube_resources() -> list:
     return list(YOUTUBE_RESOURCES)
 
 def get_ratings() -> list:
-    return list(RATINGS)
\ No newline at end of file
+    return list(RATINGS)
+
+def get_resource_parts(resource: str) -> list:
+    return list(RESOURCE_PARTS.get(resource, ()))
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+
+The MIT License (MIT)
+
+Copyright (c) 2021 im-mde
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+"""
+
+
+from typing import Any, Iterator, MutableMapping, Optional
+
+
+# converts a numeric string such as a statistics count to an int
+
+def _int(value: Optional[str]) -> Optional[int]:
+    return None if value == None else int(value)
+
+
+class ResourceView:
+
+    """
+        Lightweight read-only view over a resource item of a response.
+
+        Views wrap the decoded item without copying it and expose commonly used
+        fields as attributes. Any other field can be read with get using a 
+        dotted path. ex. view.get('snippet.thumbnails.default.url')
+
+        Parent(s):
+            None
+
+        Attribute(s):
+            item type(MutableMapping): decoded resource item
+    """
+
+    __slots__ = ('_item',)
+
+    def __init__(self, item: MutableMapping) -> None:
+        self._item = item
+
+    def __repr__(self) -> str:
+        return '<{} id={!r}>'.format(type(self).__name__, self.id)
+
+    @property
+    def item(self) -> MutableMapping:
+        return self._item
+
+    @property
+    def kind(self) -> Optional[str]:
+        return self._item.get('kind')
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self._item.get('etag')
+
+    @property
+    def id(self) -> Any:
+        return self._item.get('id')
+
+    @property
+    def title(self) -> Optional[str]:
+        return self.get('snippet.title')
+
+    @property
+    def published_at(self) -> Optional[str]:
+        return self.get('snippet.publishedAt')
+
+    def get(self, path: str, default: Any = None) -> Any:
+
+        value = self._item
+        for name in path.split('.'):
+            if not isinstance(value, MutableMapping) or name not in value:
+                return default
+            value = value[name]
+        return value
+
+
+class VideoView(ResourceView):
+
+    """
+        View over a youtube#video item.
+
+        Parent(s):
+            ResourceView
+
+        Attribute(s):
+            item type(MutableMapping): decoded video item
+    """
+
+    __slots__ = ()
+
+    @property
+    def channel_id(self) -> Optional[str]:
+        return self.get('snippet.channelId')
+
+    @property
+    def duration(self) -> Optional[str]:
+        return self.get('contentDetails.duration')
+
+    @property
+    def view_count(self) -> Optional[int]:
+        return _int(self.get('statistics.viewCount'))
+
+    @property
+    def like_count(self) -> Optional[int]:
+        return _int(self.get('statistics.likeCount'))
+
+    @property
+    def comment_count(self) -> Optional[int]:
+        return _int(self.get('statistics.commentCount'))
+
+
+class ChannelView(ResourceView):
+
+    """
+        View over a youtube#channel item.
+
+        Parent(s):
+            ResourceView
+
+        Attribute(s):
+            item type(MutableMapping): decoded channel item
+    """
+
+    __slots__ = ()
+
+    @property
+    def uploads_playlist_id(self) -> Optional[str]:
+        return self.get('contentDetails.relatedPlaylists.uploads')
+
+    @property
+    def view_count(self) -> Optional[int]:
+        return _int(self.get('statistics.viewCount'))
+
+    @property
+    def subscriber_count(self) -> Optional[int]:
+        return _int(self.get('statistics.subscriberCount'))
+
+    @property
+    def video_count(self) -> Optional[int]:
+        return _int(self.get('statistics.videoCount'))
+
+
+class PlaylistItemView(ResourceView):
+
+    """
+        View over a youtube#playlistItem item.
+
+        Parent(s):
+            ResourceView
+
+        Attribute(s):
+            item type(MutableMapping): decoded playlist item
+    """
+
+    __slots__ = ()
+
+    @property
+    def playlist_id(self) -> Optional[str]:
+        return self.get('snippet.playlistId')
+
+    @property
+    def video_id(self) -> Optional[str]:
+        return self.get('contentDetails.videoId') or self.get('snippet.resourceId.videoId')
+
+    @property
+    def position(self) -> Optional[int]:
+        return self.get('snippet.position')
+
+
+# view classes by resource kind, items of other kinds use ResourceView
+
+VIEWS = {
+    'youtube#video': VideoView,
+    'youtube#channel': ChannelView,
+    'youtube#playlistItem': PlaylistItemView
+}
+
+
+def iter_views(items: list) -> Iterator[ResourceView]:
+    for item in items:
+        yield VIEWS.get(item.get('kind'), ResourceView)(item)
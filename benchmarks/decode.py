@@ -0,0 +1,94 @@
+"""
+    Microbenchmark for response decoding.
+
+    Builds a videos.list payload shaped like a real response (50 items with
+    snippet, contentDetails and statistics parts) and times every available
+    decoder backend against the old ast.literal_eval approach.
+
+    ex. python benchmarks/decode.py 2000
+"""
+
+import ast
+import json
+import sys
+import timeit
+from aioyoutube import decoder
+
+
+def video_item(index: int) -> dict:
+    return {
+        'kind': 'youtube#video',
+        'etag': 'Xq3Zk1o2mT9v8m7aWJ0c4vN1p2E{}'.format(index),
+        'id': 'dQw4w9WgX{:02d}'.format(index),
+        'snippet': {
+            'publishedAt': '2021-03-{:02d}T17:00:08Z'.format(index % 28 + 1),
+            'channelId': 'UCuAXFkgsw1L7xaCfnd5JJOw',
+            'title': 'Video number {} - a reasonably long title for a video'.format(index),
+            'description': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 20,
+            'thumbnails': {
+                size: {
+                    'url': 'https://i.ytimg.com/vi/dQw4w9WgX{:02d}/{}.jpg'.format(index, size),
+                    'width': width,
+                    'height': height
+                } for size, width, height in (
+                    ('default', 120, 90), ('medium', 320, 180), ('high', 480, 360),
+                    ('standard', 640, 480), ('maxres', 1280, 720))
+            },
+            'channelTitle': 'Example Channel',
+            'tags': ['tag{}'.format(n) for n in range(15)],
+            'categoryId': '10',
+            'liveBroadcastContent': 'none',
+            'localized': {
+                'title': 'Video number {}'.format(index),
+                'description': 'Lorem ipsum dolor sit amet.'
+            },
+            'defaultAudioLanguage': 'en'
+        },
+        'contentDetails': {
+            'duration': 'PT3M33S',
+            'dimension': '2d',
+            'definition': 'hd',
+            'caption': 'false',
+            'licensedContent': True,
+            'contentRating': {},
+            'projection': 'rectangular'
+        },
+        'statistics': {
+            'viewCount': str(1000000 + index),
+            'likeCount': str(10000 + index),
+            'favoriteCount': '0',
+            'commentCount': str(500 + index)
+        }
+    }
+
+
+def videos_list_payload(items: int = 50) -> bytes:
+    return json.dumps({
+        'kind': 'youtube#videoListResponse',
+        'etag': 'Rn0vXq3Zk1o2mT9v8m7aWJ0c4vN',
+        'items': [video_item(index) for index in range(items)],
+        'pageInfo': {'totalResults': items, 'resultsPerPage': items}
+    }).encode('UTF8')
+
+
+def run(number: int) -> None:
+
+    payload = videos_list_payload()
+    print('payload: {} bytes, {} runs'.format(len(payload), number))
+
+    # literal_eval cannot parse true/false/null so the baseline is measured
+    # on a payload with python literals substituted in
+    literal = payload.replace(b'true', b'True').replace(b'false', b'False')
+    baseline = timeit.timeit(
+        lambda: ast.literal_eval(literal.decode('UTF8')), number=number) / number
+    print('{:<16}{:>10.1f} us/response'.format('ast.literal_eval', baseline * 1e6))
+
+    for name in decoder.get_decoders():
+        decoder.set_decoder(name)
+        elapsed = timeit.timeit(lambda: decoder.decode(payload), number=number) / number
+        print('{:<16}{:>10.1f} us/response  ({:.1f}x, {:.1f} us saved)'.format(
+            name, elapsed * 1e6, baseline / elapsed, (baseline - elapsed) * 1e6))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,73 @@
+"""
+    Microbenchmark for endpoint building.
+
+    Times the ROUTES lookup based build_endpoint against the previous string
+    concatenation implementation, both on their own and including the yarl.URL
+    parsing aiohttp does before sending a request.
+
+    ex. python benchmarks/endpoint.py 20000
+"""
+
+import sys
+import timeit
+from yarl import URL
+from aioyoutube.http import BASE_URL
+from aioyoutube.parse import build_endpoint
+from aioyoutube.valid import YOUTUBE_RESOURCES
+
+
+# previous implementation kept for comparison. it re-derives the url resource
+# on every call and does not encode query parameters.
+
+def legacy_build_endpoint(resource: str, key: str, part: list = [], 
+    append: str = None, **kwargs) -> str:
+
+    resource_ = resource
+    if 'youtube#' in resource:
+        resource_ = resource.split('#')[1]
+    if resource_ not in YOUTUBE_RESOURCES:
+        raise ValueError(resource)
+
+    if resource_ == 'search': 
+        resource = 'search'
+    elif resource[-1] == 'y': 
+        resource = resource_[0:-1] + 'ies'
+    else: 
+        resource = resource_ + 's'
+
+    if append != None: resource += '/' + append
+    endpoint = '{}?'.format(resource)
+    if len(part) > 0:
+        endpoint += 'part=' + ','.join(part)
+    for key_, value in kwargs.items():
+        endpoint += '&{}={}'.format(key_, str(value))
+    return endpoint + '&key=' + key
+
+
+CASES = {
+    'videos.list': dict(resource='video', key='AIzaSyD-example-key', 
+        part=['snippet', 'statistics'], id='dQw4w9WgXcQ', maxResults=50),
+    'search.list': dict(resource='search', key='AIzaSyD-example-key', 
+        part=['snippet'], q='surfing violin', type='video', maxResults=25),
+}
+
+
+def run(number: int) -> None:
+
+    for name, kwargs in CASES.items():
+        for label, build in (('legacy', legacy_build_endpoint), ('routes', build_endpoint)):
+            build_only = min(timeit.repeat(lambda: build(**kwargs), 
+                number=number, repeat=5)) / number
+            with_url = min(timeit.repeat(lambda: URL(BASE_URL + build(**kwargs)), 
+                number=number, repeat=5)) / number
+            print('{:<12}{:<8}{:>8.2f} us/call  {:>8.2f} us/call with url parsing'.format(
+                name, label, build_only * 1e6, with_url * 1e6))
+
+    # the legacy builder breaks queries containing reserved characters
+    kwargs = dict(CASES['search.list'], q='rock & roll #1')
+    print('legacy:', legacy_build_endpoint(**kwargs))
+    print('routes:', build_endpoint(**kwargs))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
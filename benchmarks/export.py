@@ -0,0 +1,81 @@
+"""
+    Microbenchmark for columnar export of videos.list results.
+
+    Turns pages of 50 videos into statistics and contentDetails columns, once
+    by walking the item dicts into lists of parsed values and once with
+    YouTubeColumnarExporter for every available backend, and reports time
+    and peak memory.
+
+    ex. python benchmarks/export.py 2000
+"""
+
+import re
+import sys
+import time
+import tracemalloc
+from aioyoutube import YouTubeColumnarExporter
+from decode import video_item
+
+
+_DURATION = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?')
+
+
+def naive(pages: list) -> dict:
+
+    columns = {'id': [], 'duration': [], 'view_count': [], 'like_count': [], 
+        'comment_count': []}
+    for page in pages:
+        for item in page['items']:
+            columns['id'].append(item['id'])
+            days, hours, minutes, seconds = _DURATION.match(
+                item['contentDetails']['duration']).groups()
+            columns['duration'].append(int(days or 0) * 86400 + int(hours or 0) * 3600 
+                + int(minutes or 0) * 60 + int(seconds or 0))
+            for name, key in (('view_count', 'viewCount'), ('like_count', 'likeCount'), 
+                ('comment_count', 'commentCount')):
+                columns[name].append(int(item['statistics'][key]))
+    return columns
+
+
+def exported(pages: list, backend: str) -> YouTubeColumnarExporter:
+
+    exporter = YouTubeColumnarExporter({
+        'id': ('id', 'str'),
+        'duration': ('contentDetails.duration', 'duration'),
+        'view_count': ('statistics.viewCount', 'int'),
+        'like_count': ('statistics.likeCount', 'int'),
+        'comment_count': ('statistics.commentCount', 'int')
+    }, backend=backend)
+    for page in pages:
+        exporter.add(page)
+    exporter.flush()
+    return exporter
+
+
+def measure(name: str, function, *args) -> None:
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    print('{:<10}{:>10.1f} ms{:>12.1f} MiB peak'.format(name, elapsed * 1e3, peak / 2 ** 20))
+
+
+def run(pages: int) -> None:
+
+    data = [{'items': [video_item(index) for index in range(50)]} for _ in range(pages)]
+    print('{} pages, {} items'.format(pages, pages * 50))
+
+    measure('naive', naive, data)
+    for backend in ('python', 'numpy', 'arrow'):
+        try:
+            measure(backend, exported, data, backend)
+        except ImportError as e:
+            print('{:<10}skipped, {}'.format(backend, e))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,98 @@
+"""
+    Memory and CPU measurements for holding many responses.
+
+    Creates N channels.list responses the way the previous eager, __dict__ based
+    response object did (decode every body up front) and the way the lazy, 
+    slotted YouTubeAPIResponse does (keep raw bytes, decode on first access),
+    then reports the time and memory needed to build and hold them, and the 
+    cost of reading data for all of them afterwards.
+
+    ex. python benchmarks/response.py 100000
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from aioyoutube.decoder import decode
+from aioyoutube.http import YouTubeAPIResponse
+
+
+class EagerResponse:
+
+    # previous response object kept for comparison
+
+    def __init__(self, status: int, data: dict, headers: dict) -> None:
+        self._status = status
+        self._data = data
+        self._headers = headers
+
+    @property
+    def data(self) -> dict:
+        return self._data
+
+
+def channel_payload(index: int) -> bytes:
+    return json.dumps({
+        'kind': 'youtube#channelListResponse',
+        'etag': 'Rn0vXq3Zk1o2mT9v8m7aWJ0c4vN',
+        'pageInfo': {'totalResults': 1, 'resultsPerPage': 5},
+        'items': [{
+            'kind': 'youtube#channel',
+            'etag': 'x1o2mT9v8m7aWJ0c4vN{}'.format(index),
+            'id': 'UCuAXFkgsw1L7xaCfnd{:05d}'.format(index),
+            'snippet': {
+                'title': 'Channel {}'.format(index),
+                'description': 'A channel description that is a few sentences long. ' * 3,
+                'publishedAt': '2011-05-12T19:16:48Z',
+                'country': 'US'
+            },
+            'contentDetails': {'relatedPlaylists': {'likes': '', 
+                'uploads': 'UUuAXFkgsw1L7xaCfnd{:05d}'.format(index)}},
+            'statistics': {'viewCount': '12345678', 'subscriberCount': '123000', 
+                'hiddenSubscriberCount': False, 'videoCount': '321'}
+        }]
+    }).encode('UTF8')
+
+
+def measure(label: str, build) -> list:
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    responses = build()
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for response in responses:
+        response.data
+    access = time.perf_counter() - start
+
+    print('{:<8}build {:>7.3f} s  held {:>8.1f} MiB  ({:>6.0f} B/response)  '
+        'read data {:>7.3f} s'.format(label, elapsed, memory / 2 ** 20, 
+        memory / len(responses), access))
+    return responses
+
+
+def run(count: int) -> None:
+
+    bodies = [channel_payload(index) for index in range(count)]
+    headers = {'Content-Type': 'application/json; charset=UTF-8'}
+    print('{} responses, {} bytes per body'.format(count, len(bodies[0])))
+
+    # lazy responses keep the bodies alive until data is read while eager 
+    # responses let them go, so their size is reported next to the results
+    print('raw bodies {:>8.1f} MiB'.format(
+        sum(sys.getsizeof(body) for body in bodies) / 2 ** 20))
+
+    measure('eager', lambda: [EagerResponse(200, decode(body), headers) 
+        for body in bodies])
+    measure('lazy', lambda: [YouTubeAPIResponse(200, None, headers, raw=body) 
+        for body in bodies])
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,286 @@
+"""
+    Offline benchmark suite for aioyoutube.
+
+    Starts a local mock of the YouTube Data API (see server.py) and measures
+    list_ requests, pagination, ETag revalidation, retries under injected 429s,
+    resumable uploads, streaming downloads and the transports. Results are written as JSON so
+    runs can be compared against each other. The benchmarks import the 
+    installed package, so install it from the repository root first.
+
+    ex. pip install -e .
+        python benchmarks/run.py --requests 2000 --latency 0.005 --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import aiohttp
+from aioyoutube import YouTubeAuthClient, YouTubeResponseCache, RetryPolicy
+from aioyoutube import MemoryTransport, RawTransport
+from aioyoutube import decoder
+from server import MockYouTubeServer, video_item
+
+
+def percentile(values: list, fraction: float) -> float:
+
+    values = sorted(values)
+    if len(values) == 0:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summarize(latencies: list, elapsed: float) -> dict:
+    return {
+        'requests': len(latencies),
+        'elapsed_s': elapsed,
+        'requests_per_s': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'mean_ms': statistics.mean(latencies) * 1000 if latencies else 0.0
+    }
+
+
+def connect(server: MockYouTubeServer, **kwargs) -> YouTubeAuthClient:
+    return YouTubeAuthClient.from_token_connect('key', 'token', base_url=server.base_url, 
+        upload_url=server.upload_url, **kwargs)
+
+
+async def timed_requests(client: YouTubeAuthClient, requests: int, 
+    concurrency: int, **kwargs) -> tuple:
+
+    latencies, items = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        nonlocal items
+        async with semaphore:
+            start = time.perf_counter()
+            result = await client.list_('video', ['snippet', 'contentDetails', 'statistics'], 
+                maxResults=50, **kwargs)
+            items += len(result.data.get('items', []))
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(requests)])
+    return latencies, items, time.perf_counter() - start
+
+
+async def bench_list(server: MockYouTubeServer, args: argparse.Namespace) -> dict:
+
+    client = connect(server)
+    try:
+        cpu = time.process_time()
+        latencies, items, elapsed = await timed_requests(client, args.requests, 
+            args.concurrency)
+        cpu = time.process_time() - cpu
+
+        result = summarize(latencies, elapsed)
+        result['items'] = items
+        result['cpu_us_per_item'] = cpu / items * 1e6 if items else 0.0
+        result['cpu_us_per_request'] = cpu / len(latencies) * 1e6
+
+        # tracemalloc slows everything down so memory is measured in its own pass
+        tracemalloc.start()
+        await timed_requests(client, min(args.requests, 200), args.concurrency)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['peak_memory_bytes'] = peak
+        result['memory_per_inflight_request_bytes'] = peak / args.concurrency
+        return result
+    finally:
+        await client.close()
+
+
+async def bench_pagination(server: MockYouTubeServer, args: argparse.Namespace) -> dict:
+
+    results = {}
+    client = connect(server)
+    try:
+        for prefetch in (0, 1, 2):
+            start = time.perf_counter()
+            count = 0
+            async for item in client.paginate('playlistItem', ['snippet'], 
+                prefetch=prefetch, maxResults=50, playlistId='PL'):
+                count += 1
+                # simulated per item processing so prefetching has work to overlap with
+                if args.work > 0 and count % 50 == 0:
+                    await asyncio.sleep(args.work)
+            elapsed = time.perf_counter() - start
+            results['prefetch_{}'.format(prefetch)] = {
+                'items': count, 'elapsed_s': elapsed, 'items_per_s': count / elapsed}
+        return results
+    finally:
+        await client.close()
+
+
+async def bench_etag(server: MockYouTubeServer, args: argparse.Namespace) -> dict:
+
+    cache = YouTubeResponseCache()
+    client = connect(server, cache=cache)
+    before = server.not_modified
+    try:
+        latencies, items, elapsed = await timed_requests(client, args.requests, 1, id='vid00000001')
+    finally:
+        await client.close()
+
+    result = summarize(latencies, elapsed)
+    result.update(hits=cache.hits, misses=cache.misses, 
+        not_modified=server.not_modified - before)
+    return result
+
+
+async def bench_retry(server: MockYouTubeServer, args: argparse.Namespace) -> dict:
+
+    retry = RetryPolicy(base_delay=0.001, max_delay=0.05)
+    client = connect(server, retry=retry)
+    server.error_rate, errors = args.error_rate, server.errors
+    try:
+        latencies, items, elapsed = await timed_requests(client, args.requests, 
+            args.concurrency)
+    finally:
+        server.error_rate = 0.0
+        await client.close()
+
+    result = summarize(latencies, elapsed)
+    result.update(error_rate=args.error_rate, injected_errors=server.errors - errors, 
+        retries=retry.retries)
+    return result
+
+
+async def bench_upload(server: MockYouTubeServer, args: argparse.Namespace) -> dict:
+
+    size = args.upload_mb * 1024 * 1024
+
+    async def media():
+        block = b'\0' * (1024 * 1024)
+        for _ in range(args.upload_mb):
+            yield block
+
+    client = connect(server)
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = await client.upload('video', {'snippet': {'title': 'benchmark'}}, media(), 
+            part=['snippet'])
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        await client.close()
+
+    return {'status': result.status, 'bytes': size, 'elapsed_s': elapsed, 
+        'mb_per_s': args.upload_mb / elapsed, 'peak_memory_bytes': peak}
+
+
+async def bench_download(server: MockYouTubeServer, args: argparse.Namespace) -> dict:
+
+    server.caption_size = args.download_mb * 1024 * 1024
+    received = 0
+
+    def sink(chunk: bytes) -> None:
+        nonlocal received
+        received += len(chunk)
+
+    client = connect(server)
+    try:
+        start = time.perf_counter()
+        await client.download_to('caption', sink, append='caption-id')
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.close()
+
+    return {'bytes': received, 'elapsed_s': elapsed, 
+        'mb_per_s': received / 1024 / 1024 / elapsed}
+
+
+async def bench_transport(server: MockYouTubeServer, args: argparse.Namespace) -> dict:
+
+    # the memory transport serves the same page without sockets, which leaves
+    # the overhead of the client itself
+    memory = MemoryTransport()
+    memory.add('GET', 'videos', {'kind': 'youtube#videoListResponse', 
+        'items': [video_item(index) for index in range(50)]})
+
+    results = {}
+    for name, transport in (('aiohttp', None), ('raw', RawTransport()), ('memory', memory)):
+        client = connect(server, transport=transport)
+        try:
+            cpu = time.process_time()
+            latencies, items, elapsed = await timed_requests(client, args.requests, 
+                args.concurrency)
+            cpu = time.process_time() - cpu
+        finally:
+            await client.close()
+        result = summarize(latencies, elapsed)
+        result['cpu_us_per_request'] = cpu / len(latencies) * 1e6
+        results[name] = result
+    return results
+
+
+BENCHMARKS = {
+    'list': bench_list,
+    'pagination': bench_pagination,
+    'etag': bench_etag,
+    'retry': bench_retry,
+    'upload': bench_upload,
+    'download': bench_download,
+    'transport': bench_transport
+}
+
+
+async def run(args: argparse.Namespace) -> dict:
+
+    server = MockYouTubeServer(total_items=args.items, latency=args.latency)
+    await server.start()
+
+    results = {}
+    try:
+        for name in args.only or list(BENCHMARKS):
+            print('running', name, file=sys.stderr)
+            results[name] = await BENCHMARKS[name](server, args)
+    finally:
+        await server.close()
+
+    return {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'aiohttp': aiohttp.__version__,
+            'decoder': decoder.get_decoder(),
+            'args': vars(args)
+        },
+        'results': results
+    }
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--items', type=int, default=1000, 
+        help='items served by every list endpoint')
+    parser.add_argument('--latency', type=float, default=0.0, 
+        help='seconds added by the mock server to every response')
+    parser.add_argument('--work', type=float, default=0.01, 
+        help='seconds of simulated processing per page during pagination')
+    parser.add_argument('--error-rate', type=float, default=0.1, 
+        help='fraction of requests answered with 429 in the retry benchmark')
+    parser.add_argument('--upload-mb', type=int, default=32)
+    parser.add_argument('--download-mb', type=int, default=32)
+    parser.add_argument('--only', nargs='*', choices=list(BENCHMARKS))
+    parser.add_argument('--output', default=None, help='path of the JSON results file')
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    output = json.dumps(results, indent=2)
+    if args.output != None:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
@@ -0,0 +1,211 @@
+"""
+    Local mock of the YouTube Data API used by the offline benchmarks.
+
+    Emulates the parts of youtube/v3 the client exercises:
+        - paginated list endpoints (videos, playlistItems, commentThreads, ...)
+          with pageToken/nextPageToken and maxResults
+        - ETag headers and 304 Not Modified for If-None-Match
+        - injected 429 rateLimitExceeded errors at a configurable rate
+        - resumable uploads (uploadType=resumable, 308 Resume Incomplete)
+        - caption downloads with a configurable body size and Range support
+        - a configurable latency added to every response
+
+    ex. 
+        server = MockYouTubeServer(latency=0.01, error_rate=0.05)
+        await server.start()
+        client = YouTubeClient('key', base_url=server.base_url, upload_url=server.upload_url)
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+from aiohttp import web
+
+
+def video_item(index: int) -> dict:
+    return {
+        'kind': 'youtube#video',
+        'etag': hashlib.md5(str(index).encode()).hexdigest(),
+        'id': 'vid{:08d}'.format(index),
+        'snippet': {
+            'publishedAt': '2021-03-01T17:00:08Z',
+            'channelId': 'UCuAXFkgsw1L7xaCfnd5JJOw',
+            'title': 'Video {}'.format(index),
+            'description': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 4,
+            'channelTitle': 'Example Channel',
+            'tags': ['tag{}'.format(n) for n in range(5)],
+            'categoryId': '10'
+        },
+        'contentDetails': {'duration': 'PT{}M{}S'.format(index % 60, index % 59), 
+            'licensedContent': True},
+        'statistics': {'viewCount': str(1000 + index * 7), 'likeCount': str(index), 
+            'commentCount': str(index % 100)}
+    }
+
+
+class MockYouTubeServer:
+
+    """
+        aiohttp application emulating the YouTube Data API on localhost.
+
+        Attribute(s):
+            total_items type(int): items available from every list endpoint
+            latency type(float): seconds added to every response
+            error_rate type(float): fraction of list requests answered with 429
+            caption_size type(int): bytes of every caption download
+            requests type(int): requests served
+            not_modified type(int): 304 responses served
+            errors type(int): 429 responses served
+    """
+
+    def __init__(
+        self, 
+        total_items: int = 1000, 
+        latency: float = 0.0, 
+        error_rate: float = 0.0, 
+        caption_size: int = 1024 * 1024, 
+        seed: int = 0
+    ) -> None:
+
+        self.total_items = total_items
+        self.latency = latency
+        self.error_rate = error_rate
+        self.caption_size = caption_size
+        self.requests = 0
+        self.not_modified = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._items = [video_item(index) for index in range(total_items)]
+        self._uploads = {}
+        self._runner = None
+        self.port = None
+
+        self.app = web.Application(client_max_size=64 * 1024 * 1024)
+        self.app.router.add_post('/upload/youtube/v3/{resource}', self.start_upload)
+        self.app.router.add_put('/upload/session/{id}', self.upload_chunk)
+        self.app.router.add_get('/youtube/v3/captions/{id}', self.download)
+        self.app.router.add_get('/youtube/v3/{resource}', self.list_)
+
+    @property
+    def base_url(self) -> str:
+        return 'http://127.0.0.1:{}/youtube/v3/'.format(self.port)
+
+    @property
+    def upload_url(self) -> str:
+        return 'http://127.0.0.1:{}/upload/youtube/v3/'.format(self.port)
+
+    async def start(self) -> None:
+
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', self.port or 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        await self._runner.cleanup()
+
+    async def _delay(self) -> None:
+        self.requests += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    async def list_(self, request: web.Request) -> web.Response:
+
+        await self._delay()
+
+        if self.error_rate > 0 and self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response({'error': {'code': 429, 'message': 'Rate limit exceeded', 
+                'errors': [{'reason': 'rateLimitExceeded'}]}}, status=429)
+
+        max_results = min(50, int(request.query.get('maxResults', 5)))
+        if 'id' in request.query:
+            ids = set(request.query['id'].split(','))
+            items = [item for item in self._items if item['id'] in ids]
+            start = 0
+        else:
+            start = int(request.query.get('pageToken', 0))
+            items = self._items[start:start + max_results]
+
+        data = {
+            'kind': 'youtube#videoListResponse',
+            'items': items,
+            'pageInfo': {'totalResults': self.total_items, 'resultsPerPage': max_results}
+        }
+        if 'id' not in request.query and start + max_results < self.total_items:
+            data['nextPageToken'] = str(start + max_results)
+
+        body = json.dumps(data).encode('UTF8')
+        etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+        if request.headers.get('If-None-Match') == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={'ETag': etag})
+
+        return web.Response(body=body, content_type='application/json', 
+            headers={'ETag': etag})
+
+    async def start_upload(self, request: web.Request) -> web.Response:
+
+        await self._delay()
+        if request.query.get('uploadType') != 'resumable':
+            return web.json_response({'error': {'message': 'resumable only', 'errors': []}}, 
+                status=400)
+
+        id = str(len(self._uploads))
+        self._uploads[id] = {'received': 0, 
+            'length': int(request.headers.get('X-Upload-Content-Length', -1))}
+        location = 'http://127.0.0.1:{}/upload/session/{}'.format(self.port, id)
+        return web.Response(headers={'Location': location})
+
+    async def upload_chunk(self, request: web.Request) -> web.Response:
+
+        await self._delay()
+        upload = self._uploads[request.match_info['id']]
+        content_range = request.headers['Content-Range'][len('bytes '):]
+        range_, total = content_range.split('/')
+
+        # chunks are counted but not stored to keep the server footprint flat
+        received = 0
+        async for chunk in request.content.iter_chunked(256 * 1024):
+            received += len(chunk)
+        upload['received'] += received
+
+        if total != '*' and upload['received'] >= int(total):
+            return web.json_response({'kind': 'youtube#video', 'id': 'uploaded'})
+        if upload['received'] == 0:
+            return web.Response(status=308)
+        return web.Response(status=308, 
+            headers={'Range': 'bytes=0-{}'.format(upload['received'] - 1)})
+
+    async def download(self, request: web.Request) -> web.StreamResponse:
+
+        await self._delay()
+        start = 0
+        if 'Range' in request.headers:
+            start = int(request.headers['Range'][len('bytes='):].rstrip('-'))
+
+        response = web.StreamResponse(status=206 if start > 0 else 200)
+        response.content_length = self.caption_size - start
+        await response.prepare(request)
+
+        block = b'x' * 65536
+        remaining = self.caption_size - start
+        while remaining > 0:
+            await response.write(block[:remaining])
+            remaining -= len(block)
+        await response.write_eof()
+        return response
+
+
+if __name__ == '__main__':
+
+    async def serve() -> None:
+        server = MockYouTubeServer()
+        server.port = 8080
+        await server.start()
+        print('Mock YouTube Data API listening on', server.base_url)
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
@@ -19,7 +19,7 @@ DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 description = 'Basic discord bot using search coroutine from aioyoutube library'
 bot = commands.Bot(command_prefix='?', description=description)
 
-youtube = YouTubeClient.from_connect(key=YOUTUBE_KEY)
+youtube = YouTubeClient.from_connect(key=YOUTUBE_KEY, dedup=True)
 
 
 # searches for a keyword or keywords entered as an argument to the search command
@@ -14,11 +14,10 @@ async def search(terms: list):
 
     client = YouTubeClient.from_connect(key=YOUTUBE_API_KEY)
 
-    tasks = []
-    for term in terms:
-        tasks.append(client.search(search=term))
+    # at most 10 searches are in flight at once no matter how many terms are given
+    specs = ({'method': 'search', 'search': term} for term in terms)
     
-    results = await asyncio.gather(*tasks)
+    results = await client.gather(specs, concurrency=10)
     for result in results:
         for item in result.json['items']:
             print('https://www.youtube.com/watch?v=' + item['id']['videoId'])
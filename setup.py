@@ -24,6 +24,10 @@ setup(
     long_description_content_type='text/markdown',
     include_package_data=True,
     install_requires=requirements,
+    extras_require={
+        'speedups': ['orjson'],
+        'export': ['numpy', 'pyarrow'],
+    },
     python_requires='>=3.7',
     classifiers=[
     'Development Status :: 4 - Beta',
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from aioyoutube import MemoryTransport, YouTubeAuthClient, YouTubeCredentials, YouTubeHybridClient, \
+    YouTubeResponseCache
+
+
+TOKEN = b'{"access_token": "fresh", "expires_in": 3600}'
+
+
+async def token_server() -> asyncio.AbstractServer:
+
+    async def handle(reader, writer):
+        head = await reader.readuntil(b'\r\n\r\n')
+        length = [line for line in head.lower().split(b'\r\n') 
+            if line.startswith(b'content-length:')]
+        await reader.readexactly(int(length[0].split(b':')[1]))
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n' 
+            b'Content-Length: ' + str(len(TOKEN)).encode() + b'\r\n' 
+            b'Connection: close\r\n\r\n' + TOKEN)
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, '127.0.0.1', 0)
+
+
+def test_client_close_closes_credentials_session():
+
+    async def run():
+        server = await token_server()
+        credentials = YouTubeCredentials(refresh_token='refresh', 
+            token_uri='http://127.0.0.1:{}/token'.format(server.sockets[0].getsockname()[1]))
+        try:
+            for _ in range(2):
+                credentials.token = None
+                async with YouTubeAuthClient('key', credentials, 
+                    transport=MemoryTransport()) as client:
+                    await client.list_('video', ['id'], id='a')
+                    assert credentials.token == 'fresh'
+                assert credentials._session.closed
+        finally:
+            server.close()
+        return credentials.refreshes
+
+    assert asyncio.run(run()) == 2
+
+
+def test_hybrid_client_without_auth_sends_no_token():
+
+    async def run():
+        sent = []
+
+        def handler(method, url, headers, body):
+            sent.append(headers.get('Authorization'))
+            return 200, {'items': []}
+
+        async with YouTubeHybridClient('key', YouTubeCredentials('t1'), 
+            transport=MemoryTransport(handler)) as client:
+            await client.list_('video', ['id'], id='a', auth=False)
+            await client.list_('video', ['id'], id='b')
+        return sent
+
+    assert asyncio.run(run()) == [None, 'Bearer t1']
+
+
+def test_cache_entries_survive_token_refresh():
+
+    def handler(method, url, headers, body):
+        if headers.get('If-None-Match') == 'v1':
+            return 304, b''
+        return 200, {'items': []}, {'ETag': 'v1'}
+
+    async def run():
+        cache = YouTubeResponseCache()
+        credentials = YouTubeCredentials('t1', refresh_token='refresh', 
+            expires_at=time.time() + 3600)
+        async with YouTubeAuthClient('key', credentials, cache=cache, 
+            transport=MemoryTransport(handler)) as client:
+            for token in ('t1', 't2', 't3'):
+                credentials.token = token
+                await client.list_('video', ['id'], id='a')
+        return cache
+
+    cache = asyncio.run(run())
+    assert (cache.misses, cache.hits, len(cache)) == (1, 2, 1)
@@ -0,0 +1,21 @@
+import asyncio
+from aioyoutube import MemoryTransport, YouTubeAuthClient
+
+
+def test_ranged_download_asks_for_identity_encoding():
+
+    async def run(offset):
+        sent = []
+
+        def handler(method, url, headers, body):
+            sent.append((headers.get('Range'), headers.get('Accept-Encoding')))
+            return 200, b'0123456789'
+
+        async with YouTubeAuthClient('key', 'token', 
+            transport=MemoryTransport(handler)) as client:
+            data = b''.join([chunk async for chunk in client.download_stream(
+                'caption', append='a', offset=offset)])
+        return data, sent
+
+    assert asyncio.run(run(0)) == (b'0123456789', [(None, 'gzip')])
+    assert asyncio.run(run(4)) == (b'456789', [('bytes=4-', 'identity')])
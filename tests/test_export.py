@@ -0,0 +1,49 @@
+import pytest
+from aioyoutube import YouTubeColumnarExporter, parse_booleans, parse_durations
+
+
+ITEMS = [
+    {'contentDetails': {'duration': 'PT1M5S', 'caption': 'true', 'licensedContent': True}},
+    {'contentDetails': {'duration': 'bogus', 'caption': 'false', 'licensedContent': False}},
+    {'contentDetails': {}}
+]
+
+COLUMNS = {
+    'duration': ('contentDetails.duration', 'duration'),
+    'caption': ('contentDetails.caption', 'bool'),
+    'licensed': ('contentDetails.licensedContent', 'bool')
+}
+
+
+def test_parse_durations_invalid_is_missing():
+    assert parse_durations(['P1DT2H', 'bogus', 'PT5Sx', None, 'P']) == [93600, -1, -1, -1, 0]
+
+
+def test_parse_booleans_reads_strings():
+    assert parse_booleans([True, 'false', 'True', None, 'yes'], None) == [True, False, True, None, None]
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+def test_bool_and_duration_columns(backend):
+
+    if backend == 'numpy':
+        pytest.importorskip('numpy')
+    exporter = YouTubeColumnarExporter(COLUMNS, backend=backend)
+    exporter.add(ITEMS)
+    assert {name: list(map(int, values)) for name, values in exporter.to_lists().items()} == {
+        'duration': [65, -1, -1], 
+        'caption': [1, 0, -1], 
+        'licensed': [1, 0, -1]
+    }
+
+
+def test_bool_and_duration_columns_arrow():
+
+    pytest.importorskip('pyarrow')
+    exporter = YouTubeColumnarExporter(COLUMNS, backend='arrow')
+    exporter.add(ITEMS)
+    assert exporter.to_lists() == {
+        'duration': [65, None, None], 
+        'caption': [True, False, None], 
+        'licensed': [True, False, None]
+    }
@@ -0,0 +1,25 @@
+import asyncio
+from aioyoutube import MemoryTransport, YouTubeAuthClient, YouTubeHooks
+
+
+def test_decode_done_is_reported_for_deduplicated_requests():
+
+    async def handler(method, url, headers, body):
+        await asyncio.sleep(0.01)
+        return 200, {'items': [{'id': 'a'}]}
+
+    async def run():
+        decoded = []
+        hooks = YouTubeHooks()
+        hooks.on('decode_done', lambda event: decoded.append(event.endpoint))
+        async with YouTubeAuthClient('key', 'token', hooks=hooks, dedup=True, 
+            transport=MemoryTransport(handler)) as client:
+            responses = await asyncio.gather(*[
+                client.list_('video', ['id'], id='a') for _ in range(3)])
+            hits = client.youtube_session.dedup_hits
+        return [response.data for response in responses], decoded, hits
+
+    data, decoded, hits = asyncio.run(run())
+    assert hits == 2
+    assert data == [{'items': [{'id': 'a'}]}] * 3
+    assert len(decoded) == 1
@@ -0,0 +1,27 @@
+import asyncio
+from aioyoutube import MemoryTransport, YouTubeAuthClient, YouTubeKeyPool
+
+
+QUOTA_EXCEEDED = {'error': {'code': 403, 'errors': [{'reason': 'quotaExceeded'}]}}
+
+
+def test_stream_reports_key_errors_and_switches_key():
+
+    def handler(method, url, headers, body):
+        if 'key=spent' in url:
+            return 403, QUOTA_EXCEEDED
+        return 200, b'caption'
+
+    async def run():
+        pool = YouTubeKeyPool(['spent', 'fresh'])
+        async with YouTubeAuthClient(pool, 'token', 
+            transport=MemoryTransport(handler)) as client:
+            chunks = [chunk async for chunk in client.download_stream(
+                'caption', append='a')]
+        return pool, chunks
+
+    pool, chunks = asyncio.run(run())
+    stats = pool.stats()
+    assert chunks == [b'caption']
+    assert stats['spent']['suspended'] and stats['spent']['errors'] == 1
+    assert not stats['fresh']['suspended']
@@ -0,0 +1,25 @@
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+from aioyoutube import MemoryTransport, YouTubeClient
+
+
+def test_prefetch_requests_only_that_many_pages_ahead():
+
+    async def run(prefetch):
+        requested = []
+
+        def handler(method, url, headers, body):
+            page = int(parse_qs(urlsplit(url).query).get('pageToken', ['0'])[0])
+            requested.append(page)
+            return 200, {'items': [page], 'nextPageToken': str(page + 1)}
+
+        async with YouTubeClient('key', transport=MemoryTransport(handler)) as client:
+            seen = []
+            async for item in client.paginate('video', ['id'], prefetch=prefetch, max_items=3):
+                await asyncio.sleep(0.01)
+                seen.append((item, list(requested)))
+        return seen
+
+    assert asyncio.run(run(1)) == [(0, [0, 1]), (1, [0, 1, 2]), (2, [0, 1, 2, 3])]
+    assert asyncio.run(run(2))[0] == (0, [0, 1, 2])
+    assert asyncio.run(run(0))[0] == (0, [0])
@@ -0,0 +1,23 @@
+import asyncio
+from aioyoutube import YouTubeClient, get_pool, get_pools
+
+
+def test_pool_kept_after_last_client_closes():
+
+    async def run():
+        pool = get_pool('test-reopen', limit=5)
+
+        client = YouTubeClient('key', pool='test-reopen')
+        client.connect()
+        assert pool.refcount == 1
+        await client.close()
+        assert pool.refcount == 0 and pool.session == None
+        assert pool in get_pools()
+
+        client = YouTubeClient('key', pool='test-reopen')
+        client.connect()
+        assert client.youtube_session.pool is pool
+        assert pool.session.connector.limit == 5
+        await client.close()
+
+    asyncio.run(run())
@@ -0,0 +1,53 @@
+import asyncio
+import calendar
+import time
+import pytest
+from aioyoutube import QuotaExceededException, QuotaScheduler, next_quota_reset
+
+
+def utc(text: str) -> float:
+    return calendar.timegm(time.strptime(text, '%Y-%m-%d %H:%M'))
+
+
+@pytest.mark.parametrize('now, reset', [
+    ('2026-01-15 07:59', '2026-01-15 08:00'), 
+    ('2026-01-15 08:01', '2026-01-16 08:00'), 
+    ('2026-03-08 12:00', '2026-03-09 07:00'), 
+    ('2026-10-18 12:00', '2026-10-19 07:00'), 
+    ('2026-11-01 08:30', '2026-11-02 08:00')
+])
+def test_next_quota_reset_is_pacific_midnight(now, reset):
+    assert next_quota_reset(utc(now)) == utc(reset)
+
+
+def test_budget_is_refilled_only_at_the_reset(monkeypatch):
+
+    scheduler = QuotaScheduler(daily_units=100)
+    asyncio.run(scheduler.acquire(100))
+
+    monotonic, wall = time.monotonic(), time.time()
+    monkeypatch.setattr(time, 'monotonic', lambda: monotonic + 43200)
+    assert scheduler.remaining == 0
+    with pytest.raises(QuotaExceededException):
+        scheduler.max_wait = 60
+        asyncio.run(scheduler.acquire(1))
+
+    monkeypatch.setattr(time, 'time', lambda: scheduler.reset_at + 1)
+    assert scheduler.remaining == 100
+
+
+def test_pace_limits_units_per_second():
+
+    scheduler = QuotaScheduler(daily_units=100, pace=10, burst=5, max_wait=0.1)
+
+    async def run():
+        await scheduler.acquire(5)
+        with pytest.raises(QuotaExceededException):
+            await scheduler.acquire(5)
+        start = time.monotonic()
+        scheduler.max_wait = None
+        await scheduler.acquire(2)
+        return time.monotonic() - start
+
+    assert 0.1 < asyncio.run(run()) < 1
+    assert scheduler.remaining == 93
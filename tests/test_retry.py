@@ -0,0 +1,69 @@
+import asyncio
+from aioyoutube import MemoryTransport, RetryPolicy, YouTubeAuthClient
+
+
+def failing_transport(calls):
+
+    def handler(method, url, headers, body):
+        calls.append(method)
+        return 503, {'error': {'errors': [{'reason': 'backendError'}]}}
+
+    return MemoryTransport(handler)
+
+
+def test_post_is_not_retried_unless_opted_in():
+
+    async def run(policy):
+        calls = []
+        async with YouTubeAuthClient('key', 'token', retry=policy, 
+            transport=failing_transport(calls)) as client:
+            await client.list_('video', ['id'], id='a')
+            await client.insert('playlist', {'snippet': {'title': 't'}}, part=['snippet'])
+        return calls
+
+    calls = asyncio.run(run(RetryPolicy(max_retries=2, base_delay=0, ratio=None)))
+    assert calls == ['GET', 'GET', 'GET', 'POST']
+
+    calls = asyncio.run(run(RetryPolicy(max_retries=2, base_delay=0, ratio=None, 
+        methods={'GET', 'POST'})))
+    assert calls == ['GET'] * 3 + ['POST'] * 3
+
+
+def test_rejected_post_is_retried():
+
+    async def run():
+        calls = []
+
+        def handler(method, url, headers, body):
+            calls.append(method)
+            if len(calls) == 1:
+                return 403, {'error': {'errors': [{'reason': 'rateLimitExceeded'}]}}
+            if len(calls) == 2:
+                return 429, {'error': {'errors': [{'reason': 'userRateLimitExceeded'}]}}
+            return 200, {'id': 'playlist'}
+
+        async with YouTubeAuthClient('key', 'token', 
+            retry=RetryPolicy(max_retries=2, base_delay=0, ratio=None), 
+            transport=MemoryTransport(handler)) as client:
+            response = await client.insert('playlist', {'snippet': {'title': 't'}}, 
+                part=['snippet'])
+        return calls, response.status
+
+    assert asyncio.run(run()) == (['POST'] * 3, 200)
+
+
+def test_retry_tokens_are_shared_across_requests():
+
+    async def run():
+        calls = []
+        policy = RetryPolicy(max_retries=5, base_delay=0, ratio=0.1, burst=3)
+        async with YouTubeAuthClient('key', 'token', retry=policy, 
+            transport=failing_transport(calls)) as client:
+            for _ in range(10):
+                await client.list_('video', ['id'], id='a')
+        return calls, policy
+
+    calls, policy = asyncio.run(run())
+    assert policy.retries == 3
+    assert len(calls) == 10 + policy.retries
+    assert policy.denied == 10
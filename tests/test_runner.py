@@ -0,0 +1,34 @@
+import asyncio
+import pytest
+from aioyoutube import SharedQuotaScheduler, YouTubeCrawlRunner
+
+
+# workers are module level so spawned processes can import them
+
+async def spend(client, task):
+    await client.youtube_session.scheduler.acquire(2)
+    return task * 2
+
+
+@pytest.mark.parametrize('start_method', ['spawn', 'forkserver'])
+def test_shared_scheduler_under_start_method(start_method):
+
+    async def run():
+        scheduler = SharedQuotaScheduler(daily_units=1000)
+        runner = YouTubeCrawlRunner(spend, 'key', processes=2, concurrency=2, 
+            scheduler=scheduler, start_method=start_method)
+        results = [result async for result in runner.run(range(10))]
+        return scheduler, results
+
+    scheduler, results = asyncio.run(run())
+    assert sorted(result.value for result in results) == [task * 2 for task in range(10)]
+    assert all(result.error == None for result in results)
+    assert scheduler.spent == 20
+
+
+def test_scheduler_bound_to_other_start_method():
+
+    scheduler = SharedQuotaScheduler(context='spawn')
+    scheduler.remaining
+    with pytest.raises(ValueError):
+        scheduler.bind('fork')
@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+import json
+from urllib.parse import parse_qs, urlsplit
+from aioyoutube import MemoryTransport, YouTubeClient, YouTubeSync
+
+
+def playlist_transport(items: list, page_size: int = 2) -> MemoryTransport:
+
+    def handler(method, url, headers, body):
+        query = parse_qs(urlsplit(url).query)
+        start = int(query.get('pageToken', ['0'])[0])
+        page = {
+            'items': items[start:start + page_size], 
+            'pageInfo': {'totalResults': len(items)}
+        }
+        if start + page_size < len(items):
+            page['nextPageToken'] = str(start + page_size)
+        page['etag'] = hashlib.md5(json.dumps(page).encode()).hexdigest()
+        return 200, page
+
+    return MemoryTransport(handler)
+
+
+def item(index: int) -> dict:
+    return {'id': 'item{}'.format(index), 'etag': 'e{}'.format(index), 
+        'snippet': {'position': index, 'publishedAt': '2021-03-01T00:00:0{}Z'.format(index)}}
+
+
+def test_appended_playlist_item_is_reported():
+
+    async def run():
+        items = [item(0), item(1), item(2)]
+        async with YouTubeClient('key', transport=playlist_transport(items)) as client:
+            sync = YouTubeSync(client)
+            changes = []
+            for append in (None, item(3), None):
+                if append != None:
+                    items.append(append)
+                changes.append([(change.kind, change.id) 
+                    async for change in sync.sync_playlist('PLexample')])
+        return changes
+
+    first, second, third = asyncio.run(run())
+    assert len(first) == 3
+    assert second == [('added', 'item3')]
+    assert third == []
+
+
+def test_removed_playlist_item_is_reported():
+
+    async def run():
+        items = [item(0), item(1), item(2)]
+        async with YouTubeClient('key', transport=playlist_transport(items)) as client:
+            sync = YouTubeSync(client)
+            [change async for change in sync.sync_playlist('PLexample')]
+            del items[1]
+            return [(change.kind, change.id) async for change in sync.sync_playlist('PLexample')]
+
+    assert asyncio.run(run()) == [('removed', 'item1')]
+
+
+def test_uploads_playlist_stops_at_known_items():
+
+    async def run():
+        items = [item(2), item(1), item(0)]
+        transport = playlist_transport(items, page_size=1)
+        async with YouTubeClient('key', transport=transport) as client:
+            sync = YouTubeSync(client)
+            [change async for change in sync.sync_playlist('UUexample')]
+            items.insert(0, item(3))
+            requests = transport.requests
+            changes = [(change.kind, change.id) 
+                async for change in sync.sync_playlist('UUexample')]
+        return changes, transport.requests - requests
+
+    changes, requests = asyncio.run(run())
+    assert changes == [('added', 'item3')]
+    assert requests == 2
@@ -0,0 +1,157 @@
+import asyncio
+import pickle
+import aiohttp
+import pytest
+from aioyoutube import AiohttpTransport, MemoryTransport, RawTransport, YouTubeClient, \
+    YouTubeTransport
+
+
+def test_transport_base_class_is_abstract():
+
+    with pytest.raises(TypeError):
+        YouTubeTransport()
+
+
+def test_memory_transport_pickles():
+
+    transport = MemoryTransport()
+    transport.add('GET', 'videos', {'items': []}, headers={'ETag': 'a'})
+    transport = pickle.loads(pickle.dumps(transport))
+
+    status, data, headers, _ = asyncio.run(
+        transport.send('GET', 'http://localhost/youtube/v3/videos', {}, None))
+    assert status == 200 and data == b'{"items": []}' and headers['etag'] == 'a'
+
+
+async def raw_send(responses, **kwargs):
+
+    requests = []
+
+    async def handle(reader, writer):
+        requests.append(await reader.readuntil(b'\r\n\r\n'))
+        for response in responses:
+            writer.write(response)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    transport = RawTransport(**kwargs)
+    try:
+        result = await transport.send('GET', 'http://127.0.0.1:{}/videos'.format(port), 
+            {'Accept': 'application/json'}, None)
+    finally:
+        await transport.close()
+        server.close()
+    return result, requests
+
+
+def test_raw_transport_skips_interim_responses():
+
+    (status, data, _, _), _ = asyncio.run(raw_send([
+        b'HTTP/1.1 100 Continue\r\n\r\n',
+        b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: close\r\n\r\nok']))
+    assert status == 200 and data == b'ok'
+
+
+def test_raw_transport_sends_session_headers():
+
+    (status, _, _, _), requests = asyncio.run(raw_send(
+        [b'HTTP/1.1 204 No Content\r\nConnection: close\r\n\r\n'], 
+        headers={'User-Agent': 'crawler', 'Accept': '*/*'}))
+    assert status == 204
+    assert b'User-Agent: crawler\r\n' in requests[0]
+    assert b'Accept: application/json\r\n' in requests[0] and b'*/*' not in requests[0]
+
+
+def test_raw_transport_oversized_header_is_a_connection_error():
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(raw_send([b'HTTP/1.1 200 OK\r\nX-Big: ' + b'a' * 2 ** 17 + b'\r\n\r\n']))
+
+
+def test_raw_transport_honours_session_timeout():
+
+    async def run():
+
+        async def handle(reader, writer):
+            await reader.readuntil(b'\r\n\r\n')
+            await asyncio.sleep(5)
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        transport = RawTransport(timeout=aiohttp.ClientTimeout(total=0.2))
+        try:
+            await transport.send('GET', 'http://127.0.0.1:{}/videos'.format(port), {}, None)
+        finally:
+            await transport.close()
+            server.close()
+
+    with pytest.raises(aiohttp.ServerTimeoutError):
+        asyncio.run(run())
+
+
+def test_raw_transport_resends_only_idempotent_requests_on_stale_connections():
+
+    async def run(method):
+
+        requests = []
+
+        async def handle(reader, writer):
+            while True:
+                try:
+                    requests.append(await reader.readuntil(b'\r\n\r\n'))
+                except asyncio.IncompleteReadError:
+                    break
+                if len(requests) == 2:
+                    # the server drops the kept alive connection without answering
+                    break
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok')
+                await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        url = 'http://127.0.0.1:{}/videos'.format(server.sockets[0].getsockname()[1])
+        transport = RawTransport()
+        try:
+            await transport.send(method, url, {}, b'')
+            try:
+                await transport.send(method, url, {}, b'')
+            except aiohttp.ClientConnectionError:
+                pass
+        finally:
+            await transport.close()
+            server.close()
+        return len(requests)
+
+    assert asyncio.run(run('GET')) == 3
+    assert asyncio.run(run('POST')) == 2
+
+
+def test_session_user_agent_is_kept_with_gzip():
+
+    async def run(transport):
+        requests = []
+
+        async def handle(reader, writer):
+            requests.append(await reader.readuntil(b'\r\n\r\n'))
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: close\r\n\r\n{}')
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        url = 'http://127.0.0.1:{}/'.format(server.sockets[0].getsockname()[1])
+        session = aiohttp.ClientSession(headers={'User-Agent': 'mybot/1.0'})
+        try:
+            async with YouTubeClient('key', base_url=url, 
+                transport=transport(session)) as client:
+                await client.list_('video', ['id'], id='a')
+        finally:
+            await session.close()
+            server.close()
+        return requests[0]
+
+    for transport in (AiohttpTransport, RawTransport):
+        request = asyncio.run(run(transport))
+        assert b'User-Agent: mybot/1.0 (gzip)\r\n' in request
@@ -0,0 +1,24 @@
+import asyncio
+from aioyoutube import MemoryTransport, YouTubeAuthClient, YouTubeHooks
+
+
+def test_upload_chunks_are_sent_with_hooks():
+
+    def handler(method, url, headers, body):
+        if method == 'POST':
+            return 200, b'', {'Location': 'http://localhost/upload/session?upload_id=1'}
+        return 200, {'id': 'video'}
+
+    async def run():
+        sent = []
+        hooks = YouTubeHooks()
+        hooks.on('before_send', lambda event: sent.append((event.method, event.units)))
+        async with YouTubeAuthClient('key', 'token', hooks=hooks, 
+            transport=MemoryTransport(handler)) as client:
+            response = await client.upload('video', {'snippet': {'title': 't'}}, 
+                b'x' * 1024, part=['snippet'])
+        return response, sent
+
+    response, sent = asyncio.run(run())
+    assert response.status == 200 and response.data == {'id': 'video'}
+    assert sent[1:] == [('PUT', 0)]